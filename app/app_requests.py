@@ -1,8 +1,91 @@
+from itertools import chain, islice
+import json
+from typing import Iterator, Optional
+
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework import status
 
-from app.serializers import CreateCareerSerializer, UpdateCareerSerializer
-from app.domain import Career
+from app.serializers import (
+    BatchCareersSerializer,
+    BulkCreateCareerQuerySerializer,
+    CreateCareerSerializer,
+    ExportCareerQuerySerializer,
+    ListCareerQuerySerializer,
+    UpdateCareerSerializer,
+)
+from app.domain import Career, CareerQuery
+
+# Career ids are Postgres integers.
+MAX_CAREER_ID = 2**31 - 1
+
+
+def parse_career_id(pk: str) -> Optional[int]:
+    """
+    The id in a "careers/<str:pk>/" URL, or None when it can not match any
+    Career, so no query is needed to answer 404.
+    """
+    if not (pk.isascii() and pk.isdigit()):
+        return None
+
+    id = int(pk)
+    if not 0 < id <= MAX_CAREER_ID:
+        return None
+
+    return id
+
+
+class ListCareersRequest:
+    serializer_class = ListCareerQuerySerializer
+
+    def __init__(self, request: Request):
+        self.request = request
+
+    def is_data_valid(self):
+        self.serializer = self.serializer_class(data=self.request.query_params)
+        return self.serializer.is_valid()
+
+    @property
+    def validation_error_messages(self):
+        return self.serializer.errors
+
+    @property
+    def status(self):
+        if not self.is_data_valid():
+            return status.HTTP_400_BAD_REQUEST
+
+    @property
+    def query(self) -> CareerQuery:
+        return CareerQuery(**self.serializer.validated_data)
+
+
+class ExportCareersRequest:
+    serializer_class = ExportCareerQuerySerializer
+
+    def __init__(self, request: Request):
+        self.request = request
+
+    def is_data_valid(self):
+        self.serializer = self.serializer_class(data=self.request.query_params)
+        return self.serializer.is_valid()
+
+    @property
+    def validation_error_messages(self):
+        return self.serializer.errors
+
+    @property
+    def status(self):
+        if not self.is_data_valid():
+            return status.HTTP_400_BAD_REQUEST
+
+    @property
+    def output(self) -> str:
+        return self.serializer.validated_data["output"]
+
+    @property
+    def chunk_size(self) -> int:
+        return self.serializer.validated_data["chunk_size"]
 
 
 class CreateCareerRequest:
@@ -33,12 +116,191 @@ class CreateCareerRequest:
         )
 
 
+class BulkCreateCareersRequest:
+    """
+    A JSON array or a streamed NDJSON body of Careers to be created, read
+    and validated one batch at a time.
+    """
+
+    serializer_class = BulkCreateCareerQuerySerializer
+    career_serializer_class = CreateCareerSerializer
+    ndjson_media_type = "application/x-ndjson"
+    invalid_json_errors = {"non_field_errors": ["Invalid JSON."]}
+    invalid_body_errors = {"non_field_errors": ["Expected a list of items."]}
+    empty_body_errors = {"non_field_errors": ["Expected at least one item."]}
+
+    def __init__(self, request: Request):
+        self.request = request
+        self.__valid = None
+
+    def is_data_valid(self):
+        """
+        Checked once, as an NDJSON body is read to find its first item.
+        """
+        if self.__valid is None:
+            self.__valid = self.__check_data()
+        return self.__valid
+
+    def __check_data(self) -> bool:
+        self.serializer = self.serializer_class(data=self.request.query_params)
+        if not self.serializer.is_valid():
+            self.__errors = self.serializer.errors
+            return False
+
+        if self.is_ndjson:
+            items = self.__ndjson_items()
+            first_item = next(items, self.empty_body_errors)
+            self.__items = chain((first_item,), items)
+        elif isinstance(self.request.data, list):
+            first_item = next(iter(self.request.data), self.empty_body_errors)
+            self.__items = iter(self.request.data)
+        else:
+            self.__errors = self.invalid_body_errors
+            return False
+
+        if first_item is self.empty_body_errors:
+            self.__errors = self.empty_body_errors
+            return False
+
+        return True
+
+    @property
+    def validation_error_messages(self):
+        return self.__errors
+
+    @property
+    def status(self):
+        if not self.is_data_valid():
+            return status.HTTP_400_BAD_REQUEST
+
+    @property
+    def is_ndjson(self) -> bool:
+        return self.request.content_type.startswith(self.ndjson_media_type)
+
+    @property
+    def batch_size(self) -> int:
+        return self.serializer.validated_data["batch_size"]
+
+    def batches(
+        self,
+    ) -> Iterator[list[tuple[int, Optional[Career], Optional[dict]]]]:
+        """
+        Lists of (index, career, errors), where either career or errors is
+        None, with at most batch_size items each.
+        """
+        career_serializer = self.career_serializer_class()
+        items = enumerate(self.__items)
+
+        while batch := list(islice(items, self.batch_size)):
+            yield [
+                self.__validate(career_serializer, index, item)
+                for index, item in batch
+            ]
+
+    def __ndjson_items(self) -> Iterator:
+        stream = self.__body()
+        if stream is None:
+            return
+
+        for line in iter(stream.readline, b""):
+            line = line.strip()
+            if not line:
+                continue
+
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield self.invalid_json_errors
+
+    def __body(self):
+        """
+        The body as a file. DRF has none without a Content-Length, as with
+        chunked uploads, which ASGI servers give Django whole and gunicorn
+        de-chunks in wsgi.input.
+        """
+        if self.request.stream is not None:
+            return self.request.stream
+
+        http_request = self.request._request
+        if isinstance(http_request, ASGIRequest):
+            return http_request
+
+        transfer_encoding = http_request.META.get("HTTP_TRANSFER_ENCODING", "")
+        if "chunked" in transfer_encoding.lower():
+            return http_request.META.get("wsgi.input")
+
+        return None
+
+    def __validate(self, career_serializer, index: int, item):
+        if item is self.invalid_json_errors:
+            return index, None, self.invalid_json_errors
+
+        try:
+            data = career_serializer.run_validation(item)
+        except ValidationError as e:
+            return index, None, e.detail
+
+        career = Career(
+            username=data["username"],
+            title=data["title"],
+            content=data["content"],
+        )
+        return index, career, None
+
+
+class BatchCareersRequest:
+    serializer_class = BatchCareersSerializer
+
+    def __init__(self, request: Request):
+        self.request = request
+
+    def is_data_valid(self):
+        self.serializer = self.serializer_class(data=self.request.data)
+        return self.serializer.is_valid()
+
+    @property
+    def validation_error_messages(self):
+        return self.serializer.errors
+
+    @property
+    def status(self):
+        if not self.is_data_valid():
+            return status.HTTP_400_BAD_REQUEST
+
+    @property
+    def operations(self) -> list[tuple[str, Optional[int], Optional[Career]]]:
+        """
+        (op, id, career) tuples in request order. Deletes carry no career.
+        """
+        operations = []
+        for operation in self.serializer.validated_data["operations"]:
+            op, id, data = (
+                operation["op"],
+                operation.get("id"),
+                operation.get("data"),
+            )
+            career = None
+            if op == "create":
+                career = Career(
+                    username=data["username"],
+                    title=data["title"],
+                    content=data["content"],
+                )
+            elif op == "update":
+                career = Career(
+                    id=id, title=data["title"], content=data["content"]
+                )
+            operations.append((op, id, career))
+
+        return operations
+
+
 class UpdateCareerRequest:
     serializer_class = UpdateCareerSerializer
 
-    def __init__(self, request: Request, id: int):
+    def __init__(self, request: Request, id: str):
         self.request = request
-        self.id = id
+        self.id = parse_career_id(id)
 
     def is_data_valid(self):
         self.serializer = self.serializer_class(data=self.request.data)
@@ -60,3 +322,17 @@ class UpdateCareerRequest:
             title=self.serializer.validated_data["title"],
             content=self.serializer.validated_data["content"],
         )
+
+
+class RetrieveCareerRequest:
+
+    def __init__(self, request: Request, id: str):
+        self.request = request
+        self.id = parse_career_id(id)
+
+
+class DeleteCareerRequest:
+
+    def __init__(self, request: Request, id: str):
+        self.request = request
+        self.id = parse_career_id(id)
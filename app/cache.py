@@ -0,0 +1,265 @@
+import hashlib
+import logging
+import pickle
+import threading
+import time
+from typing import Awaitable, Callable
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from app.routers import use_primary
+
+
+logger = logging.getLogger(__name__)
+
+
+class CareerCache:
+    """
+    Read-through cache for Career reads. Every key carries the global
+    careers version, so a write invalidates all entries with one increment
+    and stale entries simply expire. The time it last changed is kept even
+    with caching disabled, to read from the primary right after writes.
+    """
+
+    version_key = "careers:version"
+    last_modified_key = "careers:last_modified"
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__counters = {"hits": 0, "misses": 0, "oversized": 0, "errors": 0}
+
+    @property
+    def cache(self):
+        return caches[settings.CAREERS_CACHE_ALIAS]
+
+    @property
+    def is_enabled(self) -> bool:
+        return settings.CAREERS_CACHE_TIMEOUT > 0
+
+    def stats(self) -> dict[str, int]:
+        with self.__lock:
+            return dict(self.__counters)
+
+    def version(self) -> int:
+        version = self.cache.get(self.version_key)
+
+        if version is None:
+            # Seeded from the clock, so a version evicted from the cache can
+            # never come back with a value older entries were stored under.
+            self.cache.add(self.version_key, time.time_ns(), timeout=None)
+            version = self.cache.get(self.version_key, time.time_ns())
+
+        return version
+
+    def last_modified(self) -> float:
+        """
+        Timestamp of the last version bump. When it is unknown, the current
+        time is stored, so clients never get a time older than a change.
+        """
+        last_modified = self.cache.get(self.last_modified_key)
+
+        if last_modified is None:
+            self.cache.add(self.last_modified_key, time.time(), timeout=None)
+            last_modified = self.cache.get(self.last_modified_key, time.time())
+
+        return last_modified
+
+    def invalidate(self):
+        """
+        Bumps the version now and again when the transaction commits, so
+        rows read by other requests before the commit are not kept.
+        """
+        self.__bump()
+        transaction.on_commit(self.__bump)
+
+    def get_or_load(self, name: str, key_parts: tuple, loader: Callable):
+        """
+        The cached value for name and key_parts, or the loader's result,
+        cached unless it is None or larger than the entry size limit.
+        """
+        if not self.is_enabled:
+            return loader()
+
+        try:
+            key = self.__key(name, key_parts)
+            value = self.cache.get(key)
+        except Exception as e:
+            logger.error("Failed to read Careers cache. %s", e)
+            self.__count("errors")
+            return loader()
+
+        if value is not None:
+            self.__count("hits")
+            return value
+
+        self.__count("misses")
+        if settings.CAREERS_READ_REPLICAS and self.__recently_modified(
+            self.last_modified()
+        ):
+            with use_primary():
+                value = loader()
+        else:
+            value = loader()
+        if value is None:
+            return value
+
+        if not self.__fits(value):
+            return value
+
+        try:
+            self.cache.set(key, value, settings.CAREERS_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.error("Failed to write Careers cache. %s", e)
+            self.__count("errors")
+
+        return value
+
+    async def aversion(self) -> int:
+        version = await self.cache.aget(self.version_key)
+
+        if version is None:
+            await self.cache.aadd(
+                self.version_key, time.time_ns(), timeout=None
+            )
+            version = await self.cache.aget(self.version_key, time.time_ns())
+
+        return version
+
+    async def alast_modified(self) -> float:
+        last_modified = await self.cache.aget(self.last_modified_key)
+
+        if last_modified is None:
+            await self.cache.aadd(
+                self.last_modified_key, time.time(), timeout=None
+            )
+            last_modified = await self.cache.aget(
+                self.last_modified_key, time.time()
+            )
+
+        return last_modified
+
+    async def ainvalidate(self):
+        """
+        Async ORM writes run outside of atomic blocks and are committed when
+        they return, so one bump is enough.
+        """
+        await self.__abump()
+
+    async def aget_or_load(
+        self, name: str, key_parts: tuple, loader: Callable[[], Awaitable]
+    ):
+        if not self.is_enabled:
+            return await loader()
+
+        try:
+            key = self.__key(name, key_parts, await self.aversion())
+            value = await self.cache.aget(key)
+        except Exception as e:
+            logger.error("Failed to read Careers cache. %s", e)
+            self.__count("errors")
+            return await loader()
+
+        if value is not None:
+            self.__count("hits")
+            return value
+
+        self.__count("misses")
+        if settings.CAREERS_READ_REPLICAS and self.__recently_modified(
+            await self.alast_modified()
+        ):
+            with use_primary():
+                value = await loader()
+        else:
+            value = await loader()
+        if value is None:
+            return value
+
+        if not self.__fits(value):
+            return value
+
+        try:
+            await self.cache.aset(key, value, settings.CAREERS_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.error("Failed to write Careers cache. %s", e)
+            self.__count("errors")
+
+        return value
+
+    def __key(self, name: str, key_parts: tuple, version=None) -> str:
+        digest = hashlib.sha1(repr(key_parts).encode()).hexdigest()
+        return f"careers:{version or self.version()}:{name}:{digest}"
+
+    @staticmethod
+    def __recently_modified(last_modified: float) -> bool:
+        """
+        Misses load from the primary in the stickiness window after a write,
+        as replicas may lag and what a miss loads is kept for every client.
+        """
+        return (
+            time.time() - last_modified
+            < settings.CAREERS_PRIMARY_STICKINESS_SECONDS
+        )
+
+    def __fits(self, value) -> bool:
+        payload = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        if len(payload) > settings.CAREERS_CACHE_MAX_ENTRY_BYTES:
+            self.__count("oversized")
+            return False
+
+        return True
+
+    def __bump(self):
+        try:
+            self.cache.incr(self.version_key)
+        except ValueError:
+            self.cache.set(self.version_key, time.time_ns(), timeout=None)
+        except Exception as e:
+            logger.error("Failed to invalidate Careers cache. %s", e)
+            self.__count("errors")
+            return
+
+        try:
+            self.cache.set(self.last_modified_key, time.time(), timeout=None)
+        except Exception as e:
+            logger.error("Failed to invalidate Careers cache. %s", e)
+            self.__count("errors")
+
+    async def __abump(self):
+        try:
+            await self.cache.aincr(self.version_key)
+        except ValueError:
+            await self.cache.aset(
+                self.version_key, time.time_ns(), timeout=None
+            )
+        except Exception as e:
+            logger.error("Failed to invalidate Careers cache. %s", e)
+            self.__count("errors")
+            return
+
+        try:
+            await self.cache.aset(
+                self.last_modified_key, time.time(), timeout=None
+            )
+        except Exception as e:
+            logger.error("Failed to invalidate Careers cache. %s", e)
+            self.__count("errors")
+
+    def __count(self, counter: str):
+        with self.__lock:
+            self.__counters[counter] += 1
+
+
+def query_key_parts(query) -> tuple:
+    cursor = query.cursor
+    return (
+        cursor and (cursor.position, cursor.reverse, cursor.ordering),
+        query.page_size or settings.CAREERS_PAGE_SIZE,
+        query.ordering,
+        query.username,
+        query.created_after,
+        query.created_before,
+        query.q,
+        query.fields,
+    )
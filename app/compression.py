@@ -0,0 +1,156 @@
+"""
+Content codings negotiated with Accept-Encoding. gzip is always available,
+brotli and zstd when their packages are installed.
+"""
+
+import re
+from typing import Optional
+import zlib
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+class GzipCodec:
+    encoding = "gzip"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        compressor = self.compressor()
+        return compressor.compress(data) + compressor.finish()
+
+    def compressor(self):
+        return GzipCompressor(self.level)
+
+
+class GzipCompressor:
+    def __init__(self, level: int):
+        # wbits 31 writes a gzip header and trailer around the deflate data.
+        self.__compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, chunk: bytes) -> bytes:
+        """
+        Compressed chunk, flushed so clients can decode it right away.
+        """
+        return self.__compressor.compress(chunk) + self.__compressor.flush(
+            zlib.Z_SYNC_FLUSH
+        )
+
+    def finish(self) -> bytes:
+        return self.__compressor.flush(zlib.Z_FINISH)
+
+
+class BrotliCodec:
+    encoding = "br"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def compressor(self):
+        return BrotliCompressor(self.level)
+
+
+class BrotliCompressor:
+    def __init__(self, level: int):
+        self.__compressor = brotli.Compressor(quality=level)
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self.__compressor.process(chunk) + self.__compressor.flush()
+
+    def finish(self) -> bytes:
+        return self.__compressor.finish()
+
+
+class ZstdCodec:
+    encoding = "zstd"
+
+    def __init__(self, level: int):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zstandard.ZstdCompressor(level=self.level).compress(data)
+
+    def compressor(self):
+        return ZstdCompressor(self.level)
+
+
+class ZstdCompressor:
+    def __init__(self, level: int):
+        self.__compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, chunk: bytes) -> bytes:
+        return self.__compressor.compress(chunk) + self.__compressor.flush(
+            zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        )
+
+    def finish(self) -> bytes:
+        return self.__compressor.flush()
+
+
+CODECS = {
+    codec.encoding: codec
+    for codec, module in (
+        (ZstdCodec, zstandard),
+        (BrotliCodec, brotli),
+        (GzipCodec, zlib),
+    )
+    if module is not None
+}
+
+# Suffix of the ETags of compressed responses, see compression_middleware.
+ETAG_ENCODING_SUFFIX = re.compile(r'-(%s)"' % "|".join(CODECS))
+
+
+def accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """
+    Content codings of an Accept-Encoding header with their q-values.
+    """
+    accepted = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[name] = quality
+
+    return accepted
+
+
+def negotiate(accept_encoding: str, encodings: list[str]) -> Optional[str]:
+    """
+    The available coding with the highest q-value, encodings being the
+    server's preference order for equal q-values.
+    """
+    accepted = accepted_encodings(accept_encoding)
+    best, best_quality = None, 0.0
+
+    for encoding in encodings:
+        if encoding not in CODECS:
+            continue
+
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+
+    return best
@@ -0,0 +1,242 @@
+"""
+Validators of conditional requests. They come from the careers change
+counters in the database and the stored rows, so no body is rendered to
+compare them.
+"""
+
+from datetime import datetime, timedelta
+from functools import wraps
+import hashlib
+from typing import Optional, Union
+
+from django.utils.cache import get_conditional_response
+from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.utils.http import http_date, parse_etags, quote_etag
+from django.views.decorators.http import condition
+
+from app.app_requests import parse_career_id
+from app.domain import Career, CareerOutcome, Precondition
+from app.repositories import CareerRepository
+
+
+repository = CareerRepository()
+
+
+def accepted_format(request) -> str:
+    renderer = getattr(request, "accepted_renderer", None)
+    return renderer.format if renderer else ""
+
+
+def career_etag(career: Career, media_format: str) -> str:
+    """
+    Strong ETag of a stored Career, a digest of every field it is
+    rendered from and of the rendered format.
+    """
+    fields = (
+        career.id,
+        career.username,
+        career.created_datetime.isoformat(),
+        career.title,
+        career.content,
+        media_format,
+    )
+    return f'"{hashlib.sha1(repr(fields).encode()).hexdigest()}"'
+
+
+# HTTP dates have a 1-second resolution, so a Last-Modified is only given
+# once its second is over, with a second more for writes that commit a bit
+# after their change counter was stamped. A later write can then never have
+# the same Last-Modified as an earlier response.
+LAST_MODIFIED_DELAY = timedelta(seconds=2)
+
+
+def careers_revision(request) -> Optional[tuple[int, datetime]]:
+    """
+    The careers revision, read once per request for both validators.
+    """
+    if not hasattr(request, "careers_revision"):
+        request.careers_revision = repository.revision()
+    return request.careers_revision
+
+
+def careers_etag(request, *args, **kwargs) -> Optional[str]:
+    """
+    The version changes with every committed write, from any process, so
+    it changes with any list page. The rendered format is part of the ETag,
+    as the same URL can be rendered by more than one renderer.
+    """
+    revision = careers_revision(request)
+    return revision and f'"{revision[0]}-{accepted_format(request)}"'
+
+
+def careers_last_modified(request, *args, **kwargs) -> Optional[datetime]:
+    revision = careers_revision(request)
+    return revision and settled_last_modified(revision[1])
+
+
+def settled_last_modified(
+    modified: Optional[datetime],
+) -> Optional[datetime]:
+    if modified is None or timezone.now() - modified < LAST_MODIFIED_DELAY:
+        return None
+    return modified
+
+
+def stored_career(request, pk: str) -> Union[Career, CareerOutcome, None]:
+    """
+    The Career of an item request, loaded once for both its ETag and its
+    body.
+    """
+    if not hasattr(request, "stored_career"):
+        id = parse_career_id(pk)
+        request.stored_career = (
+            CareerOutcome.NOT_FOUND
+            if id is None
+            else repository.get_career_by_id(id)
+        )
+    return request.stored_career
+
+
+def stored_career_etag(request, pk: str, *args, **kwargs) -> Optional[str]:
+    career = stored_career(request, pk)
+    if career is None or career is CareerOutcome.NOT_FOUND:
+        return None
+
+    return career_etag(career, accepted_format(request))
+
+
+def write_precondition(request, media_format: str) -> Optional[Precondition]:
+    """
+    The If-Match and If-None-Match preconditions of a write, checked by the
+    repository against the row it writes rather than a separate read, so
+    two writes with the same ETag cannot both pass.
+    """
+    if_match = request.META.get("HTTP_IF_MATCH")
+    if_none_match = request.META.get("HTTP_IF_NONE_MATCH")
+    if if_match is None and if_none_match is None:
+        return None
+
+    def precondition(career: Optional[Career]) -> bool:
+        etag = career and career_etag(career, media_format)
+        if if_match is not None and not etag_matches(etag, if_match):
+            return False
+        if if_none_match is not None and etag_matches(
+            etag, if_none_match, weak=True
+        ):
+            return False
+        return True
+
+    return precondition
+
+
+def etag_matches(etag: Optional[str], header: str, weak=False) -> bool:
+    """
+    Whether the ETag of a stored Career, None when there is none, is in an
+    If-Match header, or with weak comparison an If-None-Match header.
+    """
+    if etag is None:
+        return False
+
+    etags = parse_etags(header)
+    if weak:
+        etags = [tag.removeprefix("W/") for tag in etags]
+    return "*" in etags or etag in etags
+
+
+careers_condition = method_decorator(
+    condition(etag_func=careers_etag, last_modified_func=careers_last_modified)
+)
+# An item only has the ETag of its row, as the careers Last-Modified
+# changes with the writes of every other row.
+career_condition = method_decorator(condition(etag_func=stored_career_etag))
+
+# Async views only render JSON.
+ASYNC_FORMAT = "json"
+
+
+async def acareers_revision(request) -> Optional[tuple[int, datetime]]:
+    if not hasattr(request, "careers_revision"):
+        request.careers_revision = await repository.arevision()
+    return request.careers_revision
+
+
+async def acareers_etag(request, *args, **kwargs) -> Optional[str]:
+    revision = await acareers_revision(request)
+    return revision and f'"{revision[0]}-{ASYNC_FORMAT}"'
+
+
+async def acareers_last_modified(
+    request, *args, **kwargs
+) -> Optional[datetime]:
+    revision = await acareers_revision(request)
+    return revision and settled_last_modified(revision[1])
+
+
+async def astored_career(
+    request, pk: str
+) -> Union[Career, CareerOutcome, None]:
+    if not hasattr(request, "stored_career"):
+        id = parse_career_id(pk)
+        request.stored_career = (
+            CareerOutcome.NOT_FOUND
+            if id is None
+            else await repository.aget_career_by_id(id)
+        )
+    return request.stored_career
+
+
+async def astored_career_etag(
+    request, pk: str, *args, **kwargs
+) -> Optional[str]:
+    career = await astored_career(request, pk)
+    if career is None or career is CareerOutcome.NOT_FOUND:
+        return None
+
+    return career_etag(career, ASYNC_FORMAT)
+
+
+def acondition(etag_func=None, last_modified_func=None):
+    """
+    Django's condition decorator for async view methods, whose validators
+    are awaited.
+    """
+
+    def decorator(method):
+        @wraps(method)
+        async def inner(view, request, *args, **kwargs):
+            res_etag = res_last_modified = None
+            if etag_func:
+                res_etag = await etag_func(request, *args, **kwargs)
+                res_etag = quote_etag(res_etag) if res_etag else None
+            if last_modified_func:
+                dt = await last_modified_func(request, *args, **kwargs)
+                res_last_modified = int(dt.timestamp()) if dt else None
+
+            response = get_conditional_response(
+                request, etag=res_etag, last_modified=res_last_modified
+            )
+            if response is None:
+                response = await method(view, request, *args, **kwargs)
+
+            if request.method in ("GET", "HEAD"):
+                if res_last_modified and not response.has_header(
+                    "Last-Modified"
+                ):
+                    response.headers["Last-Modified"] = http_date(
+                        res_last_modified
+                    )
+                if res_etag:
+                    response.headers.setdefault("ETag", res_etag)
+
+            return response
+
+        return inner
+
+    return decorator
+
+
+acareers_condition = acondition(
+    etag_func=acareers_etag, last_modified_func=acareers_last_modified
+)
+acareer_condition = acondition(etag_func=astored_career_etag)
@@ -1,8 +1,14 @@
 from datetime import datetime
-from typing import Optional
+from enum import Enum
+from typing import Callable, Optional
 
 
 class Career:
+    """
+    A Career has a fixed set of slots. Careers not yet stored have no id.
+    """
+
+    __slots__ = ("title", "content", "username", "id", "created_datetime")
 
     def __init__(
         self,
@@ -14,14 +20,70 @@ class Career:
     ):
         self.title = title
         self.content = content
+        self.username = username
+        self.id = id
+        self.created_datetime = created_datetime
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Career":
+        """
+        A Career from an (id, username, created_datetime, title, content) row.
+        """
+        id, username, created_datetime, title, content = row
+        return cls(title, content, username, id, created_datetime)
+
+
+class CareerOutcome(Enum):
+    """
+    What a repository returns instead of a Career when it has none.
+    """
+
+    NOT_FOUND = "not_found"
+    PRECONDITION_FAILED = "precondition_failed"
+
+
+# Checks a request's preconditions, e.g. If-Match, against the stored Career,
+# None when it does not exist.
+Precondition = Callable[[Optional[Career]], bool]
+
+
+class CareerPage:
+    __slots__ = ("careers", "next_cursor", "previous_cursor")
 
-        if username:
-            self.username = username
-        if id:
-            self.id = id
-        if created_datetime:
-            self.created_datetime = created_datetime
+    def __init__(
+        self,
+        careers: list[Career],
+        next_cursor=None,
+        previous_cursor=None,
+    ):
+        self.careers = careers
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+
+class CareerQuery:
+    """
+    Filters, ordering and page position of a Career list. With a full-text
+    search q, results are ranked by relevance instead of ordered. Only the
+    fields given are read, or all of them when fields is None.
+    """
 
-    @staticmethod
-    def create_empty_career():
-        return Career(username="", title="", content="")
+    def __init__(
+        self,
+        cursor=None,
+        page_size: Optional[int] = None,
+        ordering: str = "created_datetime",
+        username: Optional[str] = None,
+        created_after: Optional[datetime] = None,
+        created_before: Optional[datetime] = None,
+        q: Optional[str] = None,
+        fields: Optional[tuple[str, ...]] = None,
+    ):
+        self.cursor = cursor
+        self.page_size = page_size
+        self.ordering = ordering
+        self.username = username
+        self.created_after = created_after
+        self.created_before = created_before
+        self.q = q
+        self.fields = fields
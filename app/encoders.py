@@ -0,0 +1,74 @@
+from datetime import datetime, tzinfo
+from typing import Iterable, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+
+def output_timezone() -> Optional[tzinfo]:
+    if settings.USE_TZ:
+        return timezone.get_current_timezone()
+    return None
+
+
+def encode_datetime(
+    value: Optional[datetime], tz: Optional[tzinfo]
+) -> Optional[str]:
+    """
+    Same output as rest_framework's DateTimeField with the ISO 8601 format.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value
+
+    if tz is not None:
+        if value.utcoffset() is not None:
+            value = value.astimezone(tz)
+        else:
+            value = timezone.make_aware(value, tz)
+
+    value = value.isoformat()
+    if value.endswith("+00:00"):
+        value = value[:-6] + "Z"
+    return value
+
+
+class CareerEncoder:
+    """
+    Career to dict encoder, compiled once for a list of fields instead of
+    walking serializer fields for every object. With native_datetimes, for
+    formats that have a datetime type, datetimes are left as they are.
+    """
+
+    converters = {"created_datetime": "encode_datetime"}
+
+    def __init__(self, fields: Iterable[str], native_datetimes: bool = False):
+        self.fields = tuple(fields)
+        self.__encode = self.__compile(
+            self.fields, {} if native_datetimes else self.converters
+        )
+
+    def __call__(self, career) -> dict:
+        return self.__encode(career, output_timezone())
+
+    def many(self, careers: Iterable) -> list[dict]:
+        encode = self.__encode
+        tz = output_timezone()
+        return [encode(career, tz) for career in careers]
+
+    @staticmethod
+    def __compile(fields: tuple, converters: dict):
+        items = []
+        for field in fields:
+            value = f"career.{field}"
+            if field in converters:
+                value = f"{converters[field]}({value}, tz)"
+            items.append(f"{field!r}: {value}")
+
+        source = (
+            f"def encode(career, tz):\n    return {{{', '.join(items)}}}\n"
+        )
+        namespace = {"encode_datetime": encode_datetime}
+        exec(source, namespace)
+        return namespace["encode"]
@@ -0,0 +1,100 @@
+"""
+Group commit of the Careers created concurrently by the threads of a
+process: they are queued and inserted together, in one transaction, by
+one of the waiting threads.
+"""
+
+import threading
+from time import monotonic
+from typing import Optional
+
+from app.domain import Career
+
+
+class PendingCareer:
+    __slots__ = ("career", "saved", "done")
+
+    def __init__(self, career: Career):
+        self.career = career
+        self.saved: Optional[Career] = None
+        self.done = threading.Event()
+
+
+class GroupCommitter:
+    """
+    The first Career queued makes its thread the leader of the batch, which
+    waits up to max_delay seconds for other Careers. The batch is inserted
+    by the leader when that time is up, or right away by the thread whose
+    Career fills it to max_batch_size. A thread waits at most max_delay
+    plus one insert.
+
+    When the batch insert fails, its Careers are inserted one by one so
+    that a bad row only fails its own request.
+    """
+
+    def __init__(self, repository, max_batch_size: int, max_delay: float):
+        self.repository = repository
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.__condition = threading.Condition()
+        self.__pending: list[PendingCareer] = []
+        self.__generation = 0
+
+    def save_career(self, career: Career) -> Optional[Career]:
+        """
+        The inserted Career, with its id and created_datetime, or None when
+        it could not be inserted.
+        """
+        pending = PendingCareer(career)
+
+        with self.__condition:
+            self.__pending.append(pending)
+            generation = self.__generation
+            batch = None
+
+            if len(self.__pending) >= self.max_batch_size:
+                batch = self.__take_batch()
+
+            elif len(self.__pending) == 1:
+                deadline = monotonic() + self.max_delay
+                while (
+                    self.__generation == generation
+                    and (remaining := deadline - monotonic()) > 0
+                ):
+                    self.__condition.wait(remaining)
+
+                if self.__generation == generation:
+                    batch = self.__take_batch()
+
+        if batch is not None:
+            self.__insert(batch)
+
+        pending.done.wait()
+        return pending.saved
+
+    def __take_batch(self) -> list[PendingCareer]:
+        batch, self.__pending = self.__pending, []
+        self.__generation += 1
+        self.__condition.notify_all()
+        return batch
+
+    def __insert(self, batch: list[PendingCareer]):
+        try:
+            careers = self.repository.save_careers(
+                [pending.career for pending in batch], len(batch)
+            )
+            if careers is None and len(batch) > 1:
+                careers = [
+                    self.__insert_one(pending.career) for pending in batch
+                ]
+
+            for pending, career in zip(batch, careers or ()):
+                pending.saved = career
+
+        finally:
+            for pending in batch:
+                pending.done.set()
+
+    def __insert_one(self, career: Career) -> Optional[Career]:
+        careers = self.repository.save_careers([career], 1)
+        return careers[0] if careers else None
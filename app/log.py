@@ -0,0 +1,123 @@
+"""
+Logging for the request hot path: records are sampled before they are
+created and queued by the caller, then formatted as JSON and written by a
+background thread.
+"""
+
+import copy
+from datetime import datetime, timezone
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+
+from django.conf import settings
+
+
+# Attributes every LogRecord has, so the others come from "extra".
+RECORD_ATTRIBUTES = frozenset(
+    vars(logging.LogRecord("", logging.INFO, "", 0, "", (), None))
+) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record, with the fields passed in "extra".
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "pid": record.process,
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                payload[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            payload["exception"] = record.exc_text
+
+        return json.dumps(payload, default=str, ensure_ascii=False)
+
+
+class SampledLogger(logging.LoggerAdapter):
+    """
+    A logger that keeps CAREERS_LOG_INFO_SAMPLE_RATE of its INFO and DEBUG
+    records, and every record of a higher level. The sampling is done in
+    isEnabledFor, so the records left out are never created.
+    """
+
+    def process(self, msg, kwargs):
+        return msg, kwargs
+
+    def isEnabledFor(self, level: int) -> bool:
+        if not self.logger.isEnabledFor(level):
+            return False
+
+        rate = settings.CAREERS_LOG_INFO_SAMPLE_RATE
+        return level > logging.INFO or rate >= 1 or random.random() < rate
+
+
+class BackgroundListener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self):
+        # Waits for room in a full queue, as the thread keeps draining it.
+        self.queue.put(self._sentinel)
+
+
+class BackgroundHandler(logging.handlers.QueueHandler):
+    """
+    Queues records for a QueueListener thread that writes them as JSON to
+    stream, stderr by default, so they stay apart from the commands'
+    output. When the queue is full, records are dropped and counted
+    instead of blocking the request. The thread is started per process, so
+    it has to be created after workers are forked (no gunicorn --preload).
+    """
+
+    def __init__(self, queue_size: int = 10000, stream=None):
+        super().__init__(queue.Queue(queue_size))
+        self.dropped = 0
+
+        target = logging.StreamHandler(stream or sys.stderr)
+        target.setFormatter(JSONFormatter())
+        self.listener = BackgroundListener(self.queue, target)
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """
+        Merges the message arguments now, as they may change once the call
+        returns. JSON encoding is left to the listener thread.
+        """
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        return record
+
+    def close(self):
+        """
+        Writes the pending records, called by logging.shutdown at exit.
+        """
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+        super().close()
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
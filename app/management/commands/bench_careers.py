@@ -0,0 +1,337 @@
+"""
+End-to-end load benchmark of the careers endpoints.
+
+    python manage.py bench_careers --seed 10000 --requests 500 \
+        --concurrency 16 --output bench.json --baseline baseline.json
+
+Requests go through the whole Django stack in this process, or to a
+running server with --url (query counts are then not available). The
+careers seeded and created by the run are deleted afterwards, unless
+--keep. The server's cache is not invalidated with --url, so it may list
+them until its entries expire (CAREERS_CACHE_TIMEOUT).
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import http.client
+import json
+import statistics
+import time
+from typing import Callable, Optional
+from urllib.parse import urlsplit
+from uuid import uuid4
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, connections
+from django.test import Client
+
+from app.domain import Career
+from app.models import CareerModel
+from app.repositories import CareerRepository
+
+
+BENCH_USERNAME = "bench"
+ENDPOINTS = ("list", "create", "patch", "delete")
+# Metrics where a higher value is a regression, and those where lower is.
+HIGHER_IS_WORSE = ("p50_ms", "p95_ms", "p99_ms", "queries_per_request")
+LOWER_IS_WORSE = ("throughput_rps",)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class InProcessTransport:
+    """
+    Django test client requests, with the queries each one runs.
+    """
+
+    def __init__(self):
+        self.client = Client()
+
+    def request(self, method: str, path: str, body: Optional[dict]):
+        counter = QueryCounter()
+        with connection.execute_wrapper(counter):
+            response = self.client.generic(
+                method,
+                path,
+                json.dumps(body) if body is not None else "",
+                content_type="application/json",
+                HTTP_ACCEPT="application/json",
+            )
+        return response.status_code, response.content, counter.count
+
+
+class HTTPTransport:
+    """
+    Keep-alive HTTP requests to a running server.
+    """
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        connection_class = (
+            http.client.HTTPSConnection
+            if parts.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.connection = connection_class(parts.hostname, parts.port)
+        self.prefix = parts.path.rstrip("/")
+
+    def request(self, method: str, path: str, body: Optional[dict]):
+        self.connection.request(
+            method,
+            self.prefix + path,
+            json.dumps(body) if body is not None else None,
+            {"Content-Type": "application/json", "Accept": "application/json"},
+        )
+        response = self.connection.getresponse()
+        return response.status, response.read(), None
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    index = max(int(round(fraction * len(values))) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def summarize(samples: list[tuple], elapsed: float) -> dict:
+    latencies = sorted(latency for latency, _, _ in samples)
+    queries = [count for _, _, count in samples if count is not None]
+    errors = sum(1 for _, ok, _ in samples if not ok)
+
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "throughput_rps": round(len(samples) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "queries_per_request": (
+            round(statistics.mean(queries), 2) if queries else None
+        ),
+    }
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> dict:
+    """
+    Ratio of every metric to the baseline, and the metrics that got worse
+    by more than the tolerance.
+    """
+    comparison = {}
+
+    for endpoint, metrics in report["endpoints"].items():
+        base = baseline.get("endpoints", {}).get(endpoint)
+        if not base:
+            continue
+
+        ratios, regressions = {}, []
+        for metric in HIGHER_IS_WORSE + LOWER_IS_WORSE:
+            value, base_value = metrics.get(metric), base.get(metric)
+            if not value or not base_value:
+                continue
+
+            ratio = value / base_value
+            ratios[metric] = round(ratio, 3)
+            if (metric in HIGHER_IS_WORSE and ratio > 1 + tolerance) or (
+                metric in LOWER_IS_WORSE and ratio < 1 - tolerance
+            ):
+                regressions.append(metric)
+
+        comparison[endpoint] = {"ratios": ratios, "regressions": regressions}
+
+    return comparison
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds careers and benchmarks the list, create, patch and delete "
+        "endpoints, printing throughput, latency percentiles and query "
+        "counts as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seed", type=int, default=1000)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+        parser.add_argument("--page-size", type=int, default=10)
+        parser.add_argument(
+            "--url",
+            help="Base URL of a running server, e.g. http://localhost:8000",
+        )
+        parser.add_argument("--output", help="File to write the JSON to")
+        parser.add_argument("--baseline", help="JSON of an earlier run")
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.2,
+            help="Allowed relative regression against the baseline",
+        )
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the seeded careers"
+        )
+
+    def handle(self, *args, **options):
+        if options["requests"] < 1 or options["concurrency"] < 1:
+            raise CommandError("--requests and --concurrency must be >= 1")
+
+        baseline = None
+        if options["baseline"]:
+            with open(options["baseline"]) as baseline_file:
+                baseline = json.load(baseline_file)
+
+        url = options["url"]
+        transport_factory = (
+            (lambda: HTTPTransport(url)) if url else InProcessTransport
+        )
+
+        # Created careers get a title of their own, as responses to a
+        # create do not have the id.
+        created_title = f"Benchmark career {uuid4().hex}"
+        ids = self.seed(options["seed"], options["requests"])
+        try:
+            report = self.run(transport_factory, ids, created_title, options)
+        finally:
+            if not options["keep"]:
+                self.clean_up(ids, created_title, local_cache=not url)
+
+        failed = []
+        if baseline is not None:
+            report["comparison"] = compare(
+                report, baseline, options["tolerance"]
+            )
+            failed = [
+                endpoint
+                for endpoint, result in report["comparison"].items()
+                if result["regressions"]
+            ]
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            with open(options["output"], "w") as output_file:
+                output_file.write(output + "\n")
+        self.stdout.write(output)
+
+        if failed:
+            raise CommandError(
+                f"Regressions against the baseline: {', '.join(failed)}"
+            )
+
+    def seed(self, rows: int, requests: int) -> list[int]:
+        """
+        At least one career per patch and delete request, inserted in bulk.
+        """
+        rows = max(rows, requests)
+        careers = CareerRepository().save_careers(
+            [
+                Career(
+                    username=BENCH_USERNAME,
+                    title=f"Benchmark career {index}",
+                    content="Lorem ipsum dolor sit amet. " * 10,
+                )
+                for index in range(rows)
+            ],
+            batch_size=1000,
+        )
+        if careers is None:
+            raise CommandError("Could not seed the benchmark careers")
+
+        return [career.id for career in careers]
+
+    @staticmethod
+    def clean_up(ids: list[int], created_title: str, local_cache: bool):
+        """
+        Deletes the seeded careers by id and the created ones by title, so
+        careers that were already there are kept whatever their username.
+        """
+        while ids:
+            batch, ids = ids[:1000], ids[1000:]
+            CareerModel.objects.filter(id__in=batch).delete()
+        CareerModel.objects.filter(
+            username=BENCH_USERNAME, title=created_title
+        ).delete()
+        if local_cache:
+            CareerRepository.cache.invalidate()
+
+    def run(
+        self,
+        transport_factory: Callable,
+        ids: list[int],
+        created_title: str,
+        options: dict,
+    ) -> dict:
+        count = options["requests"]
+        page_size = options["page_size"]
+        create_body = {
+            "username": BENCH_USERNAME,
+            "title": created_title,
+            "content": "Lorem ipsum dolor sit amet.",
+        }
+        patch_body = {"title": "Patched", "content": "Patched content"}
+        # Patches and deletes use different careers, deletes the newest.
+        workloads = {
+            "list": [("GET", f"/careers/?page_size={page_size}", None)]
+            * count,
+            "create": [("POST", "/careers/", create_body)] * count,
+            "patch": [
+                ("PATCH", f"/careers/{id}/", patch_body) for id in ids[:count]
+            ],
+            "delete": [
+                ("DELETE", f"/careers/{id}/", None) for id in ids[-count:]
+            ],
+        }
+
+        report = {
+            "environment": {
+                "vendor": connection.vendor,
+                "target": options["url"] or "in-process",
+                "seed": len(ids),
+                "requests": count,
+                "concurrency": options["concurrency"],
+            },
+            "endpoints": {},
+        }
+        for endpoint in ENDPOINTS:
+            samples, elapsed = self.drive(
+                transport_factory, workloads[endpoint], options["concurrency"]
+            )
+            report["endpoints"][endpoint] = summarize(samples, elapsed)
+
+        return report
+
+    @staticmethod
+    def drive(
+        transport_factory: Callable, workload: list, concurrency: int
+    ) -> tuple[list[tuple], float]:
+        """
+        Runs the requests in concurrency workers, each with its own client
+        and database connection.
+        """
+
+        def worker(requests: list) -> list[tuple]:
+            transport = transport_factory()
+            samples = []
+            try:
+                for method, path, body in requests:
+                    started = time.perf_counter()
+                    status, _, queries = transport.request(method, path, body)
+                    samples.append(
+                        (time.perf_counter() - started, status < 400, queries)
+                    )
+            finally:
+                if concurrency > 1:
+                    connections.close_all()
+            return samples
+
+        chunks = [workload[index::concurrency] for index in range(concurrency)]
+        started = time.perf_counter()
+        if concurrency == 1:
+            results = [worker(chunks[0])]
+        else:
+            with ThreadPoolExecutor(concurrency) as executor:
+                results = list(executor.map(worker, chunks))
+        elapsed = time.perf_counter() - started
+
+        return [sample for samples in results for sample in samples], elapsed
@@ -0,0 +1,222 @@
+"""
+Export of the careers table to a CSV, NDJSON or Parquet file, e.g. the
+careers created in January for an incremental load:
+
+    python manage.py export_careers careers.parquet \
+        --since 2024-01-01 --until 2024-02-01
+
+Rows come through a server-side cursor chunk by chunk and are written as
+they arrive, so memory stays constant however big the table is. Parquet
+files get a row group every --row-group-size rows. The
+file is written next to the path and moved there once complete.
+"""
+
+import csv
+from datetime import datetime, time as dt_time
+from itertools import islice
+import os
+from pathlib import Path
+import time
+from typing import Optional
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from app.encoders import CareerEncoder, encode_datetime, output_timezone
+from app.renderers import dumps
+from app.repositories import CAREER_COLUMNS, CareerRepository
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # pragma: no cover
+    pyarrow = None
+
+
+FORMATS = {
+    ".csv": "csv",
+    ".jsonl": "ndjson",
+    ".ndjson": "ndjson",
+    ".parquet": "parquet",
+}
+
+
+class CSVWriter:
+    def __init__(self, path: Path):
+        self.__file = open(path, "w", newline="", encoding="utf-8")
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(CAREER_COLUMNS)
+        self.__tz = output_timezone()
+
+    def write(self, careers: list):
+        tz = self.__tz
+        self.__writer.writerows(
+            (
+                career.id,
+                career.username,
+                encode_datetime(career.created_datetime, tz),
+                career.title,
+                career.content,
+            )
+            for career in careers
+        )
+
+    def close(self):
+        self.__file.close()
+
+
+class NDJSONWriter:
+    def __init__(self, path: Path):
+        self.__file = open(path, "wb")
+        self.__encoder = CareerEncoder(CAREER_COLUMNS)
+
+    def write(self, careers: list):
+        self.__file.writelines(
+            dumps(item) + b"\n" for item in self.__encoder.many(careers)
+        )
+
+    def close(self):
+        self.__file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path: Path):
+        self.__schema = pyarrow.schema(
+            [
+                ("id", pyarrow.int64()),
+                ("username", pyarrow.string()),
+                ("created_datetime", pyarrow.timestamp("us", tz="UTC")),
+                ("title", pyarrow.string()),
+                ("content", pyarrow.string()),
+            ]
+        )
+        self.__writer = pyarrow.parquet.ParquetWriter(path, self.__schema)
+
+    def write(self, careers: list):
+        """
+        Writes the careers as one row group.
+        """
+        self.__writer.write_table(
+            pyarrow.table(
+                [
+                    [getattr(career, column) for career in careers]
+                    for column in CAREER_COLUMNS
+                ],
+                schema=self.__schema,
+            )
+        )
+
+    def close(self):
+        self.__writer.close()
+
+
+WRITERS = {"csv": CSVWriter, "ndjson": NDJSONWriter, "parquet": ParquetWriter}
+
+
+class Command(BaseCommand):
+    help = (
+        "Streams careers, optionally created in a --since/--until range, "
+        "to a CSV, NDJSON or Parquet file."
+    )
+
+    repository = CareerRepository()
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=list(WRITERS),
+            help="Format of the file, from its extension by default",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=settings.CAREERS_EXPORT_CHUNK_SIZE,
+            help="Rows fetched from the database at a time",
+        )
+        parser.add_argument(
+            "--row-group-size",
+            type=int,
+            default=settings.CAREERS_EXPORT_ROW_GROUP_SIZE,
+            help="Rows written at a time, a row group in Parquet files",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only careers created at or after this date or datetime",
+        )
+        parser.add_argument(
+            "--until",
+            help="Only careers created before this date or datetime",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        media_format = options["format"] or FORMATS.get(path.suffix.lower())
+        if media_format is None:
+            raise CommandError("Use --format for files without a known type")
+
+        if media_format == "parquet" and pyarrow is None:
+            raise CommandError("Parquet exports need pyarrow installed")
+
+        if options["chunk_size"] < 1 or options["row_group_size"] < 1:
+            raise CommandError(
+                "--chunk-size and --row-group-size must be >= 1"
+            )
+
+        since = self.parse_datetime("since", options["since"])
+        until = self.parse_datetime("until", options["until"])
+
+        started = time.perf_counter()
+        careers = self.repository.iter_careers(
+            options["chunk_size"], since=since, until=until
+        )
+        if careers is None:
+            raise CommandError("Could not read the careers")
+
+        temporary_path = path.with_name(f"{path.name}.tmp")
+        writer = WRITERS[media_format](temporary_path)
+        exported = 0
+        try:
+            while batch := list(islice(careers, options["row_group_size"])):
+                writer.write(batch)
+                exported += len(batch)
+        except Exception:
+            writer.close()
+            temporary_path.unlink()
+            raise
+
+        writer.close()
+        os.replace(temporary_path, path)
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Exported {exported} careers to {path} in {elapsed:.2f}s "
+                f"({exported / elapsed if elapsed else 0:.0f} rows/s)"
+            )
+        )
+
+    @staticmethod
+    def parse_datetime(option: str, value: Optional[str]):
+        """
+        An aware datetime from an ISO 8601 datetime or date (at midnight),
+        in the current timezone when it has no offset.
+        """
+        if value is None:
+            return None
+
+        try:
+            parsed = parse_datetime(value)
+            if parsed is None and (date := parse_date(value)) is not None:
+                parsed = datetime.combine(date, dt_time())
+        except ValueError:
+            parsed = None
+
+        if parsed is None:
+            raise CommandError(f"--{option} {value} is not a date or datetime")
+
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
@@ -0,0 +1,202 @@
+"""
+Bulk import of careers from an NDJSON or CSV file, e.g. the backlog of
+this repository with its fields mapped to Career fields:
+
+    python manage.py import_careers requests.jsonl \
+        --field-map username=request_id --field-map content=body
+
+Rows are validated like POST /careers/ bodies and inserted one batch per
+transaction with COPY on Postgres. The number of rows read is saved per
+file (CareerImportModel) in the transaction of each batch, so an
+interrupted import resumes after its last committed batch and never
+imports a batch twice.
+"""
+
+import csv
+from itertools import islice
+import json
+from pathlib import Path
+import time
+from typing import Iterator
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.exceptions import ValidationError
+
+from app.domain import Career
+from app.repositories import CareerRepository
+from app.serializers import CreateCareerSerializer
+
+
+FORMATS = {".csv": "csv", ".jsonl": "ndjson", ".ndjson": "ndjson"}
+INVALID_JSON = "Invalid JSON object."
+
+
+class Command(BaseCommand):
+    help = (
+        "Imports careers from an NDJSON or CSV file in batches, printing "
+        "progress and rows per second. Interrupted imports resume from "
+        "the last committed batch."
+    )
+
+    repository = CareerRepository()
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=["ndjson", "csv"],
+            help="Format of the file, from its extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.CAREERS_BULK_BATCH_SIZE,
+        )
+        parser.add_argument(
+            "--field-map",
+            action="append",
+            default=[],
+            metavar="FIELD=SOURCE",
+            help="Read a Career field from another source field",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Import from the first row, ignoring the saved position",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.is_file():
+            raise CommandError(f"{path} is not a file")
+
+        media_format = options["format"] or FORMATS.get(path.suffix.lower())
+        if media_format is None:
+            raise CommandError("Use --format for files without a known type")
+
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be >= 1")
+
+        field_map = self.field_map(options["field_map"])
+        key = str(path.resolve())
+        if options["restart"]:
+            position = self.repository.save_import_position(key, 0)
+        else:
+            position = self.repository.import_position(key)
+        if position is None:
+            raise CommandError(f"Could not load the import position of {path}")
+
+        records = islice(self.records(path, media_format), position, None)
+        if position:
+            self.stdout.write(f"Resuming after {position} rows")
+
+        imported = invalid = 0
+        started = time.perf_counter()
+        serializer = CreateCareerSerializer()
+
+        while batch := list(islice(records, options["batch_size"])):
+            careers = []
+            for number, item in batch:
+                career, errors = self.career(serializer, item, field_map)
+                if career is None:
+                    invalid += 1
+                    self.stderr.write(f"Row {number}: {json.dumps(errors)}")
+                else:
+                    careers.append(career)
+
+            read = position + len(batch)
+            with transaction.atomic():
+                count = self.repository.copy_careers(careers) if careers else 0
+                saved = self.repository.save_import_position(key, read)
+                if count is None or saved is None:
+                    transaction.set_rollback(True)
+                    raise CommandError(
+                        f"Could not import the rows after {position}, run "
+                        "the command again to resume"
+                    )
+
+            position = read
+            imported += count
+
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"{position} rows read, {imported} imported, "
+                f"{invalid} invalid, {imported / elapsed:.0f} rows/s"
+            )
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {imported} careers in {elapsed:.2f}s "
+                f"({imported / elapsed if elapsed else 0:.0f} rows/s), "
+                f"{invalid} invalid rows"
+            )
+        )
+
+    @staticmethod
+    def field_map(entries: list[str]) -> dict[str, str]:
+        fields = CreateCareerSerializer.Meta.fields
+        field_map = {field: field for field in fields}
+
+        for entry in entries:
+            field, _, source = entry.partition("=")
+            if field not in fields or not source:
+                raise CommandError(
+                    f"--field-map {entry} is not one of "
+                    f"{', '.join(f'{field}=SOURCE' for field in fields)}"
+                )
+            field_map[field] = source
+
+        return field_map
+
+    @staticmethod
+    def records(path: Path, media_format: str) -> Iterator[tuple[int, dict]]:
+        """
+        (row number, item) of every non-blank row. Rows that are not JSON
+        objects are the INVALID_JSON string.
+        """
+        with open(path, newline="", encoding="utf-8") as source:
+            if media_format == "csv":
+                csv.field_size_limit(2**31 - 1)
+                yield from enumerate(csv.DictReader(source), 1)
+                return
+
+            number = 0
+            for line in source:
+                line = line.strip()
+                if not line:
+                    continue
+
+                number += 1
+                try:
+                    item = json.loads(line)
+                except ValueError:
+                    item = INVALID_JSON
+                yield number, item if isinstance(item, dict) else INVALID_JSON
+
+    @staticmethod
+    def career(serializer, item, field_map: dict[str, str]):
+        if item is INVALID_JSON:
+            return None, INVALID_JSON
+
+        try:
+            data = serializer.run_validation(
+                {
+                    field: item[source]
+                    for field, source in field_map.items()
+                    if source in item
+                }
+            )
+        except ValidationError as e:
+            return None, e.detail
+
+        return (
+            Career(
+                username=data["username"],
+                title=data["title"],
+                content=data["content"],
+            ),
+            None,
+        )
@@ -0,0 +1,234 @@
+"""
+Per-route request metrics of this worker process, split in database,
+serialization and remaining application time.
+"""
+
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+from time import perf_counter
+from typing import Optional
+
+from app.stats import service_stats
+
+
+# Request durations, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class RequestTimings:
+    """
+    Time spent by one request in each phase, and its number of queries.
+    """
+
+    def __init__(self):
+        self.phases = {"db": 0.0, "serialization": 0.0}
+        self.queries = 0
+
+    def add(self, phase: str, seconds: float):
+        self.phases[phase] += seconds
+
+
+_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "careers_request_timings", default=None
+)
+
+
+@contextmanager
+def track_request():
+    timings = RequestTimings()
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def timed(phase: str):
+    """
+    Adds the time spent in the block to the phase of the current request.
+    Also a decorator.
+    """
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, perf_counter() - started)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper of every database connection, see AppConfig.ready.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+
+    started = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.add("db", perf_counter() - started)
+        timings.queries += 1
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+def server_timing(timings: RequestTimings, total: float) -> str:
+    db = timings.phases["db"]
+    serialization = timings.phases["serialization"]
+    app = max(total - db - serialization, 0.0)
+    return (
+        f'db;dur={db * 1000:.2f};desc="{timings.queries} queries", '
+        f"serialization;dur={serialization * 1000:.2f}, "
+        f"app;dur={app * 1000:.2f}, "
+        f"total;dur={total * 1000:.2f}"
+    )
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__responses = {}
+        self.__routes = {}
+
+    def observe(
+        self,
+        route: str,
+        method: str,
+        status: int,
+        seconds: float,
+        timings: RequestTimings,
+    ):
+        with self.__lock:
+            key = (route, method, str(status))
+            self.__responses[key] = self.__responses.get(key, 0) + 1
+
+            series = self.__routes.get((route, method))
+            if series is None:
+                series = self.__routes[(route, method)] = {
+                    "buckets": [0] * len(LATENCY_BUCKETS),
+                    "count": 0,
+                    "sum": 0.0,
+                    "queries": 0,
+                    "db": 0.0,
+                    "serialization": 0.0,
+                }
+
+            index = bisect_left(LATENCY_BUCKETS, seconds)
+            if index < len(LATENCY_BUCKETS):
+                series["buckets"][index] += 1
+            series["count"] += 1
+            series["sum"] += seconds
+            series["queries"] += timings.queries
+            series["db"] += timings.phases["db"]
+            series["serialization"] += timings.phases["serialization"]
+
+    def reset(self):
+        with self.__lock:
+            self.__responses.clear()
+            self.__routes.clear()
+
+    def render(self) -> str:
+        """
+        Prometheus text exposition format, version 0.0.4.
+        """
+        with self.__lock:
+            responses = dict(self.__responses)
+            routes = {
+                key: {**series, "buckets": list(series["buckets"])}
+                for key, series in self.__routes.items()
+            }
+
+        lines = [
+            "# HELP careers_http_requests_total Requests by route, method "
+            "and status.",
+            "# TYPE careers_http_requests_total counter",
+        ]
+        for (route, method, status), count in sorted(responses.items()):
+            labels = f'route="{route}",method="{method}",status="{status}"'
+            lines.append(f"careers_http_requests_total{{{labels}}} {count}")
+
+        lines += [
+            "# HELP careers_http_request_duration_seconds Request latency.",
+            "# TYPE careers_http_request_duration_seconds histogram",
+        ]
+        for (route, method), series in sorted(routes.items()):
+            labels = f'route="{route}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, series["buckets"]):
+                cumulative += count
+                lines.append(
+                    "careers_http_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines += [
+                "careers_http_request_duration_seconds_bucket"
+                f'{{{labels},le="+Inf"}} {series["count"]}',
+                f"careers_http_request_duration_seconds_sum{{{labels}}} "
+                f"{series['sum']}",
+                f"careers_http_request_duration_seconds_count{{{labels}}} "
+                f"{series['count']}",
+            ]
+
+        for name, key, help_text in (
+            ("careers_db_queries_total", "queries", "Database queries."),
+            (
+                "careers_db_duration_seconds_total",
+                "db",
+                "Time spent in database queries.",
+            ),
+            (
+                "careers_serialization_duration_seconds_total",
+                "serialization",
+                "Time spent encoding and rendering responses.",
+            ),
+        ):
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for (route, method), series in sorted(routes.items()):
+                labels = f'route="{route}",method="{method}"'
+                lines.append(f"{name}{{{labels}}} {series[key]}")
+
+        lines += self.__service_lines()
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def __service_lines() -> list[str]:
+        stats = service_stats()
+        lines = []
+
+        for counter, value in sorted(stats["cache"].items()):
+            name = f"careers_cache_{counter}_total"
+            lines += [f"# TYPE {name} counter", f"{name} {value}"]
+
+        pools = stats["database_pools"]
+        for gauge in ("size", "available", "in_use", "waiting"):
+            name = f"careers_db_pool_{gauge}"
+            lines.append(f"# TYPE {name} gauge")
+            for alias, pool in sorted(pools.items()):
+                lines.append(f'{name}{{alias="{alias}"}} {pool[gauge]}')
+
+        for name, counter, scale in (
+            ("careers_db_pool_requests_total", "requests", 1),
+            ("careers_db_pool_requests_errors_total", "requests_errors", 1),
+            ("careers_db_pool_wait_seconds_total", "wait_ms", 0.001),
+        ):
+            lines.append(f"# TYPE {name} counter")
+            for alias, pool in sorted(pools.items()):
+                value = pool[counter] * scale
+                lines.append(f'{name}{{alias="{alias}"}} {value}')
+
+        return lines
+
+
+registry = MetricsRegistry()
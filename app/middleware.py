@@ -0,0 +1,233 @@
+import random
+import time
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+
+from app.compression import CODECS, ETAG_ENCODING_SUFFIX, negotiate
+from app.metrics import registry, server_timing, timed, track_request
+from app.routers import use_database, use_primary
+
+
+PRIMARY_COOKIE = "careers_primary_until"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+# Content types that are already compressed.
+COMPRESSED_CONTENT_TYPES = ("image/", "video/", "audio/", "application/zip")
+
+
+@sync_and_async_middleware
+def read_your_writes_middleware(get_response):
+    """
+    Reads of unsafe requests, and of any request of a client in the
+    stickiness window after its last successful write, go to the primary,
+    so clients always read their own writes despite replication lag. The
+    reads of other requests all go to one replica, so the validators of a
+    response come from the database its body was read from.
+    """
+
+    def is_pinned(request) -> bool:
+        if request.method not in SAFE_METHODS:
+            return True
+
+        try:
+            until = float(request.COOKIES.get(PRIMARY_COOKIE, 0))
+        except ValueError:
+            return False
+
+        return until > time.time()
+
+    def replica() -> str:
+        return random.choice(settings.CAREERS_READ_REPLICAS)
+
+    def pin(request, response):
+        window = settings.CAREERS_PRIMARY_STICKINESS_SECONDS
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and window > 0
+        ):
+            response.set_cookie(
+                PRIMARY_COOKIE,
+                str(time.time() + window),
+                max_age=window,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            if not settings.CAREERS_READ_REPLICAS:
+                return await get_response(request)
+
+            if not is_pinned(request):
+                with use_database(replica()):
+                    return await get_response(request)
+
+            with use_primary():
+                response = await get_response(request)
+            return pin(request, response)
+
+    else:
+
+        def middleware(request):
+            if not settings.CAREERS_READ_REPLICAS:
+                return get_response(request)
+
+            if not is_pinned(request):
+                with use_database(replica()):
+                    return get_response(request)
+
+            with use_primary():
+                response = get_response(request)
+            return pin(request, response)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Records the latency, queries, database and serialization time of each
+    request by route, and returns the split in a Server-Timing header.
+    Streamed bodies are not included.
+    """
+
+    def record(request, response, timings, started):
+        total = time.perf_counter() - started
+        match = request.resolver_match
+        route = match.route if match else "unmatched"
+        registry.observe(
+            route, request.method, response.status_code, total, timings
+        )
+        if settings.CAREERS_SERVER_TIMING:
+            response["Server-Timing"] = server_timing(timings, total)
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            with track_request() as timings:
+                response = await get_response(request)
+            return record(request, response, timings, started)
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            with track_request() as timings:
+                response = get_response(request)
+            return record(request, response, timings, started)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def compression_middleware(get_response):
+    """
+    Compresses responses of at least CAREERS_COMPRESSION_MIN_BYTES, and
+    streamed ones chunk by chunk, with the coding the client prefers. The
+    coding is appended to the ETag of a compressed response, and removed
+    from If-Match and If-None-Match, so views compare their own ETags.
+    """
+
+    def strip_etag_encodings(request) -> set[str]:
+        found = set()
+        for header in ("HTTP_IF_MATCH", "HTTP_IF_NONE_MATCH"):
+            value = request.META.get(header)
+            if value:
+                found.update(ETAG_ENCODING_SUFFIX.findall(value))
+                request.META[header] = ETAG_ENCODING_SUFFIX.sub('"', value)
+        return found
+
+    def codec_for(request, response):
+        if (
+            response.has_header("Content-Encoding")
+            or response.get("Content-Type", "").startswith(
+                COMPRESSED_CONTENT_TYPES
+            )
+            or not response.streaming
+            and len(response.content) < settings.CAREERS_COMPRESSION_MIN_BYTES
+        ):
+            return None
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            settings.CAREERS_COMPRESSION_ENCODINGS,
+        )
+        if encoding is None:
+            return None
+
+        return CODECS[encoding](settings.CAREERS_COMPRESSION_LEVELS[encoding])
+
+    def tag(response, encoding: str):
+        etag = response.get("ETag")
+        if etag and etag.endswith('"'):
+            response["ETag"] = f'{etag[:-1]}-{encoding}"'
+
+    def compress(request, response, etag_encodings: set[str]):
+        if response.status_code == 304:
+            # Not modified responses repeat the ETag the client sent.
+            if len(etag_encodings) == 1:
+                tag(response, etag_encodings.pop())
+            return response
+
+        codec = codec_for(request, response)
+        if codec is None:
+            return response
+
+        if response.streaming:
+            compressor = codec.compressor()
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    compressor, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    compressor, response.streaming_content
+                )
+            del response["Content-Length"]
+        else:
+            with timed("serialization"):
+                compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        response["Content-Encoding"] = codec.encoding
+        tag(response, codec.encoding)
+        return response
+
+    def compress_stream(compressor, chunks):
+        for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+
+    async def acompress_stream(compressor, chunks):
+        async for chunk in chunks:
+            if chunk:
+                yield compressor.compress(chunk)
+        yield compressor.finish()
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            etag_encodings = strip_etag_encodings(request)
+            response = await get_response(request)
+            return compress(request, response, etag_encodings)
+
+    else:
+
+        def middleware(request):
+            etag_encodings = strip_etag_encodings(request)
+            response = get_response(request)
+            return compress(request, response, etag_encodings)
+
+    return middleware
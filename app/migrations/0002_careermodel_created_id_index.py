@@ -0,0 +1,19 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="careermodel",
+            index=models.Index(
+                fields=["created_datetime", "id"], name="career_created_id_idx"
+            ),
+        ),
+    ]
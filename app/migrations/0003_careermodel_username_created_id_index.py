@@ -0,0 +1,20 @@
+# Generated by Django 5.1.4 on 2026-10-18 15:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0002_careermodel_created_id_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="careermodel",
+            index=models.Index(
+                fields=["username", "created_datetime", "id"],
+                name="career_user_created_id_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,87 @@
+from django.db import migrations
+
+
+# The search index lives outside the model, so it is created per database
+# vendor. On SQLite, migrations that remake app_careermodel drop the
+# triggers below and have to create them again.
+
+POSTGRESQL_FORWARDS = [
+    """
+    ALTER TABLE app_careermodel ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english', coalesce(content, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX career_search_vector_idx ON app_careermodel
+    USING GIN (search_vector)
+    """,
+]
+
+POSTGRESQL_BACKWARDS = [
+    "DROP INDEX IF EXISTS career_search_vector_idx",
+    "ALTER TABLE app_careermodel DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARDS = [
+    """
+    CREATE VIRTUAL TABLE app_careermodel_fts USING fts5(
+        title, content, content='app_careermodel', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER app_careermodel_fts_insert AFTER INSERT ON app_careermodel
+    BEGIN
+        INSERT INTO app_careermodel_fts (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    """
+    CREATE TRIGGER app_careermodel_fts_delete AFTER DELETE ON app_careermodel
+    BEGIN
+        INSERT INTO app_careermodel_fts (app_careermodel_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+    END
+    """,
+    """
+    CREATE TRIGGER app_careermodel_fts_update AFTER UPDATE ON app_careermodel
+    BEGIN
+        INSERT INTO app_careermodel_fts (app_careermodel_fts, rowid, title, content)
+        VALUES ('delete', old.id, old.title, old.content);
+        INSERT INTO app_careermodel_fts (rowid, title, content)
+        VALUES (new.id, new.title, new.content);
+    END
+    """,
+    "INSERT INTO app_careermodel_fts (app_careermodel_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS app_careermodel_fts_insert",
+    "DROP TRIGGER IF EXISTS app_careermodel_fts_delete",
+    "DROP TRIGGER IF EXISTS app_careermodel_fts_update",
+    "DROP TABLE IF EXISTS app_careermodel_fts",
+]
+
+
+def run_for_vendor(postgresql: list[str], sqlite: list[str]):
+    def run(apps, schema_editor):
+        statements = {"postgresql": postgresql, "sqlite": sqlite}
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0003_careermodel_username_created_id_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_for_vendor(POSTGRESQL_FORWARDS, SQLITE_FORWARDS),
+            run_for_vendor(POSTGRESQL_BACKWARDS, SQLITE_BACKWARDS),
+        ),
+    ]
@@ -0,0 +1,90 @@
+from django.db import migrations, models
+
+
+# Like the search index of 0004, the triggers are created per database
+# vendor, and migrations that remake app_careermodel on SQLite have to
+# create them again. Postgres writers bump the slot of their backend once
+# per statement; SQLite has a single writer and one slot. Slots are
+# created by their first bump.
+
+SLOTS = 16
+
+POSTGRESQL_FORWARDS = [
+    f"""
+    CREATE FUNCTION app_careermodel_revision() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO app_careerrevisionmodel AS revision
+            (slot, version, modified)
+        VALUES (pg_backend_pid() % {SLOTS}, 1, clock_timestamp())
+        ON CONFLICT (slot) DO UPDATE
+        SET version = revision.version + 1, modified = excluded.modified;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER app_careermodel_revision
+    AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON app_careermodel
+    FOR EACH STATEMENT EXECUTE FUNCTION app_careermodel_revision()
+    """,
+]
+
+POSTGRESQL_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS app_careermodel_revision ON app_careermodel",
+    "DROP FUNCTION IF EXISTS app_careermodel_revision()",
+]
+
+SQLITE_FORWARDS = [
+    f"""
+    CREATE TRIGGER app_careermodel_revision_{event.lower()}
+    AFTER {event} ON app_careermodel
+    BEGIN
+        INSERT INTO app_careerrevisionmodel (slot, version, modified)
+        VALUES (0, 1, strftime('%Y-%m-%d %H:%M:%f', 'now'))
+        ON CONFLICT (slot) DO UPDATE
+        SET version = version + 1, modified = excluded.modified;
+    END
+    """
+    for event in ("INSERT", "UPDATE", "DELETE")
+]
+
+SQLITE_BACKWARDS = [
+    f"DROP TRIGGER IF EXISTS app_careermodel_revision_{event}"
+    for event in ("insert", "update", "delete")
+]
+
+
+def run_for_vendor(postgresql: list[str], sqlite: list[str]):
+    def run(apps, schema_editor):
+        statements = {"postgresql": postgresql, "sqlite": sqlite}
+        for sql in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0004_careermodel_full_text_search"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CareerRevisionModel",
+            fields=[
+                (
+                    "slot",
+                    models.PositiveSmallIntegerField(
+                        primary_key=True, serialize=False
+                    ),
+                ),
+                ("version", models.BigIntegerField(default=0)),
+                ("modified", models.DateTimeField()),
+            ],
+        ),
+        migrations.RunPython(
+            run_for_vendor(POSTGRESQL_FORWARDS, SQLITE_FORWARDS),
+            run_for_vendor(POSTGRESQL_BACKWARDS, SQLITE_BACKWARDS),
+        ),
+    ]
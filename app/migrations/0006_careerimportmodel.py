@@ -0,0 +1,30 @@
+# Generated by Django 5.1.4 on 2026-10-18 16:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0005_careerrevisionmodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CareerImportModel",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("path", models.TextField(unique=True)),
+                ("position", models.PositiveBigIntegerField(default=0)),
+                ("modified", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
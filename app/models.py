@@ -7,3 +7,40 @@ class CareerModel(models.Model):
     created_datetime = models.DateTimeField(auto_now_add=True)
     title = models.CharField(max_length=50)
     content = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_datetime", "id"],
+                name="career_created_id_idx",
+            ),
+            models.Index(
+                fields=["username", "created_datetime", "id"],
+                name="career_user_created_id_idx",
+            ),
+        ]
+
+
+class CareerRevisionModel(models.Model):
+    """
+    Change counters of the careers table, bumped by database triggers on
+    every write (migration 0005), including writes made outside the app.
+    Writers bump one of a few slots, so concurrent writes do not queue on
+    one row lock, and the sum of the versions changes with every commit.
+    """
+
+    slot = models.PositiveSmallIntegerField(primary_key=True)
+    version = models.BigIntegerField(default=0)
+    modified = models.DateTimeField()
+
+
+class CareerImportModel(models.Model):
+    """
+    Rows of a file read by manage.py import_careers, saved in the
+    transaction that inserts them, so an interrupted import resumes after
+    the last committed batch.
+    """
+
+    path = models.TextField(unique=True)
+    position = models.PositiveBigIntegerField(default=0)
+    modified = models.DateTimeField(auto_now=True)
@@ -0,0 +1,141 @@
+import base64
+import binascii
+import json
+from typing import Optional
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+from app.models import CareerModel
+
+
+# Every allowed ordering is backed by an index and ends on the primary key,
+# so keyset pages never need an unindexed sort.
+CAREER_ORDERINGS = {
+    "created_datetime": ("created_datetime", "id"),
+    "-created_datetime": ("-created_datetime", "-id"),
+}
+DEFAULT_CAREER_ORDERING = "created_datetime"
+CAREER_ORDERING = CAREER_ORDERINGS[DEFAULT_CAREER_ORDERING]
+
+# Search results are ordered by relevance, which every page has to compute
+# for all matches anyway, so their cursors hold an offset.
+RANK_ORDERING = "rank"
+
+
+class Cursor:
+    """
+    Position of the last (or first, when reverse) row of a page in a
+    keyset ordering.
+    """
+
+    def __init__(
+        self,
+        position: tuple,
+        reverse: bool = False,
+        ordering: str = DEFAULT_CAREER_ORDERING,
+    ):
+        self.position = position
+        self.reverse = reverse
+        self.ordering = ordering
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    payload = {
+        "p": [
+            value.isoformat() if hasattr(value, "isoformat") else value
+            for value in cursor.position
+        ],
+        "r": int(cursor.reverse),
+        "o": cursor.ordering,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """
+    Raises ValueError when the token is not a cursor of an allowed ordering.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = json.loads(raw)
+        values = payload["p"]
+        reverse = bool(payload.get("r", 0))
+        ordering_name = payload.get("o", DEFAULT_CAREER_ORDERING)
+        if ordering_name == RANK_ORDERING:
+            return decode_offset_cursor(values, reverse)
+        ordering = CAREER_ORDERINGS[ordering_name]
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise ValueError(f"Malformed cursor: {e}")
+
+    if not isinstance(values, list) or len(values) != len(ordering):
+        raise ValueError("Cursor does not match the ordering")
+
+    position = []
+    for field_name, value in zip(ordering, values):
+        field = CareerModel._meta.get_field(field_name.lstrip("-"))
+        try:
+            converted = field.to_python(value)
+        except ValidationError as e:
+            raise ValueError(f"Malformed cursor value: {e}")
+        if converted is None:
+            raise ValueError("Cursor values can not be null")
+        position.append(converted)
+
+    return Cursor(tuple(position), reverse, ordering_name)
+
+
+def decode_offset_cursor(values, reverse: bool) -> Cursor:
+    if (
+        not isinstance(values, list)
+        or len(values) != 1
+        or type(values[0]) is not int
+        or values[0] < 0
+    ):
+        raise ValueError("Malformed offset cursor")
+
+    return Cursor((values[0],), reverse, RANK_ORDERING)
+
+
+def order_by_fields(ordering: tuple, reverse: bool = False) -> list[str]:
+    if not reverse:
+        return list(ordering)
+
+    return [
+        field[1:] if field.startswith("-") else f"-{field}"
+        for field in ordering
+    ]
+
+
+def keyset_filter(ordering: tuple, cursor: Optional[Cursor]) -> Q:
+    """
+    Rows strictly after the cursor position in the ordering, or strictly
+    before it when the cursor is reversed. The expanded OR of the position
+    is ANDed with a bound on the first field alone, which the database can
+    seek the ordering's index to, instead of filtering every row before it.
+    """
+    if cursor is None:
+        return Q()
+
+    condition = Q()
+    for index, field in enumerate(ordering):
+        name = field.lstrip("-")
+        lookup = "lt" if is_descending(field, cursor) else "gt"
+
+        equal = {
+            previous.lstrip("-"): value
+            for previous, value in zip(ordering[:index], cursor.position)
+        }
+        condition |= Q(
+            **equal, **{f"{name}__{lookup}": cursor.position[index]}
+        )
+
+    first = ordering[0]
+    lookup = "lte" if is_descending(first, cursor) else "gte"
+    bound = Q(**{f"{first.lstrip('-')}__{lookup}": cursor.position[0]})
+    return bound & condition
+
+
+def is_descending(field: str, cursor: Cursor) -> bool:
+    return field.startswith("-") != cursor.reverse
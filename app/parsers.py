@@ -0,0 +1,39 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from app.renderers import cbor2, msgpack
+
+
+class CareerMessagePackParser(BaseParser):
+    """
+    MessagePack request bodies. Timestamp extension values are decoded as
+    datetimes.
+    """
+
+    media_type = "application/msgpack"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), timestamp=3)
+        except Exception as e:
+            raise ParseError(f"MessagePack parse error - {e}")
+
+
+class CareerCBORParser(BaseParser):
+    media_type = "application/cbor"
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return cbor2.loads(stream.read())
+        except Exception as e:
+            raise ParseError(f"CBOR parse error - {e}")
+
+
+BINARY_PARSER_CLASSES = [
+    parser
+    for parser, module in (
+        (CareerMessagePackParser, msgpack),
+        (CareerCBORParser, cbor2),
+    )
+    if module is not None
+]
@@ -0,0 +1,126 @@
+import json
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from app.metrics import timed
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover
+    cbor2 = None
+
+
+ORJSON_OPTIONS = (
+    orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS if orjson else 0
+)
+
+
+def dumps(data) -> bytes:
+    """
+    Compact UTF-8 JSON, encoded by orjson when it is installed. Types orjson
+    does not handle the way DRF does fall back to DRF's JSONEncoder.
+    """
+    encoded = None
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(
+                data, default=JSONEncoder().default, option=ORJSON_OPTIONS
+            )
+        except orjson.JSONEncodeError:
+            pass
+
+    if encoded is None:
+        encoded = json.dumps(
+            data, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":")
+        ).encode()
+
+    # Like DRF, escape the separators JavaScript does not allow in strings.
+    return encoded.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+        b"\xe2\x80\xa9", b"\\u2029"
+    )
+
+
+class CareerJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson for compact output. Indented output
+    (e.g. "application/json; indent=4") is left to the stock renderer.
+    """
+
+    @timed("serialization")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        return dumps(data)
+
+
+class CareerMessagePackRenderer(BaseRenderer):
+    """
+    MessagePack, with datetimes as timestamp extension values. Types
+    MessagePack has no value for are converted like DRF's JSONEncoder does.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    native_datetimes = True
+
+    @timed("serialization")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        return msgpack.packb(
+            data, datetime=True, default=JSONEncoder().default
+        )
+
+
+class CareerCBORRenderer(BaseRenderer):
+    """
+    CBOR, with datetimes as standard date/time strings (tag 0).
+    """
+
+    media_type = "application/cbor"
+    format = "cbor"
+    charset = None
+    render_style = "binary"
+    native_datetimes = True
+
+    @timed("serialization")
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        return cbor2.dumps(data, default=encode_cbor_default)
+
+
+def encode_cbor_default(encoder, value):
+    encoder.encode(JSONEncoder().default(value))
+
+
+# Renderers of the careers views, JSON first so it stays the default.
+BINARY_RENDERER_CLASSES = [
+    renderer
+    for renderer, module in (
+        (CareerMessagePackRenderer, msgpack),
+        (CareerCBORRenderer, cbor2),
+    )
+    if module is not None
+]
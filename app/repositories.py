@@ -1,35 +1,422 @@
+from datetime import datetime, timezone as dt_timezone
+from itertools import chain
 import logging
-from typing import Optional
+from typing import Iterator, Optional, Union
 
-from app.models import CareerModel
-from app.domain import Career
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import connection, connections, router
+from django.db.models import Max, Q, Sum
+from django.utils import timezone
 
+from app.cache import CareerCache, query_key_parts
+from app.log import SampledLogger
+from app.models import CareerImportModel, CareerModel, CareerRevisionModel
+from app.routers import use_primary
+from app.domain import (
+    Career,
+    CareerOutcome,
+    CareerPage,
+    CareerQuery,
+    Precondition,
+)
+from app.pagination import (
+    CAREER_ORDERING,
+    CAREER_ORDERINGS,
+    RANK_ORDERING,
+    Cursor,
+    keyset_filter,
+    order_by_fields,
+)
 
-logger = logging.getLogger(__name__)
+
+logger = SampledLogger(logging.getLogger(__name__))
+
+CAREER_COLUMNS = ("id", "username", "created_datetime", "title", "content")
+
+
+def from_db_datetime(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Raw cursors skip the ORM converters, and SQLite returns naive UTC.
+    """
+    if value is not None and settings.USE_TZ and timezone.is_naive(value):
+        return timezone.make_aware(value, dt_timezone.utc)
+    return value
+
+
+def career_from_db_row(row: tuple) -> Career:
+    id, username, created_datetime, title, content = row
+    return Career(
+        title, content, username, id, from_db_datetime(created_datetime)
+    )
+
+
+def career_from_values(columns: tuple[str, ...], row: tuple) -> Career:
+    """
+    A Career from a row of some of the CAREER_COLUMNS, the others are None.
+    """
+    values = dict(zip(columns, row))
+    if "created_datetime" in values:
+        values["created_datetime"] = from_db_datetime(
+            values["created_datetime"]
+        )
+    return Career(
+        values.pop("title", None), values.pop("content", None), **values
+    )
+
+
+def query_columns(query: CareerQuery) -> tuple[str, ...]:
+    """
+    The requested fields and the fields page cursors are made of, so the
+    other columns, e.g. the unbounded content, are never read.
+    """
+    if query.fields is None:
+        return CAREER_COLUMNS
+
+    needed = set(query.fields)
+    if not query.q:
+        needed.update(
+            field.lstrip("-") for field in CAREER_ORDERINGS[query.ordering]
+        )
+    return tuple(column for column in CAREER_COLUMNS if column in needed)
+
+
+SEARCH_SQL = {
+    "postgresql": (
+        "SELECT {columns} FROM app_careermodel, "
+        "websearch_to_tsquery('english', %s) AS search_query "
+        "WHERE app_careermodel.search_vector @@ search_query{filters} "
+        "ORDER BY ts_rank(app_careermodel.search_vector, search_query) DESC, "
+        "app_careermodel.id "
+        "LIMIT %s OFFSET %s"
+    ),
+    "sqlite": (
+        "SELECT {columns} FROM app_careermodel_fts "
+        "JOIN app_careermodel "
+        "ON app_careermodel.id = app_careermodel_fts.rowid "
+        "WHERE app_careermodel_fts MATCH %s{filters} "
+        "ORDER BY bm25(app_careermodel_fts, 2.0, 1.0), app_careermodel.id "
+        "LIMIT %s OFFSET %s"
+    ),
+}
+
+
+def fts5_query(text: str) -> str:
+    """
+    Every word as a quoted FTS5 string, so user input is never parsed as
+    FTS5 query syntax. Words are implicitly AND-ed.
+    """
+    return " ".join(
+        '"' + word.replace('"', '""') + '"' for word in text.split()
+    )
 
 
 class CareerRepository:
+    cache = CareerCache()
+
+    def list_careers(self, query: CareerQuery) -> Optional[CareerPage]:
+        return self.cache.get_or_load(
+            "list", query_key_parts(query), lambda: self.__list_careers(query)
+        )
+
+    def __list_careers(self, query: CareerQuery) -> Optional[CareerPage]:
+        try:
+            rows = list(self.__page_query_set(query))
+
+        except Exception as e:
+            logger.error("Failed to retreive Careers from database. %s", e)
+            return None
+
+        return self.__career_page(rows, query)
+
+    async def alist_careers(self, query: CareerQuery) -> Optional[CareerPage]:
+        return await self.cache.aget_or_load(
+            "list", query_key_parts(query), lambda: self.__alist_careers(query)
+        )
+
+    async def __alist_careers(
+        self, query: CareerQuery
+    ) -> Optional[CareerPage]:
+        try:
+            rows = [row async for row in self.__page_query_set(query)]
+
+        except Exception as e:
+            logger.error("Failed to retreive Careers from database. %s", e)
+            return None
+
+        return self.__career_page(rows, query)
+
+    def __page_query_set(self, query: CareerQuery):
+        """
+        One row more than the page size, to tell whether there is a next page.
+        """
+        page_size = query.page_size or settings.CAREERS_PAGE_SIZE
+        ordering = CAREER_ORDERINGS[query.ordering]
+        cursor = query.cursor
+        reverse = cursor is not None and cursor.reverse
+
+        return (
+            CareerModel.objects.all()
+            .filter(self.__filters(query))
+            .filter(keyset_filter(ordering, cursor))
+            .order_by(*order_by_fields(ordering, reverse))
+            .values_list(*query_columns(query))
+        )[: page_size + 1]
+
+    def __career_page(
+        self, rows: list[tuple], query: CareerQuery
+    ) -> CareerPage:
+        page_size = query.page_size or settings.CAREERS_PAGE_SIZE
+        has_more = len(rows) > page_size
+        columns = query_columns(query)
+        if columns == CAREER_COLUMNS:
+            careers = list(map(Career.from_row, rows[:page_size]))
+        else:
+            careers = [
+                career_from_values(columns, row) for row in rows[:page_size]
+            ]
+        if query.cursor is not None and query.cursor.reverse:
+            careers.reverse()
+
+        return CareerPage(
+            careers, *self.__page_cursors(careers, query, has_more)
+        )
+
+    def search_careers(self, query: CareerQuery) -> Optional[CareerPage]:
+        """
+        Full-text search over title and content, best matches first: a
+        weighted tsvector with a GIN index on Postgres, FTS5 on SQLite.
+        """
+        return self.cache.get_or_load(
+            "search",
+            query_key_parts(query),
+            lambda: self.__search_careers(query),
+        )
+
+    async def asearch_careers(
+        self, query: CareerQuery
+    ) -> Optional[CareerPage]:
+        """
+        There is no async raw cursor, so the search query runs in the
+        thread the async ORM uses as well.
+        """
+        return await self.cache.aget_or_load(
+            "search",
+            query_key_parts(query),
+            lambda: sync_to_async(self.__search_careers)(query),
+        )
+
+    def __search_careers(self, query: CareerQuery) -> Optional[CareerPage]:
+        page_size = query.page_size or settings.CAREERS_PAGE_SIZE
+        offset = query.cursor.position[0] if query.cursor else 0
 
-    def list_careers(self) -> Optional[list[Career]]:
+        # Raw queries are not routed, so the read alias is picked here.
+        db = connections[router.db_for_read(CareerModel)]
+
+        search = query.q
+        if db.vendor == "sqlite":
+            search = fts5_query(search)
+
+        filters, params = "", [search]
+        if query.username is not None:
+            filters += " AND app_careermodel.username = %s"
+            params.append(query.username)
+        if query.created_after is not None:
+            filters += " AND app_careermodel.created_datetime >= %s"
+            params.append(
+                db.ops.adapt_datetimefield_value(query.created_after)
+            )
+        if query.created_before is not None:
+            filters += " AND app_careermodel.created_datetime < %s"
+            params.append(
+                db.ops.adapt_datetimefield_value(query.created_before)
+            )
+        params += [page_size + 1, offset]
+
+        columns = query_columns(query)
         try:
-            query_set = CareerModel.objects.all()
+            sql = SEARCH_SQL[db.vendor].format(
+                columns=", ".join(
+                    f"app_careermodel.{column}" for column in columns
+                ),
+                filters=filters,
+            )
+            with db.cursor() as cursor:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
 
         except Exception as e:
-            logger.error("Failed to retreive Careers from database", str(e))
+            logger.error("Failed to search Careers in database. %s", e)
             return None
 
         careers = [
-            Career(
-                id=career_model.id,
-                created_datetime=career_model.created_datetime,
-                username=career_model.username,
-                title=career_model.title,
-                content=career_model.content,
+            career_from_values(columns, row) for row in rows[:page_size]
+        ]
+
+        next_cursor = previous_cursor = None
+        if len(rows) > page_size:
+            next_cursor = Cursor((offset + page_size,), ordering=RANK_ORDERING)
+        if offset > 0:
+            previous_cursor = Cursor(
+                (max(offset - page_size, 0),), ordering=RANK_ORDERING
             )
-            for career_model in query_set
+
+        return CareerPage(careers, next_cursor, previous_cursor)
+
+    @staticmethod
+    def __filters(query: CareerQuery) -> Q:
+        filters = Q()
+
+        if query.username is not None:
+            filters &= Q(username=query.username)
+        if query.created_after is not None:
+            filters &= Q(created_datetime__gte=query.created_after)
+        if query.created_before is not None:
+            filters &= Q(created_datetime__lt=query.created_before)
+
+        return filters
+
+    @staticmethod
+    def __page_cursors(
+        careers: list[Career], query: CareerQuery, has_more: bool
+    ) -> tuple[Optional[Cursor], Optional[Cursor]]:
+        if not careers:
+            return None, None
+
+        cursor = query.cursor
+        fields = [
+            field.lstrip("-") for field in CAREER_ORDERINGS[query.ordering]
         ]
 
-        return careers
+        def position(career: Career) -> tuple:
+            return tuple(getattr(career, field) for field in fields)
+
+        if cursor is not None and cursor.reverse:
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, cursor is not None
+
+        next_cursor = (
+            Cursor(position(careers[-1]), ordering=query.ordering)
+            if has_next
+            else None
+        )
+        previous_cursor = (
+            Cursor(position(careers[0]), reverse=True, ordering=query.ordering)
+            if has_previous
+            else None
+        )
+
+        return next_cursor, previous_cursor
+
+    def revision(self) -> Optional[tuple[int, datetime]]:
+        """
+        The version of the careers table, which changes with every committed
+        write, and the time of the last write. The change counters
+        (CareerRevisionModel) are replicated with the rows, so they are read
+        from the database the request reads the rows from.
+        """
+        try:
+            revision = CareerRevisionModel.objects.aggregate(
+                version=Sum("version"), modified=Max("modified")
+            )
+
+        except Exception as e:
+            logger.error("Failed to read the Careers revision. %s", e)
+            return None
+
+        return revision["version"] or 0, revision["modified"]
+
+    async def arevision(self) -> Optional[tuple[int, datetime]]:
+        try:
+            revision = await CareerRevisionModel.objects.aaggregate(
+                version=Sum("version"), modified=Max("modified")
+            )
+
+        except Exception as e:
+            logger.error("Failed to read the Careers revision. %s", e)
+            return None
+
+        return revision["version"] or 0, revision["modified"]
+
+    def import_position(self, path: str) -> Optional[int]:
+        """
+        The rows of the file at path read by the committed batches of
+        manage.py import_careers.
+        """
+        try:
+            with use_primary():
+                position = (
+                    CareerImportModel.objects.filter(path=path)
+                    .values_list("position", flat=True)
+                    .first()
+                )
+
+        except Exception as e:
+            logger.error(
+                "Failed to read the import position of %s. %s", path, e
+            )
+            return None
+
+        return position or 0
+
+    def save_import_position(self, path: str, position: int) -> Optional[int]:
+        """
+        Saves the position in the current transaction, so it is committed
+        with the batch it counts.
+        """
+        try:
+            CareerImportModel.objects.update_or_create(
+                path=path, defaults={"position": position}
+            )
+
+        except Exception as e:
+            logger.error(
+                "Failed to save the import position of %s. %s", path, e
+            )
+            return None
+
+        return position
+
+    def iter_careers(
+        self,
+        chunk_size: int,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Optional[Iterator[Career]]:
+        """
+        Streams every Career, or those created from since to before until,
+        through a server-side cursor. The first chunk is fetched eagerly so
+        database errors are reported before streaming.
+        """
+        filters = Q()
+        if since is not None:
+            filters &= Q(created_datetime__gte=since)
+        if until is not None:
+            filters &= Q(created_datetime__lt=until)
+
+        try:
+            rows = (
+                CareerModel.objects.all()
+                .filter(filters)
+                .order_by(*CAREER_ORDERING)
+                .values_list(*CAREER_COLUMNS)
+                .iterator(chunk_size=chunk_size)
+            )
+            first_row = next(rows, None)
+
+        except Exception as e:
+            logger.error("Failed to stream Careers from database. %s", e)
+            return None
+
+        return self.__stream_careers(first_row, rows)
+
+    @staticmethod
+    def __stream_careers(first_row, rows) -> Iterator[Career]:
+        if first_row is None:
+            return
+
+        yield from map(Career.from_row, chain((first_row,), rows))
 
     def save_career(self, career: Career) -> Optional[Career]:
         career_model = CareerModel(
@@ -43,66 +430,402 @@ class CareerRepository:
 
         except Exception as e:
             logger.error(
-                f"Failed to create a Career in the database. {str(career)}. {str(e)}"
+                "Failed to create a Career in the database. %s. %s", career, e
             )
             return None
 
+        self.cache.invalidate()
         return career
 
-    def update_career(self, career: Career) -> Optional[Career]:
+    async def asave_career(self, career: Career) -> Optional[Career]:
         try:
-            found_career = CareerModel.objects.filter(id=career.id)
+            await CareerModel.objects.acreate(
+                username=career.username,
+                title=career.title,
+                content=career.content,
+            )
+
         except Exception as e:
             logger.error(
-                f"An exception happened while trying to find the career with id: {career.id}. Exception: {str(e)}"
+                "Failed to create a Career in the database. %s. %s", career, e
             )
             return None
 
-        if not found_career:
-            logger.error(f"Could not find any career with id: {career.id}")
-            return Career.create_empty_career()
+        await self.cache.ainvalidate()
+        return career
+
+    def save_careers(
+        self, careers: list[Career], batch_size: int
+    ) -> Optional[list[Career]]:
+        career_models = [
+            CareerModel(
+                username=career.username,
+                title=career.title,
+                content=career.content,
+            )
+            for career in careers
+        ]
 
         try:
-            found_career.update(title=career.title, content=career.content)
+            CareerModel.objects.bulk_create(
+                career_models, batch_size=batch_size
+            )
+
         except Exception as e:
             logger.error(
-                f"An exception happened while trying to update the career with id: {career.id}. Exception: {str(e)}"
+                "Failed to create %s Careers in the database. %s",
+                len(careers),
+                e,
             )
             return None
 
-        return career
+        self.cache.invalidate()
+        return [
+            Career(
+                id=career_model.id,
+                created_datetime=career_model.created_datetime,
+                username=career_model.username,
+                title=career_model.title,
+                content=career_model.content,
+            )
+            for career_model in career_models
+        ]
+
+    def copy_careers(self, careers: list[Career]) -> Optional[int]:
+        """
+        Inserts the Careers without model instances or returned ids: with
+        COPY FROM STDIN on Postgres and one executemany elsewhere. Returns
+        the number of inserted rows.
+        """
+        db = connections[router.db_for_write(CareerModel)]
+        quote = db.ops.quote_name
+        table = quote(CareerModel._meta.db_table)
+        columns = ", ".join(
+            quote(column)
+            for column in ("username", "created_datetime", "title", "content")
+        )
+        created_datetime = db.ops.adapt_datetimefield_value(timezone.now())
+        rows = [
+            (career.username, created_datetime, career.title, career.content)
+            for career in careers
+        ]
+
+        try:
+            with db.cursor() as cursor:
+                if db.vendor == "postgresql":
+                    with cursor.copy(
+                        f"COPY {table} ({columns}) FROM STDIN"
+                    ) as copy:
+                        for row in rows:
+                            copy.write_row(row)
+                else:
+                    cursor.executemany(
+                        f"INSERT INTO {table} ({columns}) "
+                        "VALUES (%s, %s, %s, %s)",
+                        rows,
+                    )
+
+        except Exception as e:
+            logger.error(
+                "Failed to copy %s Careers into the database. %s",
+                len(careers),
+                e,
+            )
+            return None
+
+        self.cache.invalidate()
+        return len(rows)
+
+    def update_careers(self, careers: list[Career]) -> Optional[set[int]]:
+        """
+        Updates every existing Career in a single UPDATE ... RETURNING
+        statement and returns the ids it found.
+        """
+        ids = [career.id for career in careers]
+        if not ids:
+            return set()
+
+        quote = connection.ops.quote_name
+        cases = " ".join(["WHEN %s THEN %s"] * len(careers))
+        sql = (
+            f"UPDATE {quote(CareerModel._meta.db_table)} "
+            f"SET {quote('title')} = CASE {quote('id')} {cases} END, "
+            f"{quote('content')} = CASE {quote('id')} {cases} END "
+            f"WHERE {quote('id')} IN ({', '.join(['%s'] * len(ids))}) "
+            f"RETURNING {quote('id')}"
+        )
+        params = [
+            *chain.from_iterable((c.id, c.title) for c in careers),
+            *chain.from_iterable((c.id, c.content) for c in careers),
+            *ids,
+        ]
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                found_ids = {id for (id,) in cursor.fetchall()}
+
+        except Exception as e:
+            logger.error(
+                "An exception happened while trying to update the careers with ids: %s. Exception: %s",
+                ids,
+                e,
+            )
+            return None
+
+        if found_ids:
+            self.cache.invalidate()
+        return found_ids
+
+    def delete_careers(self, ids: list[int]) -> Optional[set[int]]:
+        """
+        Deletes every existing Career in a single DELETE ... RETURNING
+        statement and returns the ids it found.
+        """
+        if not ids:
+            return set()
+
+        quote = connection.ops.quote_name
+        sql = (
+            f"DELETE FROM {quote(CareerModel._meta.db_table)} "
+            f"WHERE {quote('id')} IN ({', '.join(['%s'] * len(ids))}) "
+            f"RETURNING {quote('id')}"
+        )
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(sql, ids)
+                found_ids = {id for (id,) in cursor.fetchall()}
+
+        except Exception as e:
+            logger.error(
+                "An exception happened when trying to delete Careers with ids: %s. Exception: %s",
+                ids,
+                e,
+            )
+            return None
+
+        if found_ids:
+            self.cache.invalidate()
+        return found_ids
+
+    def update_career(
+        self, career: Career, precondition: Optional[Precondition] = None
+    ) -> Union[Career, CareerOutcome, None]:
+        """
+        Updates the Career with a single UPDATE ... RETURNING statement and
+        returns the stored row. With a precondition, the stored row is read
+        first and the UPDATE only matches it while it still has the title
+        and content the precondition passed with, so a write in between
+        fails the precondition instead of being overwritten. A missing row
+        that passes the precondition, e.g. If-None-Match: *, is not found.
+        """
+        quote = connection.ops.quote_name
+        where = f"{quote('id')} = %s"
+        params = [career.title, career.content, career.id]
 
-    def delete_career(self, career: Career) -> Optional[int]:
         try:
-            CareerModel.objects.filter(id=career.id).delete()
+            if precondition is not None:
+                stored_career = self.__stored_career(career.id)
+                if not precondition(stored_career):
+                    return CareerOutcome.PRECONDITION_FAILED
+                if stored_career is None:
+                    logger.error("Could not find any career with id: %s", career.id)
+                    return CareerOutcome.NOT_FOUND
+                where += f" AND {quote('title')} = %s AND {quote('content')} = %s"
+                params += [stored_career.title, stored_career.content]
+
+            sql = (
+                f"UPDATE {quote(CareerModel._meta.db_table)} "
+                f"SET {quote('title')} = %s, {quote('content')} = %s "
+                f"WHERE {where} "
+                f"RETURNING {', '.join(quote(column) for column in CAREER_COLUMNS)}"
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                row = cursor.fetchone()
+
         except Exception as e:
             logger.error(
-                f"An exception happened when trying to delete Career with id: {id}. Exception: {e}"
+                "An exception happened while trying to update the career with id: %s. Exception: %s",
+                career.id,
+                e,
             )
             return None
 
-        logger.info(f"Career delete successfully. Id: {id}")
-        return id
+        if row is None and precondition is not None:
+            logger.info("Career changed before its update. Id: %s", career.id)
+            return CareerOutcome.PRECONDITION_FAILED
+
+        if row is None:
+            logger.error("Could not find any career with id: %s", career.id)
+            return CareerOutcome.NOT_FOUND
+
+        self.cache.invalidate()
+        return career_from_db_row(row)
+
+    async def aupdate_career(
+        self, career: Career, precondition: Optional[Precondition] = None
+    ) -> Union[Career, CareerOutcome, None]:
+        """
+        aupdate() only returns the number of updated rows, so the single
+        UPDATE ... RETURNING statement runs in the async ORM thread instead.
+        """
+        return await sync_to_async(self.update_career)(career, precondition)
+
+    def delete_career(
+        self, id: int, precondition: Optional[Precondition] = None
+    ) -> Union[int, CareerOutcome, None]:
+        """
+        Deletes the Career with a single DELETE statement and returns the
+        number of deleted rows. A precondition is checked like in
+        update_career.
+        """
+        quote = connection.ops.quote_name
+        where = f"{quote('id')} = %s"
+        params = [id]
 
-    def get_career_by_id(self, id: int) -> Optional[Career]:
         try:
-            found_career = CareerModel.objects.filter(id=id).first()
+            if precondition is not None:
+                stored_career = self.__stored_career(id)
+                if not precondition(stored_career):
+                    return CareerOutcome.PRECONDITION_FAILED
+                if stored_career is None:
+                    logger.error("Could not find any career with id: %s", id)
+                    return CareerOutcome.NOT_FOUND
+                where += f" AND {quote('title')} = %s AND {quote('content')} = %s"
+                params += [stored_career.title, stored_career.content]
+
+            sql = f"DELETE FROM {quote(CareerModel._meta.db_table)} WHERE {where}"
+            with connection.cursor() as cursor:
+                cursor.execute(sql, params)
+                deleted = cursor.rowcount
 
         except Exception as e:
             logger.error(
-                f"An exception happened while trying to find the career with id: {id}. Exception: {str(e)}"
+                "An exception happened when trying to delete Career with id: %s. Exception: %s",
+                id,
+                e,
             )
             return None
 
-        if not found_career:
-            logger.error(f"Could not find any career with id: {id}")
-            return Career.create_empty_career()
+        if deleted:
+            self.cache.invalidate()
+            logger.info("Career delete successfully. Id: %s", id)
+        elif precondition is not None:
+            logger.info("Career changed before its delete. Id: %s", id)
+            return CareerOutcome.PRECONDITION_FAILED
+        else:
+            logger.error("Could not find any career with id: %s", id)
+            return CareerOutcome.NOT_FOUND
+
+        return deleted
+
+    def __stored_career(self, id: int) -> Optional[Career]:
+        """
+        The Career as stored on the primary, bypassing the cache and the
+        replicas, which may both be behind.
+        """
+        with use_primary():
+            row = self.__career_row(id)
 
-        logger.info(f"Found Career with id: {id}")
-        return Career(
-            id=found_career.id,
-            created_datetime=found_career.created_datetime,
-            username=found_career.username,
-            title=found_career.title,
-            content=found_career.content,
+        return career_from_db_row(row) if row is not None else None
+
+    def get_career_by_id(self, id: int) -> Union[Career, CareerOutcome, None]:
+        return self.cache.get_or_load(
+            "career", (id,), lambda: self.__get_career_by_id(id)
         )
+
+    def __get_career_by_id(
+        self, id: int
+    ) -> Union[Career, CareerOutcome, None]:
+        try:
+            row = self.__career_row(id)
+
+        except Exception as e:
+            logger.error(
+                "An exception happened while trying to find the career with id: %s. Exception: %s",
+                id,
+                e,
+            )
+            return None
+
+        if row is None:
+            logger.error("Could not find any career with id: %s", id)
+            return CareerOutcome.NOT_FOUND
+
+        logger.info("Found Career with id: %s", id)
+        return career_from_db_row(row)
+
+    @staticmethod
+    def __career_row(id: int) -> Optional[tuple]:
+        """
+        A fixed statement instead of an ORM query, so it is not compiled on
+        every call and, with DJANGO_DATABASE_SERVER_SIDE_BINDING, psycopg
+        prepares it on the connections that run it often.
+        """
+        db = connections[router.db_for_read(CareerModel)]
+        quote = db.ops.quote_name
+        sql = (
+            f"SELECT {', '.join(quote(column) for column in CAREER_COLUMNS)} "
+            f"FROM {quote(CareerModel._meta.db_table)} "
+            f"WHERE {quote('id')} = %s"
+        )
+
+        with db.cursor() as cursor:
+            cursor.execute(sql, [id])
+            return cursor.fetchone()
+
+    async def adelete_career(
+        self, id: int, precondition: Optional[Precondition] = None
+    ) -> Union[int, CareerOutcome, None]:
+        if precondition is not None:
+            return await sync_to_async(self.delete_career)(id, precondition)
+
+        try:
+            deleted, _ = await CareerModel.objects.filter(id=id).adelete()
+
+        except Exception as e:
+            logger.error(
+                "An exception happened when trying to delete Career with id: %s. Exception: %s",
+                id,
+                e,
+            )
+            return None
+
+        if deleted:
+            await self.cache.ainvalidate()
+            logger.info("Career delete successfully. Id: %s", id)
+        else:
+            logger.error("Could not find any career with id: %s", id)
+            return CareerOutcome.NOT_FOUND
+
+        return deleted
+
+    async def aget_career_by_id(
+        self, id: int
+    ) -> Union[Career, CareerOutcome, None]:
+        return await self.cache.aget_or_load(
+            "career", (id,), lambda: self.__aget_career_by_id(id)
+        )
+
+    async def __aget_career_by_id(
+        self, id: int
+    ) -> Union[Career, CareerOutcome, None]:
+        try:
+            row = await sync_to_async(self.__career_row)(id)
+
+        except Exception as e:
+            logger.error(
+                "An exception happened while trying to find the career with id: %s. Exception: %s",
+                id,
+                e,
+            )
+            return None
+
+        if row is None:
+            logger.error("Could not find any career with id: %s", id)
+            return CareerOutcome.NOT_FOUND
+
+        logger.info("Found Career with id: %s", id)
+        return career_from_db_row(row)
@@ -1,15 +1,28 @@
+from functools import cached_property, lru_cache
+from itertools import islice
+from typing import AsyncIterator, Iterator, Optional
+
+from asgiref.sync import sync_to_async
 from rest_framework import status
+from rest_framework.utils.urls import replace_query_param
 
 from app.results import (
+    BatchCareersResult,
+    BulkCreateCareersResult,
     CreateCareerResult,
+    ExportCareersResult,
     ListCareersResult,
+    RetrieveCareerResult,
     UpdateCareerResult,
     DeleteCareerResult,
 )
+from app.encoders import CareerEncoder
+from app.metrics import timed
+from app.pagination import Cursor, encode_cursor
+from app.renderers import dumps
 from app.serializers import (
     ListCareerSerializer,
     CreateCareerSerializer,
-    UpdateCareerSerializer,
     DeleteCareerSerializer,
 )
 
@@ -18,10 +31,20 @@ INTERNAL_SERVER_ERROR_DATA = {
     "error_essage": "Please, contact the server maintainers."
 }
 NOT_FOUND_DATA = {"error_message": "Career not found"}
+PRECONDITION_FAILED_DATA = {
+    "error_message": "Career does not match the request's preconditions"
+}
+
+
+@lru_cache
+def career_encoder(
+    fields: tuple[str, ...], native_datetimes: bool = False
+) -> CareerEncoder:
+    return CareerEncoder(fields, native_datetimes)
 
 
 class CreateCareerResponse:
-    __serializer_class = CreateCareerSerializer
+    encoder = CareerEncoder(CreateCareerSerializer.Meta.fields)
 
     def __init__(self, result: CreateCareerResult):
         self.__result = result
@@ -33,10 +56,11 @@ class CreateCareerResponse:
 
         return False
 
-    @property
+    @cached_property
+    @timed("serialization")
     def data(self):
         if self.is_success:
-            return self.__serializer_class(self.__result.career).data
+            return self.encoder(self.__result.career)
         return INTERNAL_SERVER_ERROR_DATA
 
     @property
@@ -46,21 +70,145 @@ class CreateCareerResponse:
         return status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
-class ListCareersResponse:
-    serializer_class = ListCareerSerializer
+class BulkCreateCareersResponse:
+    item_statuses = {
+        "success": status.HTTP_201_CREATED,
+        "invalid": status.HTTP_400_BAD_REQUEST,
+        "failure": status.HTTP_500_INTERNAL_SERVER_ERROR,
+    }
 
-    def __init__(self, result: ListCareersResult):
+    def __init__(self, result: BulkCreateCareersResult):
         self.__result = result
 
     @property
+    def is_success(self) -> bool:
+        if self.__result.name == "success":
+            return True
+
+        return False
+
+    @property
+    def created_count(self) -> int:
+        return sum(item.name == "success" for item in self.__result.items)
+
+    @property
+    def status(self):
+        if not self.is_success:
+            return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+        if self.created_count == len(self.__result.items):
+            return status.HTTP_201_CREATED
+
+        return status.HTTP_207_MULTI_STATUS
+
+    @cached_property
+    @timed("serialization")
     def data(self):
+        if not self.is_success:
+            return INTERNAL_SERVER_ERROR_DATA
+
+        created = self.created_count
+        return {
+            "created": created,
+            "failed": len(self.__result.items) - created,
+            "results": [self.__item(item) for item in self.__result.items],
+        }
+
+    def __item(self, item) -> dict:
+        data = {"index": item.index, "status": self.item_statuses[item.name]}
+
+        if item.name == "success":
+            data["id"] = item.career.id
+        elif item.name == "invalid":
+            data["errors"] = item.errors
+        else:
+            data["errors"] = INTERNAL_SERVER_ERROR_DATA
+
+        return data
+
+
+class BatchCareersResponse:
+    item_statuses = {
+        "created": status.HTTP_201_CREATED,
+        "updated": status.HTTP_200_OK,
+        "deleted": status.HTTP_204_NO_CONTENT,
+        "not_found": status.HTTP_404_NOT_FOUND,
+    }
+
+    def __init__(self, result: BatchCareersResult):
+        self.__result = result
+
+    @property
+    def is_success(self) -> bool:
+        if self.__result.name == "success":
+            return True
+
+        return False
+
+    @property
+    def status(self):
         if self.is_success:
-            serializer = self.serializer_class(
-                self.__result.career_list, many=True
+            return status.HTTP_200_OK
+        return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    @cached_property
+    @timed("serialization")
+    def data(self):
+        if not self.is_success:
+            return INTERNAL_SERVER_ERROR_DATA
+
+        return {"results": [self.__item(item) for item in self.__result.items]}
+
+    def __item(self, item) -> dict:
+        data = {"index": item.index, "status": self.item_statuses[item.name]}
+
+        if item.name == "created":
+            data["id"] = item.career.id
+
+        return data
+
+
+class ListCareersResponse:
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+    cursor_query_param = "cursor"
+
+    def __init__(
+        self,
+        result: ListCareersResult,
+        url: str = "",
+        fields: Optional[tuple[str, ...]] = None,
+        native_datetimes: bool = False,
+    ):
+        self.__result = result
+        self.__url = url
+        if fields is not None or native_datetimes:
+            self.encoder = career_encoder(
+                fields or self.encoder.fields, native_datetimes
             )
-            return serializer.data
+
+    @cached_property
+    @timed("serialization")
+    def data(self):
+        if self.is_success:
+            return {
+                "next": self.__link(self.__result.career_page.next_cursor),
+                "previous": self.__link(
+                    self.__result.career_page.previous_cursor
+                ),
+                "results": self.encoder.many(
+                    self.__result.career_page.careers
+                ),
+            }
         return INTERNAL_SERVER_ERROR_DATA
 
+    def __link(self, cursor: Optional[Cursor]) -> Optional[str]:
+        if cursor is None:
+            return None
+
+        return replace_query_param(
+            self.__url, self.cursor_query_param, encode_cursor(cursor)
+        )
+
     @property
     def status(self):
         if self.__result.name == "success":
@@ -75,11 +223,94 @@ class ListCareersResponse:
         return False
 
 
-class UpdateCareerResponse:
-    serializer_class = UpdateCareerSerializer
+class ExportCareersResponse:
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+    content_types = {
+        "ndjson": "application/x-ndjson",
+        "json": "application/json",
+    }
+    rows_per_write = 100
+
+    def __init__(self, result: ExportCareersResult, output: str = "ndjson"):
+        self.__result = result
+        self.__output = output
+
+    @property
+    def is_success(self) -> bool:
+        if self.__result.name == "success":
+            return True
+
+        return False
+
+    @property
+    def status(self):
+        if self.is_success:
+            return status.HTTP_200_OK
+        return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    @property
+    def data(self):
+        return INTERNAL_SERVER_ERROR_DATA
+
+    @property
+    def content_type(self) -> str:
+        return self.content_types[self.__output]
+
+    @property
+    def stream(self) -> Iterator[bytes]:
+        """
+        Encoded rows, a few at a time, as they come out of the database.
+        """
+        if self.__output == "json":
+            return self.__json_array()
+        return self.__ndjson()
 
-    def __init__(self, result: UpdateCareerResult):
+    @property
+    def astream(self) -> AsyncIterator[bytes]:
+        """
+        The stream for ASGI servers, which would read a sync one into a list
+        before sending it. Each write is still read and encoded in the sync
+        thread of the request, where its database cursor is.
+        """
+        return self.__async_stream(self.stream)
+
+    @staticmethod
+    async def __async_stream(
+        chunks: Iterator[bytes],
+    ) -> AsyncIterator[bytes]:
+        next_chunk = sync_to_async(next, thread_sensitive=True)
+        while (chunk := await next_chunk(chunks, None)) is not None:
+            yield chunk
+
+    def __encoded_batches(self) -> Iterator[list[bytes]]:
+        careers = iter(self.__result.careers)
+        while batch := list(islice(careers, self.rows_per_write)):
+            yield [dumps(item) for item in self.encoder.many(batch)]
+
+    def __ndjson(self) -> Iterator[bytes]:
+        for lines in self.__encoded_batches():
+            yield b"\n".join(lines) + b"\n"
+
+    def __json_array(self) -> Iterator[bytes]:
+        separator = b"["
+        for items in self.__encoded_batches():
+            yield separator + b",".join(items)
+            separator = b","
+
+        yield b"[]" if separator == b"[" else b"]"
+
+
+class RetrieveCareerResponse:
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+
+    def __init__(self, result: RetrieveCareerResult, native_datetimes: bool = False):
         self.__result = result
+        if native_datetimes:
+            self.encoder = career_encoder(self.encoder.fields, True)
+
+    @property
+    def career(self):
+        return self.__result.career
 
     @property
     def is_success(self) -> bool:
@@ -90,11 +321,7 @@ class UpdateCareerResponse:
 
     @property
     def is_not_found(self) -> bool:
-        if (
-            self.__result.name == "failure" and
-            hasattr(self.__result, "career") and
-            not hasattr(self.__result.career, "id")
-        ):
+        if self.__result.name == "not_found":
             return True
 
         return False
@@ -109,14 +336,76 @@ class UpdateCareerResponse:
 
         return status.HTTP_500_INTERNAL_SERVER_ERROR
 
+    @cached_property
+    @timed("serialization")
+    def data(self):
+        if self.is_success:
+            return self.encoder(self.__result.career)
+
+        if self.is_not_found:
+            return NOT_FOUND_DATA
+
+        return INTERNAL_SERVER_ERROR_DATA
+
+
+class UpdateCareerResponse:
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+
+    def __init__(self, result: UpdateCareerResult, native_datetimes: bool = False):
+        self.__result = result
+        if native_datetimes:
+            self.encoder = career_encoder(self.encoder.fields, True)
+
+    @property
+    def career(self):
+        return self.__result.career
+
     @property
+    def is_success(self) -> bool:
+        if self.__result.name == "success":
+            return True
+
+        return False
+
+    @property
+    def is_not_found(self) -> bool:
+        if self.__result.name == "not_found":
+            return True
+
+        return False
+
+    @property
+    def is_precondition_failed(self) -> bool:
+        if self.__result.name == "precondition_failed":
+            return True
+
+        return False
+
+    @property
+    def status(self):
+        if self.is_success:
+            return status.HTTP_200_OK
+
+        if self.is_not_found:
+            return status.HTTP_404_NOT_FOUND
+
+        if self.is_precondition_failed:
+            return status.HTTP_412_PRECONDITION_FAILED
+
+        return status.HTTP_500_INTERNAL_SERVER_ERROR
+
+    @cached_property
+    @timed("serialization")
     def data(self):
         if self.is_success:
-            return self.serializer_class(self.__result.career).data
+            return self.encoder(self.__result.career)
 
         if self.is_not_found:
             return NOT_FOUND_DATA
 
+        if self.is_precondition_failed:
+            return PRECONDITION_FAILED_DATA
+
         return INTERNAL_SERVER_ERROR_DATA
 
 
@@ -135,11 +424,14 @@ class DeleteCareerResponse:
 
     @property
     def is_not_found(self) -> bool:
-        if (
-            self.__result.name == "failure"
-            and hasattr(self.__result, "career")
-            and not hasattr(self.__result.career, "id")
-        ):
+        if self.__result.name == "not_found":
+            return True
+
+        return False
+
+    @property
+    def is_precondition_failed(self) -> bool:
+        if self.__result.name == "precondition_failed":
             return True
 
         return False
@@ -152,6 +444,9 @@ class DeleteCareerResponse:
         if self.is_not_found:
             return status.HTTP_404_NOT_FOUND
 
+        if self.is_precondition_failed:
+            return status.HTTP_412_PRECONDITION_FAILED
+
         return status.HTTP_500_INTERNAL_SERVER_ERROR
 
     @property
@@ -162,4 +457,7 @@ class DeleteCareerResponse:
         if self.is_not_found:
             return NOT_FOUND_DATA
 
+        if self.is_precondition_failed:
+            return PRECONDITION_FAILED_DATA
+
         return INTERNAL_SERVER_ERROR_DATA
@@ -1,9 +1,14 @@
-from typing import Optional
+from typing import Iterator, Optional
 
-from app.domain import Career
+from app.domain import Career, CareerPage
+
+
+# Result names are "success" or "failure", and "not_found" for results of a
+# single Career that does not exist.
 
 
 class CreateCareerResult:
+    __slots__ = ("name", "career")
 
     def __init__(
         self,
@@ -11,24 +16,35 @@ class CreateCareerResult:
         career: Optional[Career] = None,
     ):
         self.name = name
-        if career:
-            self.career = career
+        self.career = career
 
 
 class ListCareersResult:
+    __slots__ = ("name", "career_page")
 
     def __init__(
         self,
         name: str,
-        career_list: Optional[list[Career]] = None,
+        career_page: Optional[CareerPage] = None,
     ):
         self.name = name
+        self.career_page = career_page
 
-        if career_list is not None:
-            self.career_list = career_list
 
+class ExportCareersResult:
+    __slots__ = ("name", "careers")
 
-class UpdateCareerResult:
+    def __init__(
+        self,
+        name: str,
+        careers: Optional[Iterator[Career]] = None,
+    ):
+        self.name = name
+        self.careers = careers
+
+
+class RetrieveCareerResult:
+    __slots__ = ("name", "career")
 
     def __init__(
         self,
@@ -36,19 +52,63 @@ class UpdateCareerResult:
         career: Optional[Career] = None,
     ):
         self.name = name
+        self.career = career
 
-        if career:
-            self.career = career
+
+class UpdateCareerResult:
+    __slots__ = ("name", "career")
+
+    def __init__(
+        self,
+        name: str,
+        career: Optional[Career] = None,
+    ):
+        self.name = name
+        self.career = career
 
 
 class DeleteCareerResult:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class CareerItemResult:
+    __slots__ = ("index", "name", "career", "errors")
 
     def __init__(
         self,
+        index: int,
         name: str,
         career: Optional[Career] = None,
+        errors: Optional[dict] = None,
     ):
+        self.index = index
         self.name = name
+        self.career = career
+        self.errors = errors
+
 
-        if career:
-            self.career = career
+class BulkCreateCareersResult:
+    __slots__ = ("name", "items")
+
+    def __init__(
+        self,
+        name: str,
+        items: Optional[list[CareerItemResult]] = None,
+    ):
+        self.name = name
+        self.items = items
+
+
+class BatchCareersResult:
+    __slots__ = ("name", "items")
+
+    def __init__(
+        self,
+        name: str,
+        items: Optional[list[CareerItemResult]] = None,
+    ):
+        self.name = name
+        self.items = items
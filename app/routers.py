@@ -0,0 +1,56 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+import random
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+_read_alias = ContextVar("careers_read_alias", default=None)
+
+
+@contextmanager
+def use_database(alias: str):
+    """
+    Routes every read in the block to the alias.
+    """
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def use_primary():
+    """
+    Routes every read in the block to the primary.
+    """
+    return use_database(DEFAULT_DB_ALIAS)
+
+
+def read_alias() -> str:
+    if (
+        not settings.CAREERS_READ_REPLICAS
+        # Reads in a transaction have to see its uncommitted writes.
+        or connections[DEFAULT_DB_ALIAS].in_atomic_block
+    ):
+        return DEFAULT_DB_ALIAS
+
+    return _read_alias.get() or random.choice(settings.CAREERS_READ_REPLICAS)
+
+
+class PrimaryReplicaRouter:
+    """
+    Sends writes to the primary and spreads reads over the replicas in
+    settings.CAREERS_READ_REPLICAS, unless reads are pinned to a database.
+    """
+
+    def db_for_read(self, model, **hints):
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary.
+        return True
@@ -1,7 +1,14 @@
+from django.conf import settings
 from django.contrib.auth.models import Group, User
 from rest_framework import serializers
 
 from app.models import CareerModel
+from app.pagination import (
+    CAREER_ORDERINGS,
+    DEFAULT_CAREER_ORDERING,
+    RANK_ORDERING,
+    decode_cursor,
+)
 
 
 class UserSerializer(serializers.HyperlinkedModelSerializer):
@@ -22,6 +29,87 @@ class ListCareerSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "created_datetime", "title", "content"]
 
 
+class ListCareerQuerySerializer(serializers.Serializer):
+    cursor = serializers.CharField(required=False)
+    page_size = serializers.IntegerField(
+        required=False, min_value=1, max_value=settings.CAREERS_MAX_PAGE_SIZE
+    )
+    ordering = serializers.ChoiceField(
+        choices=list(CAREER_ORDERINGS),
+        required=False,
+        default=DEFAULT_CAREER_ORDERING,
+    )
+    username = serializers.CharField(required=False, max_length=30)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+    q = serializers.CharField(required=False, max_length=200)
+
+    def validate_cursor(self, value):
+        try:
+            return decode_cursor(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid cursor.")
+
+    def get_fields(self):
+        # "fields" would shadow Serializer.fields if it was declared above.
+        fields = super().get_fields()
+        fields["fields"] = serializers.CharField(required=False)
+        return fields
+
+    def validate_fields(self, value):
+        """
+        Comma separated Career fields, as a tuple in the order of
+        ListCareerSerializer, so equal field sets share cache entries.
+        """
+        requested = {field.strip() for field in value.split(",")} - {""}
+        unknown = requested - set(ListCareerSerializer.Meta.fields)
+        if unknown:
+            raise serializers.ValidationError(
+                f"Unknown fields: {', '.join(sorted(unknown))}."
+            )
+        if not requested:
+            raise serializers.ValidationError("No fields.")
+
+        return tuple(
+            field
+            for field in ListCareerSerializer.Meta.fields
+            if field in requested
+        )
+
+    def validate(self, attrs):
+        # Search results are always ranked by relevance.
+        ordering = RANK_ORDERING if "q" in attrs else attrs["ordering"]
+
+        cursor = attrs.get("cursor")
+        if cursor is not None and cursor.ordering != ordering:
+            raise serializers.ValidationError(
+                {"cursor": ["Cursor does not match the ordering."]}
+            )
+
+        return attrs
+
+
+class ExportCareerQuerySerializer(serializers.Serializer):
+    output = serializers.ChoiceField(
+        choices=["ndjson", "json"], required=False, default="ndjson"
+    )
+    chunk_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=settings.CAREERS_EXPORT_MAX_CHUNK_SIZE,
+        default=settings.CAREERS_EXPORT_CHUNK_SIZE,
+    )
+
+
+class BulkCreateCareerQuerySerializer(serializers.Serializer):
+    batch_size = serializers.IntegerField(
+        required=False,
+        min_value=1,
+        max_value=settings.CAREERS_BULK_MAX_BATCH_SIZE,
+        default=settings.CAREERS_BULK_BATCH_SIZE,
+    )
+
+
 class CreateCareerSerializer(serializers.ModelSerializer):
     class Meta:
         model = CareerModel
@@ -38,3 +126,37 @@ class DeleteCareerSerializer(serializers.ModelSerializer):
     class Meta:
         model = CareerModel
         fields = []
+
+
+class BatchCareerOperationSerializer(serializers.Serializer):
+    data_serializer_classes = {
+        "create": CreateCareerSerializer,
+        "update": UpdateCareerSerializer,
+    }
+
+    op = serializers.ChoiceField(choices=["create", "update", "delete"])
+    id = serializers.IntegerField(required=False, min_value=1)
+    data = serializers.DictField(required=False)
+
+    def validate(self, attrs):
+        if attrs["op"] != "create" and "id" not in attrs:
+            raise serializers.ValidationError(
+                {"id": ["This field is required."]}
+            )
+
+        serializer_class = self.data_serializer_classes.get(attrs["op"])
+        if serializer_class is not None:
+            serializer = serializer_class(data=attrs.get("data", {}))
+            if not serializer.is_valid():
+                raise serializers.ValidationError({"data": serializer.errors})
+            attrs["data"] = serializer.validated_data
+
+        return attrs
+
+
+class BatchCareersSerializer(serializers.Serializer):
+    operations = BatchCareerOperationSerializer(
+        many=True,
+        allow_empty=False,
+        max_length=settings.CAREERS_BATCH_MAX_OPERATIONS,
+    )
@@ -0,0 +1,45 @@
+from django.db import connections
+
+from app.repositories import CareerRepository
+
+
+def database_pool_stats() -> dict[str, dict]:
+    """
+    Connection pool statistics of this worker process, per database alias
+    with a pool. Counters are totals since the pool was opened.
+    """
+    stats = {}
+
+    for connection in connections.all():
+        pool = getattr(connection, "pool", None)
+        # Pools are opened on the first connection of the process.
+        if pool is None or pool.closed:
+            continue
+
+        pool_stats = pool.get_stats()
+        requests = pool_stats.get("requests_num", 0)
+        wait_ms = pool_stats.get("requests_wait_ms", 0)
+        stats[connection.alias] = {
+            "min_size": pool_stats.get("pool_min", 0),
+            "max_size": pool_stats.get("pool_max", 0),
+            "size": pool_stats.get("pool_size", 0),
+            "available": pool_stats.get("pool_available", 0),
+            "in_use": pool_stats.get("pool_size", 0)
+            - pool_stats.get("pool_available", 0),
+            "waiting": pool_stats.get("requests_waiting", 0),
+            "requests": requests,
+            "requests_queued": pool_stats.get("requests_queued", 0),
+            "requests_errors": pool_stats.get("requests_errors", 0),
+            "wait_ms": wait_ms,
+            "average_wait_ms": wait_ms / requests if requests else 0.0,
+            "connections_lost": pool_stats.get("connections_lost", 0),
+        }
+
+    return stats
+
+
+def service_stats() -> dict:
+    return {
+        "database_pools": database_pool_stats(),
+        "cache": CareerRepository.cache.stats(),
+    }
@@ -1,14 +1,54 @@
+from io import StringIO
+import csv
+from pathlib import Path
+from tempfile import NamedTemporaryFile, TemporaryDirectory
+from unittest import skipUnless
+import gzip
 import json
-from datetime import datetime
+from datetime import datetime, timedelta, timezone as dt_timezone
 import logging
+import threading
+from asgiref.sync import sync_to_async
 from mock import patch
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, transaction
+from django.db.backends.utils import CursorWrapper
 from django.db.models import QuerySet
 
-from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.test import (
+    AsyncClient,
+    AsyncRequestFactory,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
 from rest_framework.test import APIClient
 from rest_framework import status
-
-from app.models import CareerModel
+from rest_framework.renderers import JSONRenderer
+
+from app.compression import CODECS, negotiate
+from app.domain import Career, CareerOutcome
+from app.encoders import CareerEncoder
+from app.management.commands.export_careers import pyarrow
+from app.group_commit import GroupCommitter
+from app.log import BackgroundHandler, SampledLogger
+from app.metrics import registry
+from app.pagination import CAREER_ORDERINGS, Cursor, keyset_filter
+from app.middleware import PRIMARY_COOKIE
+from app.models import CareerImportModel, CareerModel, CareerRevisionModel
+from app.renderers import CareerJSONRenderer, cbor2, msgpack
+from app.repositories import CareerRepository
+from app.serializers import ListCareerSerializer
+from app.stats import database_pool_stats
+from app.views import (
+    AsyncListCreateCareerView,
+    AsyncUpdateDeleteCareerView,
+    BulkCreateCareersView,
+)
 from app.responses import INTERNAL_SERVER_ERROR_DATA, NOT_FOUND_DATA
 
 
@@ -19,6 +59,7 @@ class CareerTest(TestCase):
 
     def setUp(self):
         self.client = APIClient()
+        cache.clear()
 
     def test_should_list_all_careers(self):
         # Given
@@ -34,7 +75,7 @@ class CareerTest(TestCase):
         response = self.client.get("/careers/")
 
         # Then
-        listed_careers = json.loads(response.content.decode())
+        listed_careers = json.loads(response.content.decode())["results"]
         career = listed_careers[0]
 
         assert response.status_code == status.HTTP_200_OK
@@ -54,11 +95,261 @@ class CareerTest(TestCase):
         response = self.client.get("/careers/")
 
         # Then
-        career_list = json.loads(response.content.decode())
+        response_data = json.loads(response.content.decode())
+
+        assert response.status_code == status.HTTP_200_OK
+
+        assert response_data == {"next": None, "previous": None, "results": []}
+
+    def test_should_paginate_careers_with_cursors(self):
+        # Given
+        for index in range(5):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # When
+        first_page = self.client.get("/careers/?page_size=2").json()
+        second_page = self.client.get(first_page["next"]).json()
+        last_page = self.client.get(second_page["next"]).json()
+        previous_page = self.client.get(last_page["previous"]).json()
+
+        # Then
+        assert [c["id"] for c in first_page["results"]] == [1, 2]
+        assert first_page["previous"] is None
+
+        assert [c["id"] for c in second_page["results"]] == [3, 4]
+        assert second_page["previous"] is not None
+
+        assert [c["id"] for c in last_page["results"]] == [5]
+        assert last_page["next"] is None
+
+        assert [c["id"] for c in previous_page["results"]] == [3, 4]
+        assert previous_page["next"] is not None
+
+    def test_should_filter_careers_by_username_and_created_range(self):
+        # Given
+        for index, username in enumerate(["alice", "bob", "alice", "alice"]):
+            CareerModel.objects.create(
+                username=username, title=f"title {index}", content="content"
+            )
+        CareerModel.objects.filter(id=1).update(
+            created_datetime=datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        )
+        CareerModel.objects.filter(id=4).update(
+            created_datetime=datetime(2030, 1, 1, tzinfo=dt_timezone.utc)
+        )
+
+        # When
+        response = self.client.get(
+            "/careers/",
+            {
+                "username": "alice",
+                "created_after": "2025-01-01T00:00:00Z",
+                "created_before": "2030-01-01T00:00:00Z",
+            },
+        )
+
+        # Then
+        careers = response.json()["results"]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [career["id"] for career in careers] == [3]
+
+    def test_should_list_careers_newest_first_across_pages(self):
+        # Given
+        for index in range(3):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # When
+        first_page = self.client.get(
+            "/careers/?ordering=-created_datetime&page_size=2"
+        ).json()
+        second_page = self.client.get(first_page["next"]).json()
+
+        # Then
+        assert [c["id"] for c in first_page["results"]] == [3, 2]
+        assert [c["id"] for c in second_page["results"]] == [1]
+
+    def test_should_bound_keyset_pages_by_the_leading_ordering_field(self):
+        # Given
+        created_datetime = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        ordering = CAREER_ORDERINGS["-created_datetime"]
+
+        # When
+        where = {
+            reverse: str(
+                CareerModel.objects.filter(
+                    keyset_filter(
+                        ordering, Cursor((created_datetime, 7), reverse)
+                    )
+                ).query
+            ).split(" WHERE ")[1]
+            for reverse in (False, True)
+        }
+
+        # Then
+        assert where[False].startswith(
+            '("app_careermodel"."created_datetime" <= '
+        )
+        assert where[True].startswith(
+            '("app_careermodel"."created_datetime" >= '
+        )
+        assert ' AND ("app_careermodel"."created_datetime" < ' in where[False]
+
+    @skipUnless(connection.vendor == "sqlite", "SQLite query plan")
+    def test_should_seek_the_ordering_index_for_keyset_pages(self):
+        # Given
+        created_datetime = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+        ordering = CAREER_ORDERINGS["-created_datetime"]
+
+        # When
+        plan = (
+            CareerModel.objects.filter(
+                keyset_filter(ordering, Cursor((created_datetime, 7)))
+            )
+            .order_by(*ordering)
+            .explain()
+        )
+
+        # Then
+        assert (
+            "SEARCH app_careermodel USING INDEX career_created_id_idx "
+            "(created_datetime<?)"
+        ) in plan
+
+    def test_should_not_list_careers_when_ordering_is_not_allowed(self):
+        # When
+        response = self.client.get("/careers/?ordering=content")
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "ordering" in response.json()
+
+    def test_should_not_list_careers_when_cursor_has_other_ordering(self):
+        # Given
+        for index in range(2):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+        next_page = self.client.get("/careers/?page_size=1").json()["next"]
+
+        # When
+        response = self.client.get(f"{next_page}&ordering=-created_datetime")
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {
+            "cursor": ["Cursor does not match the ordering."]
+        }
+
+    def test_should_search_careers_ranked_by_relevance(self):
+        # Given
+        CareerModel.objects.create(
+            username="alice", title="Gardener", content="Grows plants"
+        )
+        CareerModel.objects.create(
+            username="bob", title="Engineer", content="Writes Python daily"
+        )
+        CareerModel.objects.create(
+            username="alice", title="Python developer", content="Django"
+        )
+
+        # When
+        response = self.client.get("/careers/?q=python")
+        filtered_response = self.client.get("/careers/?q=python&username=bob")
+        empty_response = self.client.get('/careers/?q="rust OR go"')
+
+        # Then
+        careers = response.json()["results"]
 
         assert response.status_code == status.HTTP_200_OK
+        assert [career["id"] for career in careers] == [3, 2]
+        assert [c["id"] for c in filtered_response.json()["results"]] == [2]
+        assert empty_response.json()["results"] == []
+
+    def test_should_paginate_search_results(self):
+        # Given
+        for index in range(3):
+            CareerModel.objects.create(
+                username="username", title=f"python {index}", content="python"
+            )
+        CareerModel.objects.filter(id=2).update(title="python python")
+
+        # When
+        first_page = self.client.get("/careers/?q=python&page_size=2").json()
+        second_page = self.client.get(first_page["next"]).json()
+        previous_page = self.client.get(second_page["previous"]).json()
+
+        # Then
+        assert [c["id"] for c in first_page["results"]][0] == 2
+        assert len(first_page["results"]) == 2
+        assert len(second_page["results"]) == 1
+        assert second_page["next"] is None
+        assert previous_page["results"] == first_page["results"]
+
+    def test_should_list_and_read_only_requested_fields(self):
+        # Given
+        for index in range(3):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            first_page = self.client.get(
+                "/careers/?fields=title,id&page_size=2"
+            ).json()
+            second_page = self.client.get(first_page["next"]).json()
+
+        # Then
+        assert first_page["results"] == [
+            {"id": 1, "title": "title 0"},
+            {"id": 2, "title": "title 1"},
+        ]
+        assert second_page["results"] == [{"id": 3, "title": "title 2"}]
+        assert all("content" not in query["sql"] for query in queries)
+
+    def test_should_search_careers_with_requested_fields(self):
+        # Given
+        CareerModel.objects.create(
+            username="alice", title="Python developer", content="Django"
+        )
+
+        # When
+        response = self.client.get("/careers/?q=python&fields=username")
+
+        # Then
+        assert response.json()["results"] == [{"username": "alice"}]
+
+    def test_should_not_list_careers_when_fields_are_unknown(self):
+        # When
+        response = self.client.get("/careers/?fields=title,salary")
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json() == {"fields": ["Unknown fields: salary."]}
+
+    def test_should_not_list_careers_when_cursor_is_not_valid(self):
+        # When
+        response = self.client.get("/careers/?cursor=not-a-cursor")
+
+        # Then
+        response_data = json.loads(response.content.decode())
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response_data == {"cursor": ["Invalid cursor."]}
 
-        assert len(career_list) == 0
+    def test_should_not_list_careers_when_page_size_is_above_the_limit(self):
+        # When
+        response = self.client.get(
+            f"/careers/?page_size={settings.CAREERS_MAX_PAGE_SIZE + 1}"
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
     def test_should_not_list_all_careers_when_database_raises_exception(self):
         # Set up
@@ -83,6 +374,67 @@ class CareerTest(TestCase):
             )
             assert error_body == INTERNAL_SERVER_ERROR_DATA
 
+    def test_should_export_all_careers_as_ndjson(self):
+        # Given
+        for index in range(3):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # When
+        response = self.client.get(
+            "/careers/export/?chunk_size=2",
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+
+        # Then
+        body = b"".join(response.streaming_content).decode()
+        careers = [json.loads(line) for line in body.splitlines()]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+
+        assert [career["id"] for career in careers] == [1, 2, 3]
+        assert careers[0]["title"] == "title 0"
+        assert isinstance(careers[0]["created_datetime"], str)
+
+    def test_should_export_all_careers_as_json_array(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = self.client.get("/careers/export/?output=json")
+        CareerModel.objects.all().delete()
+        empty_response = self.client.get("/careers/export/?output=json")
+
+        # Then
+        careers = json.loads(b"".join(response.streaming_content))
+        empty_careers = json.loads(b"".join(empty_response.streaming_content))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [career["id"] for career in careers] == [1]
+        assert empty_careers == []
+
+    def test_should_not_export_careers_when_database_raises_exception(self):
+        # Set up
+        with patch.object(CareerModel.objects, "all") as mock_method:
+            mock_method.side_effect = Exception(
+                "Test database raise exception."
+            )
+
+            # When
+            response = self.client.get("/careers/export/")
+
+            # Then
+            error_body = json.loads(response.content.decode())
+
+            assert (
+                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            assert error_body == INTERNAL_SERVER_ERROR_DATA
+
     def test_should_create_new_career(self):
         # Given
         post_data = {
@@ -152,119 +504,485 @@ class CareerTest(TestCase):
 
         assert errors == expected_errors
 
-    def test_should_update_career(self):
-        # Set up
-        username = "username"
-        CareerModel.objects.create(
-            username=username, title="title", content="content"
-        )
-
+    def test_should_bulk_create_careers_from_json_array(self):
         # Given
-        patch_data = {"title": "new title", "content": "new content"}
+        post_data = [
+            {"username": "username", "title": "title 0", "content": "content"},
+            {"username": "username", "title": "title 1"},
+            {"username": "username", "title": "title 2", "content": "content"},
+        ]
 
         # When
-        response = self.client.patch("/careers/1/", patch_data)
+        response = self.client.post("/careers/bulk/", post_data, format="json")
 
         # Then
-        updated_career = CareerModel.objects.filter(id=1).first()
         response_data = json.loads(response.content.decode())
 
-        assert response_data == patch_data
-        assert response.status_code == status.HTTP_200_OK
-
-        assert updated_career.id == 1
-        assert updated_career.username == username
-        assert updated_career.title == patch_data["title"]
-        assert updated_career.content == patch_data["content"]
-
-    def test_should_not_update_career_when_database_raises_exception_while_search_career(
-        self,
-    ):
-        # Set up
-        with patch.object(CareerModel.objects, "filter") as mock_method:
-            mock_method.side_effect = Exception(
-                "Test database raise exception."
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response_data["created"] == 2
+        assert response_data["failed"] == 1
+        assert response_data["results"] == [
+            {"index": 0, "status": 201, "id": 1},
+            {
+                "index": 1,
+                "status": 400,
+                "errors": {"content": ["This field is required."]},
+            },
+            {"index": 2, "status": 201, "id": 2},
+        ]
+        assert CareerModel.objects.count() == 2
+
+    def test_should_bulk_create_careers_from_ndjson_in_batches(self):
+        # Given
+        lines = [
+            json.dumps(
+                {"username": "username", "title": f"t{i}", "content": "c"}
             )
+            for i in range(5)
+        ]
+        body = "\n".join(lines) + "\n"
 
-            username = "username"
-            CareerModel.objects.create(
-                username=username, title="title", content="content"
+        # When
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                "/careers/bulk/?batch_size=2",
+                body,
+                content_type="application/x-ndjson",
             )
 
-            # Given
-            patch_data = {"title": "new title", "content": "new content"}
-
-            # When
-            response = self.client.patch("/careers/1/", patch_data)
+        # Then
+        response_data = json.loads(response.content.decode())
 
-            # Then
-            error_body = json.loads(response.content.decode())
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response_data["created"] == 5
+        assert [item["id"] for item in response_data["results"]] == list(
+            range(1, 6)
+        )
+        assert list(
+            CareerModel.objects.order_by("id").values_list("title", flat=True)
+        ) == ["t0", "t1", "t2", "t3", "t4"]
 
-            assert (
-                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+    def test_should_bulk_create_careers_from_chunked_ndjson(self):
+        # Given
+        body = "".join(
+            json.dumps(
+                {"username": "username", "title": f"t{i}", "content": "c"}
             )
-            assert error_body == INTERNAL_SERVER_ERROR_DATA
+            + "\n"
+            for i in range(3)
+        )
 
-    def test_should_not_update_career_when_database_raises_exception_while_updating_career(
-        self,
-    ):
-        # Set up
-        with patch.object(QuerySet, "update") as mock_method:
-            mock_method.side_effect = Exception(
-                "Test database raise exception."
-            )
+        # When
+        response = self.client.post(
+            "/careers/bulk/",
+            body,
+            content_type="application/x-ndjson",
+            CONTENT_LENGTH="",
+            HTTP_TRANSFER_ENCODING="chunked",
+        )
 
-            username = "username"
-            CareerModel.objects.create(
-                username=username, title="title", content="content"
-            )
+        # Then
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["created"] == 3
+        assert CareerModel.objects.count() == 3
 
-            # Given
-            patch_data = {"title": "new title", "content": "new content"}
+    async def test_should_bulk_create_careers_from_ndjson_under_asgi(self):
+        # Given
+        body = json.dumps(
+            {"username": "username", "title": "title", "content": "c"}
+        )
 
-            # When
-            response = self.client.patch("/careers/1/", patch_data)
+        request = AsyncRequestFactory().post(
+            "/careers/bulk/",
+            body,
+            content_type="application/x-ndjson",
+            headers={"Transfer-Encoding": "chunked"},
+        )
+        del request.META["CONTENT_LENGTH"]
 
-            # Then
-            error_body = json.loads(response.content.decode())
+        # When
+        response = await sync_to_async(BulkCreateCareersView.as_view())(
+            request
+        )
 
-            assert (
-                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            assert error_body == INTERNAL_SERVER_ERROR_DATA
+        # Then
+        assert response.status_code == status.HTTP_201_CREATED
+        assert await CareerModel.objects.acount() == 1
 
-    def test_should_not_update_career_when_request_data_is_not_valid(self):
-        # Set up
-        career_data = {
-            "id": 1,
-            "username": "username",
-            "title": "title",
-            "content": "content",
-        }
-        CareerModel.objects.create(
-            username=career_data["username"],
-            title=career_data["title"],
-            content=career_data["content"],
+    def test_should_not_bulk_create_careers_from_an_empty_body(self):
+        # When
+        ndjson_response = self.client.post(
+            "/careers/bulk/", "\n", content_type="application/x-ndjson"
+        )
+        unreadable_response = self.client.post(
+            "/careers/bulk/",
+            "",
+            content_type="application/x-ndjson",
+            CONTENT_LENGTH="",
         )
+        json_response = self.client.post("/careers/bulk/", [], format="json")
+
+        # Then
+        for response in (ndjson_response, unreadable_response, json_response):
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert response.json() == {
+                "non_field_errors": ["Expected at least one item."]
+            }
 
+    def test_should_report_invalid_ndjson_lines_when_bulk_creating(self):
         # Given
-        patch_data = {}
+        body = (
+            '{"username": "username", "title": "title", "content": "c"}\n'
+            "not json\n"
+        )
 
         # When
-        response = self.client.patch(
-            f"/careers/{career_data['id']}/", patch_data
+        response = self.client.post(
+            "/careers/bulk/", body, content_type="application/x-ndjson"
         )
 
         # Then
-        career = CareerModel.objects.filter(id=career_data["id"]).first()
         response_data = json.loads(response.content.decode())
-        expected_response_data = {
-            "title": ["This field is required."],
-            "content": ["This field is required."],
+
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response_data["results"][1] == {
+            "index": 1,
+            "status": 400,
+            "errors": {"non_field_errors": ["Invalid JSON."]},
         }
 
-        assert response_data == expected_response_data
-        assert response.status_code == status.HTTP_400_BAD_REQUEST
+    def test_should_not_save_a_bulk_batch_without_valid_careers(self):
+        # Given
+        body = "not json\n"
+
+        # When
+        with patch.object(CareerRepository, "save_careers") as mock_method:
+            response = self.client.post(
+                "/careers/bulk/", body, content_type="application/x-ndjson"
+            )
+
+        # Then
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.json()["results"][0]["status"] == 400
+        mock_method.assert_not_called()
+
+    def test_should_not_bulk_create_careers_when_body_is_not_a_list(self):
+        # When
+        response = self.client.post(
+            "/careers/bulk/", {"username": "username"}, format="json"
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert CareerModel.objects.count() == 0
+
+    def test_should_not_bulk_create_careers_when_database_raises_exception(
+        self,
+    ):
+        # Set up
+        with patch.object(QuerySet, "bulk_create") as mock_method:
+            mock_method.side_effect = Exception(
+                "Test database raise exception."
+            )
+
+            # Given
+            post_data = [
+                {"username": "username", "title": "title", "content": "c"}
+            ]
+
+            # When
+            response = self.client.post(
+                "/careers/bulk/", post_data, format="json"
+            )
+
+            # Then
+            response_data = json.loads(response.content.decode())
+
+            assert response.status_code == status.HTTP_207_MULTI_STATUS
+            assert response_data["results"] == [
+                {
+                    "index": 0,
+                    "status": 500,
+                    "errors": INTERNAL_SERVER_ERROR_DATA,
+                }
+            ]
+
+    def test_should_run_mixed_career_batch_in_order(self):
+        # Set up
+        for index in range(3):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # Given
+        post_data = {
+            "operations": [
+                {
+                    "op": "create",
+                    "data": {
+                        "username": "username",
+                        "title": "new",
+                        "content": "new content",
+                    },
+                },
+                {
+                    "op": "update",
+                    "id": 1,
+                    "data": {"title": "first", "content": "c"},
+                },
+                {
+                    "op": "update",
+                    "id": 1,
+                    "data": {"title": "last", "content": "c"},
+                },
+                {
+                    "op": "update",
+                    "id": 99,
+                    "data": {"title": "t", "content": "c"},
+                },
+                {"op": "delete", "id": 2},
+                {"op": "delete", "id": 2},
+                {
+                    "op": "update",
+                    "id": 3,
+                    "data": {"title": "t", "content": "c"},
+                },
+            ]
+        }
+
+        # When
+        response = self.client.post(
+            "/careers/batch/", post_data, format="json"
+        )
+
+        # Then
+        response_data = json.loads(response.content.decode())
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response_data["results"] == [
+            {"index": 0, "status": 201, "id": 4},
+            {"index": 1, "status": 200},
+            {"index": 2, "status": 200},
+            {"index": 3, "status": 404},
+            {"index": 4, "status": 204},
+            {"index": 5, "status": 404},
+            {"index": 6, "status": 200},
+        ]
+        assert CareerModel.objects.get(id=1).title == "last"
+        assert not CareerModel.objects.filter(id=2).exists()
+        assert CareerModel.objects.get(id=4).title == "new"
+
+    def test_should_run_career_batch_updates_and_deletes_in_one_query_each(
+        self,
+    ):
+        # Set up
+        for index in range(2):
+            CareerModel.objects.create(
+                username="username", title=f"title {index}", content="content"
+            )
+
+        # Given
+        post_data = {
+            "operations": [
+                {
+                    "op": "update",
+                    "id": 1,
+                    "data": {"title": "t", "content": "c"},
+                },
+                {
+                    "op": "update",
+                    "id": 99,
+                    "data": {"title": "t", "content": "c"},
+                },
+                {"op": "delete", "id": 2},
+                {"op": "delete", "id": 99},
+            ]
+        }
+
+        # When
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/careers/batch/", post_data, format="json"
+            )
+
+        # Then
+        statements = [
+            query["sql"].split()[0]
+            for query in queries.captured_queries
+            if query["sql"].startswith(("SELECT", "UPDATE", "DELETE"))
+        ]
+
+        assert response.status_code == status.HTTP_200_OK
+        assert [item["status"] for item in response.json()["results"]] == [
+            200,
+            404,
+            204,
+            404,
+        ]
+        assert statements == ["UPDATE", "DELETE"]
+
+    def test_should_not_run_career_batch_when_an_operation_is_not_valid(self):
+        # Given
+        post_data = {
+            "operations": [
+                {
+                    "op": "create",
+                    "data": {"username": "u", "title": "t", "content": "c"},
+                },
+                {"op": "delete"},
+            ]
+        }
+
+        # When
+        response = self.client.post(
+            "/careers/batch/", post_data, format="json"
+        )
+
+        # Then
+        response_data = json.loads(response.content.decode())
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response_data == {
+            "operations": [{}, {"id": ["This field is required."]}]
+        }
+        assert CareerModel.objects.count() == 0
+
+    def test_should_rollback_career_batch_when_database_raises_exception(
+        self,
+    ):
+        # Set up
+        execute = CursorWrapper.execute
+
+        def failing_update(cursor, sql, params=None):
+            if sql.startswith("UPDATE"):
+                raise Exception("Test database raise exception.")
+            return execute(cursor, sql, params)
+
+        with patch.object(CursorWrapper, "execute", failing_update):
+            CareerModel.objects.create(
+                username="username", title="title", content="content"
+            )
+
+            # Given
+            post_data = {
+                "operations": [
+                    {
+                        "op": "create",
+                        "data": {
+                            "username": "u",
+                            "title": "t",
+                            "content": "c",
+                        },
+                    },
+                    {
+                        "op": "update",
+                        "id": 1,
+                        "data": {"title": "t", "content": "c"},
+                    },
+                ]
+            }
+
+            # When
+            response = self.client.post(
+                "/careers/batch/", post_data, format="json"
+            )
+
+            # Then
+            response_data = json.loads(response.content.decode())
+
+            assert (
+                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            assert response_data == INTERNAL_SERVER_ERROR_DATA
+            assert CareerModel.objects.count() == 1
+
+    def test_should_update_career(self):
+        # Set up
+        username = "username"
+        CareerModel.objects.create(
+            username=username, title="title", content="content"
+        )
+
+        # Given
+        patch_data = {"title": "new title", "content": "new content"}
+
+        # When
+        with self.assertNumQueries(1):
+            response = self.client.patch("/careers/1/", patch_data)
+
+        # Then
+        updated_career = CareerModel.objects.filter(id=1).first()
+        response_data = json.loads(response.content.decode())
+        expected_response_data = ListCareerSerializer(updated_career).data
+
+        assert response_data == expected_response_data
+        assert response_data["username"] == username
+        assert response_data["title"] == patch_data["title"]
+        assert response.status_code == status.HTTP_200_OK
+
+        assert updated_career.id == 1
+        assert updated_career.username == username
+        assert updated_career.title == patch_data["title"]
+        assert updated_career.content == patch_data["content"]
+
+    def test_should_not_update_career_when_database_raises_exception(self):
+        # Set up
+        username = "username"
+        CareerModel.objects.create(
+            username=username, title="title", content="content"
+        )
+
+        with patch.object(CursorWrapper, "execute") as mock_method:
+            mock_method.side_effect = Exception(
+                "Test database raise exception."
+            )
+
+            # Given
+            patch_data = {"title": "new title", "content": "new content"}
+
+            # When
+            response = self.client.patch("/careers/1/", patch_data)
+
+            # Then
+            error_body = json.loads(response.content.decode())
+
+            assert (
+                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            assert error_body == INTERNAL_SERVER_ERROR_DATA
+
+    def test_should_not_update_career_when_request_data_is_not_valid(self):
+        # Set up
+        career_data = {
+            "id": 1,
+            "username": "username",
+            "title": "title",
+            "content": "content",
+        }
+        CareerModel.objects.create(
+            username=career_data["username"],
+            title=career_data["title"],
+            content=career_data["content"],
+        )
+
+        # Given
+        patch_data = {}
+
+        # When
+        response = self.client.patch(
+            f"/careers/{career_data['id']}/", patch_data
+        )
+
+        # Then
+        career = CareerModel.objects.filter(id=career_data["id"]).first()
+        response_data = json.loads(response.content.decode())
+        expected_response_data = {
+            "title": ["This field is required."],
+            "content": ["This field is required."],
+        }
+
+        assert response_data == expected_response_data
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
 
         assert career.id == career_data["id"]
         assert career.username == career_data["username"]
@@ -359,70 +1077,1443 @@ class CareerTest(TestCase):
 
     def test_should_not_delete_career_when_database_raises_exception(self):
         # Set up
-        with patch.object(QuerySet, "delete") as mock_method:
+        career_data = {
+            "id": 1,
+            "username": "username",
+            "title": "title",
+            "content": "content",
+        }
+        CareerModel.objects.create(
+            username=career_data["username"],
+            title=career_data["title"],
+            content=career_data["content"],
+        )
+
+        with patch.object(CursorWrapper, "execute") as mock_method:
             mock_method.side_effect = Exception(
                 "Test database raise exception."
             )
 
-            # Given
-            career_data = {
-                "id": 1,
-                "username": "username",
-                "title": "title",
-                "content": "content",
-            }
-            CareerModel.objects.create(
-                username=career_data["username"],
-                title=career_data["title"],
-                content=career_data["content"],
-            )
-
             # When
             response = self.client.delete(f"/careers/{career_data['id']}/")
 
-            # Then
-            career = CareerModel.objects.filter(id=career_data["id"]).first()
-            response_data = json.loads(response.content.decode())
+        # Then
+        career = CareerModel.objects.filter(id=career_data["id"]).first()
+        response_data = json.loads(response.content.decode())
 
-            assert career.id == career_data["id"]
-            assert career.username == career_data["username"]
-            assert career.title == career_data["title"]
-            assert career.content == career_data["content"]
+        assert career.id == career_data["id"]
+        assert career.username == career_data["username"]
+        assert career.title == career_data["title"]
+        assert career.content == career_data["content"]
 
-            assert (
-                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            assert response_data == INTERNAL_SERVER_ERROR_DATA
+        assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert response_data == INTERNAL_SERVER_ERROR_DATA
 
-    def test_should_not_delete_career_when_database_raises_exception_when_trying_to_get_career_by_id(
-        self,
-    ):
-        # Set up
-        with patch.object(CareerModel.objects, "filter") as mock_method:
-            mock_method.side_effect = Exception(
-                "Test database raise exception."
-            )
+    def test_should_delete_career_with_a_single_query(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
 
-            # Given
-            career_data = {
-                "id": 1,
-                "username": "username",
-                "title": "title",
-                "content": "content",
-            }
-            CareerModel.objects.create(
-                username=career_data["username"],
-                title=career_data["title"],
-                content=career_data["content"],
-            )
+        # When
+        with self.assertNumQueries(1):
+            response = self.client.delete("/careers/1/")
+
+        # Then
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert CareerModel.objects.count() == 0
+
+    def test_should_not_query_database_when_career_id_is_malformed(self):
+        # Given
+        malformed_ids = ["abc", "-1", "0", "1.5", "\u0661", str(2**31)]
 
+        for malformed_id in malformed_ids:
             # When
-            response = self.client.delete(f"/careers/{career_data['id']}/")
+            with self.assertNumQueries(0):
+                delete_response = self.client.delete(
+                    f"/careers/{malformed_id}/"
+                )
+                patch_response = self.client.patch(
+                    f"/careers/{malformed_id}/",
+                    {"title": "title", "content": "content"},
+                )
 
             # Then
-            response_data = json.loads(response.content.decode())
+            assert delete_response.status_code == status.HTTP_404_NOT_FOUND
+            assert json.loads(delete_response.content) == NOT_FOUND_DATA
+            assert patch_response.status_code == status.HTTP_404_NOT_FOUND
 
-            assert (
-                response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
-            assert response_data == INTERNAL_SERVER_ERROR_DATA
+
+def settle_careers_revision():
+    """
+    Moves the last careers write to a minute ago, past the delay before it
+    is given as Last-Modified.
+    """
+    CareerRevisionModel.objects.update(
+        modified=timezone.now() - timedelta(minutes=1)
+    )
+
+
+class CareerCacheTest(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def test_should_serve_repeated_list_reads_from_cache(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        hits = CareerRepository.cache.stats()["hits"]
+        self.client.get("/careers/")
+
+        # When
+        with self.assertNumQueries(1):  # the careers revision
+            response = self.client.get("/careers/")
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.json()["results"]) == 1
+        assert CareerRepository.cache.stats()["hits"] == hits + 1
+
+    def test_should_invalidate_cached_reads_on_writes(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        self.client.get("/careers/")
+
+        # When
+        self.client.patch("/careers/1/", {"title": "new", "content": "new"})
+        response = self.client.get("/careers/")
+
+        # Then
+        assert response.json()["results"][0]["title"] == "new"
+
+    @override_settings(CAREERS_CACHE_MAX_ENTRY_BYTES=10)
+    def test_should_not_cache_entries_above_the_size_limit(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        oversized = CareerRepository.cache.stats()["oversized"]
+        self.client.get("/careers/")
+
+        # When
+        with self.assertNumQueries(2):
+            self.client.get("/careers/")
+
+        # Then
+        assert CareerRepository.cache.stats()["oversized"] == oversized + 2
+
+    def test_should_not_modify_careers_list_with_a_matching_etag(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        response = self.client.get("/careers/")
+        etag = response["ETag"]
+
+        # When
+        with self.assertNumQueries(1):  # the careers revision
+            response = self.client.get("/careers/", HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == etag
+
+    def test_should_not_modify_careers_list_since_last_modified(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        settle_careers_revision()
+        response = self.client.get("/careers/")
+        last_modified = response["Last-Modified"]
+
+        # When
+        response = self.client.get(
+            "/careers/", HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_should_change_careers_list_etag_on_writes(self):
+        # Given
+        etag = self.client.get("/careers/")["ETag"]
+
+        # When
+        self.client.post(
+            "/careers/",
+            {"username": "username", "title": "title", "content": "content"},
+        )
+        response = self.client.get("/careers/", HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert len(response.json()["results"]) == 1
+
+    def test_should_change_careers_list_etag_on_writes_of_other_processes(
+        self,
+    ):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        etag = self.client.get("/careers/")["ETag"]
+
+        # When
+        # Written without the repository, so no cache version is bumped.
+        CareerModel.objects.filter(id=career_model.id).update(title="other")
+        response = self.client.get("/careers/", HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+
+    def test_should_not_give_careers_last_modified_in_its_second(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = self.client.get("/careers/")
+
+        # Then
+        assert response.has_header("ETag")
+        assert not response.has_header("Last-Modified")
+
+    def test_should_retrieve_career(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        settle_careers_revision()
+
+        # When
+        response = self.client.get(f"/careers/{career_model.id}/")
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == ListCareerSerializer(career_model).data
+        assert response.has_header("ETag")
+        assert not response.has_header("Last-Modified")
+
+    @override_settings(CAREERS_CACHE_TIMEOUT=0)
+    def test_should_retrieve_career_with_a_single_query(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        with self.assertNumQueries(1):
+            response = self.client.get(f"/careers/{career_model.id}/")
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response.has_header("ETag")
+
+    def test_should_not_retrieve_career_when_it_is_not_found(self):
+        # When
+        response = self.client.get("/careers/1/")
+
+        # Then
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert response.json() == NOT_FOUND_DATA
+        assert not response.has_header("ETag")
+
+    def test_should_not_modify_career_with_a_matching_etag(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        url = f"/careers/{career_model.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        # When
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+        # Then
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_should_update_career_when_if_match_is_current(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        url = f"/careers/{career_model.id}/"
+        etag = self.client.get(url)["ETag"]
+
+        # When
+        response = self.client.patch(
+            url, {"title": "new", "content": "new"}, HTTP_IF_MATCH=etag
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response["ETag"] != etag
+        assert response["ETag"] == self.client.get(url)["ETag"]
+
+    def test_should_not_update_career_when_if_match_is_stale(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        url = f"/careers/{career_model.id}/"
+        etag = self.client.get(url)["ETag"]
+        self.client.patch(url, {"title": "other", "content": "other"})
+
+        # When
+        response = self.client.patch(
+            url, {"title": "new", "content": "new"}, HTTP_IF_MATCH=etag
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert CareerModel.objects.get(id=career_model.id).title == "other"
+
+    def test_should_not_update_career_changed_after_its_precondition(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        def precondition(career):
+            CareerModel.objects.filter(id=career.id).update(title="other")
+            return True
+
+        # When
+        outcome = CareerRepository().update_career(
+            Career(id=career_model.id, title="new", content="new"),
+            precondition,
+        )
+
+        # Then
+        assert outcome is CareerOutcome.PRECONDITION_FAILED
+        assert CareerModel.objects.get(id=career_model.id).title == "other"
+
+    def test_should_not_delete_career_changed_after_its_precondition(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        def precondition(career):
+            CareerModel.objects.filter(id=career.id).update(content="other")
+            return True
+
+        # When
+        outcome = CareerRepository().delete_career(
+            career_model.id, precondition
+        )
+
+        # Then
+        assert outcome is CareerOutcome.PRECONDITION_FAILED
+        assert CareerModel.objects.filter(id=career_model.id).exists()
+
+    def test_should_return_not_found_outcomes_for_a_missing_career(self):
+        # Given
+        repository = CareerRepository()
+
+        # When
+        outcomes = [
+            repository.get_career_by_id(1),
+            repository.update_career(
+                Career(id=1, title="title", content="content")
+            ),
+            repository.delete_career(1),
+        ]
+
+        # Then
+        assert outcomes == [CareerOutcome.NOT_FOUND] * 3
+
+    def test_should_not_delete_career_when_if_match_does_not_match(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = self.client.delete(
+            f"/careers/{career_model.id}/", HTTP_IF_MATCH='"stale"'
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert CareerModel.objects.filter(id=career_model.id).exists()
+
+    def test_should_not_find_missing_career_when_its_precondition_passes(self):
+        # When
+        update_response = self.client.patch(
+            "/careers/999/",
+            {"title": "new", "content": "new"},
+            HTTP_IF_NONE_MATCH="*",
+        )
+        delete_response = self.client.delete(
+            "/careers/999/", HTTP_IF_NONE_MATCH="*"
+        )
+
+        # Then
+        assert update_response.status_code == status.HTTP_404_NOT_FOUND
+        assert delete_response.status_code == status.HTTP_404_NOT_FOUND
+
+
+class AsyncCareerTest(TestCase):
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+        self.list_create_view = AsyncListCreateCareerView.as_view()
+        self.update_delete_view = AsyncUpdateDeleteCareerView.as_view()
+        cache.clear()
+
+    async def test_should_list_careers(self):
+        # Given
+        career_model = await CareerModel.objects.acreate(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = await self.list_create_view(self.factory.get("/careers/"))
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == {
+            "next": None,
+            "previous": None,
+            "results": [ListCareerSerializer(career_model).data],
+        }
+        assert response.has_header("ETag")
+
+    async def test_should_create_career(self):
+        # Given
+        data = {"username": "username", "title": "title", "content": "c"}
+
+        # When
+        response = await self.list_create_view(
+            self.factory.post(
+                "/careers/", data, content_type="application/json"
+            )
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_201_CREATED
+        assert json.loads(response.content) == data
+        assert await CareerModel.objects.acount() == 1
+
+    async def test_should_not_create_career_when_body_is_malformed(self):
+        # When
+        response = await self.list_create_view(
+            self.factory.post(
+                "/careers/", "{", content_type="application/json"
+            )
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "detail" in json.loads(response.content)
+
+    async def test_should_not_modify_career_with_a_matching_etag(self):
+        # Given
+        career_model = await CareerModel.objects.acreate(
+            username="username", title="title", content="content"
+        )
+        url = f"/careers/{career_model.id}/"
+        response = await self.update_delete_view(
+            self.factory.get(url), pk=str(career_model.id)
+        )
+
+        # When
+        not_modified = await self.update_delete_view(
+            self.factory.get(url, headers={"If-None-Match": response["ETag"]}),
+            pk=str(career_model.id),
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+    async def test_should_update_career(self):
+        # Given
+        career_model = await CareerModel.objects.acreate(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = await self.update_delete_view(
+            self.factory.patch(
+                f"/careers/{career_model.id}/",
+                {"title": "new", "content": "new"},
+                content_type="application/json",
+            ),
+            pk=str(career_model.id),
+        )
+
+        # Then
+        await career_model.arefresh_from_db()
+        assert response.status_code == status.HTTP_200_OK
+        assert json.loads(response.content) == (
+            ListCareerSerializer(career_model).data
+        )
+
+    async def test_should_not_update_career_when_if_match_is_stale(self):
+        # Given
+        career_model = await CareerModel.objects.acreate(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = await self.update_delete_view(
+            self.factory.patch(
+                f"/careers/{career_model.id}/",
+                {"title": "new", "content": "new"},
+                content_type="application/json",
+                headers={"If-Match": '"stale"'},
+            ),
+            pk=str(career_model.id),
+        )
+
+        # Then
+        await career_model.arefresh_from_db()
+        assert response.status_code == status.HTTP_412_PRECONDITION_FAILED
+        assert career_model.title == "title"
+
+    async def test_should_delete_career(self):
+        # Given
+        career_model = await CareerModel.objects.acreate(
+            username="username", title="title", content="content"
+        )
+        url = f"/careers/{career_model.id}/"
+
+        # When
+        response = await self.update_delete_view(
+            self.factory.delete(url), pk=str(career_model.id)
+        )
+        not_found = await self.update_delete_view(
+            self.factory.get(url), pk=str(career_model.id)
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        assert response.content == b""
+        assert not_found.status_code == status.HTTP_404_NOT_FOUND
+        assert json.loads(not_found.content) == NOT_FOUND_DATA
+
+    async def test_should_stream_exports_under_asgi(self):
+        # Given
+        read = []
+
+        def careers():
+            for index in range(1000):
+                read.append(index)
+                yield Career(
+                    "title",
+                    "content",
+                    "username",
+                    index,
+                    datetime(2024, 1, 1, tzinfo=dt_timezone.utc),
+                )
+
+        # When
+        with patch.object(
+            CareerRepository, "iter_careers", return_value=careers()
+        ):
+            response = await AsyncClient().get("/careers/export/")
+            # Consumed like Django's ASGI handler sends it.
+            first_chunk = await anext(aiter(response))
+            rows_read = len(read)
+
+        # Then
+        assert response.is_async
+        assert first_chunk.count(b"\n") == rows_read
+        assert rows_read < 1000
+
+
+@override_settings(CAREERS_READ_REPLICAS=["replica"])
+class ReadReplicaTest(TransactionTestCase):
+    # TestCase runs every test in a transaction, whose reads use the primary.
+    databases = {"default", "replica"}
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        CareerModel.objects.using("replica").create(
+            username="replica", title="title", content="content"
+        )
+
+    def usernames(self, response) -> list[str]:
+        return [career["username"] for career in response.json()["results"]]
+
+    @override_settings(CAREERS_CACHE_TIMEOUT=0)
+    def test_should_read_careers_from_replica(self):
+        # Given
+        CareerModel.objects.create(
+            username="primary", title="title", content="content"
+        )
+
+        # When
+        response = self.client.get("/careers/")
+
+        # Then
+        assert self.usernames(response) == ["replica"]
+
+    @override_settings(CAREERS_CACHE_TIMEOUT=0)
+    def test_should_read_own_writes_from_primary_after_a_write(self):
+        # Given
+        self.client.post(
+            "/careers/",
+            {"username": "primary", "title": "title", "content": "content"},
+        )
+
+        # When
+        response = self.client.get("/careers/")
+        other_client_response = APIClient().get("/careers/")
+
+        # Then
+        assert PRIMARY_COOKIE in self.client.cookies
+        assert self.usernames(response) == ["primary"]
+        assert self.usernames(other_client_response) == ["replica"]
+
+    @override_settings(
+        CAREERS_CACHE_TIMEOUT=0, CAREERS_PRIMARY_STICKINESS_SECONDS=0
+    )
+    def test_should_read_from_replica_without_a_stickiness_window(self):
+        # Given
+        self.client.post(
+            "/careers/",
+            {"username": "primary", "title": "title", "content": "content"},
+        )
+
+        # When
+        response = self.client.get("/careers/")
+
+        # Then
+        assert PRIMARY_COOKIE not in self.client.cookies
+        assert self.usernames(response) == ["replica"]
+
+    @override_settings(CAREERS_CACHE_TIMEOUT=0)
+    def test_should_tag_careers_with_the_revision_of_the_replica(self):
+        # Given
+        CareerModel.objects.create(
+            username="primary", title="title", content="content"
+        )
+        response = self.client.get("/careers/")
+
+        # When
+        CareerModel.objects.using("replica").create(
+            username="primary", title="title", content="content"
+        )
+        caught_up_response = self.client.get(
+            "/careers/", HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+
+        # Then
+        assert self.usernames(response) == ["replica"]
+        assert caught_up_response.status_code == status.HTTP_200_OK
+        assert self.usernames(caught_up_response) == ["replica", "primary"]
+
+    def test_should_fill_cache_from_primary_after_a_write(self):
+        # Given
+        self.client.post(
+            "/careers/",
+            {"username": "primary", "title": "title", "content": "content"},
+        )
+
+        # When
+        response = APIClient().get("/careers/")
+
+        # Then
+        assert self.usernames(response) == ["primary"]
+
+    def test_should_read_from_primary_in_a_transaction(self):
+        # When
+        with transaction.atomic():
+            usernames = list(
+                CareerModel.objects.values_list("username", flat=True)
+            )
+
+        # Then
+        assert usernames == []
+
+
+class StatsTest(TestCase):
+
+    def test_should_return_cache_stats_without_database_pools(self):
+        # When
+        response = APIClient().get("/stats/")
+
+        # Then
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["database_pools"] == {}
+        assert set(response.json()["cache"]) == {
+            "hits",
+            "misses",
+            "oversized",
+            "errors",
+        }
+
+    def test_should_summarize_database_pool_stats(self):
+        # Given
+        class Pool:
+            closed = False
+
+            def get_stats(self):
+                return {
+                    "pool_min": 2,
+                    "pool_max": 10,
+                    "pool_size": 4,
+                    "pool_available": 1,
+                    "requests_waiting": 2,
+                    "requests_num": 8,
+                    "requests_wait_ms": 40,
+                }
+
+        class Connection:
+            alias = "default"
+            pool = Pool()
+
+        # When
+        with patch("app.stats.connections") as connections:
+            connections.all.return_value = [Connection()]
+            stats = database_pool_stats()
+
+        # Then
+        assert stats["default"]["in_use"] == 3
+        assert stats["default"]["waiting"] == 2
+        assert stats["default"]["average_wait_ms"] == 5.0
+
+
+class MetricsTest(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        registry.reset()
+
+    def test_should_return_server_timing_per_phase(self):
+        # Given
+        CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = self.client.get("/careers/")
+
+        # Then
+        phases = [
+            phase.split(";")[0]
+            for phase in response["Server-Timing"].split(", ")
+        ]
+        assert phases == ["db", "serialization", "app", "total"]
+        assert 'desc="2 queries"' in response["Server-Timing"]
+
+    @override_settings(CAREERS_SERVER_TIMING=False)
+    def test_should_not_return_server_timing_when_disabled(self):
+        # When
+        response = self.client.get("/careers/")
+
+        # Then
+        assert not response.has_header("Server-Timing")
+
+    def test_should_serve_route_metrics_in_prometheus_format(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+        self.client.get("/careers/")
+        self.client.delete(f"/careers/{career_model.id}/")
+
+        # When
+        response = self.client.get("/metrics")
+
+        # Then
+        metrics = response.content.decode()
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"].startswith("text/plain")
+        assert (
+            'careers_http_requests_total{route="careers/",method="GET",'
+            'status="200"} 1'
+        ) in metrics
+        assert (
+            'careers_http_request_duration_seconds_count{route="careers/'
+            '<str:pk>/",method="DELETE"} 1'
+        ) in metrics
+        assert (
+            'careers_db_queries_total{route="careers/",method="GET"} 2'
+        ) in metrics
+        assert "careers_cache_misses_total" in metrics
+
+
+class BenchCareersCommandTest(TestCase):
+
+    def bench(self, **options) -> dict:
+        stdout = StringIO()
+        call_command(
+            "bench_careers",
+            seed=5,
+            requests=3,
+            concurrency=1,
+            stdout=stdout,
+            **options,
+        )
+        return json.loads(stdout.getvalue())
+
+    def test_should_report_every_endpoint(self):
+        # When
+        report = self.bench()
+
+        # Then
+        assert set(report["endpoints"]) == {
+            "list",
+            "create",
+            "patch",
+            "delete",
+        }
+        for metrics in report["endpoints"].values():
+            assert metrics["requests"] == 3
+            assert metrics["errors"] == 0
+            assert metrics["queries_per_request"] >= 0
+        assert not CareerModel.objects.exists()
+
+    def test_should_only_delete_the_careers_of_the_run(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="bench", title="title", content="content"
+        )
+
+        # When
+        self.bench()
+
+        # Then
+        assert list(CareerModel.objects.values_list("id", flat=True)) == [
+            career_model.id
+        ]
+
+    def test_should_fail_on_regressions_against_the_baseline(self):
+        # Given
+        baseline = {
+            "endpoints": {
+                "create": {"p50_ms": 0.0001, "queries_per_request": 1}
+            }
+        }
+
+        # When
+        with NamedTemporaryFile("w", suffix=".json") as baseline_file:
+            json.dump(baseline, baseline_file)
+            baseline_file.flush()
+
+            # Then
+            with self.assertRaisesMessage(CommandError, "create"):
+                self.bench(baseline=baseline_file.name)
+
+
+class ImportCareersCommandTest(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write(self, name: str, content: str) -> str:
+        path = Path(self.directory.name) / name
+        path.write_text(content)
+        return str(path)
+
+    def import_careers(self, path: str, **options) -> str:
+        stdout = StringIO()
+        call_command(
+            "import_careers",
+            path,
+            stdout=stdout,
+            stderr=StringIO(),
+            **options,
+        )
+        return stdout.getvalue()
+
+    def test_should_import_valid_ndjson_rows_with_the_field_map(self):
+        # Given
+        path = self.write(
+            "requests.jsonl",
+            "\n".join(
+                [
+                    json.dumps(
+                        {"request_id": "user-001", "title": "t1", "body": "b1"}
+                    ),
+                    "",
+                    "not json",
+                    json.dumps({"request_id": "user-002", "title": "t2"}),
+                    json.dumps(
+                        {"request_id": "user-003", "title": "t3", "body": "b3"}
+                    ),
+                ]
+            ),
+        )
+
+        # When
+        output = self.import_careers(
+            path,
+            batch_size=2,
+            field_map=["username=request_id", "content=body"],
+        )
+
+        # Then
+        assert list(
+            CareerModel.objects.order_by("username").values_list(
+                "username", "title", "content"
+            )
+        ) == [("user-001", "t1", "b1"), ("user-003", "t3", "b3")]
+        assert "rows/s" in output
+        assert "Imported 2 careers" in output
+        assert "2 invalid rows" in output
+        assert (
+            CareerImportModel.objects.get(
+                path=str(Path(path).resolve())
+            ).position
+            == 4
+        )
+
+    def test_should_resume_after_the_checkpoint(self):
+        # Given
+        path = self.write(
+            "careers.csv",
+            "username,title,content\n"
+            "user1,title1,content1\n"
+            "user2,title2,content2\n"
+            "user3,title3,content3\n",
+        )
+        self.import_careers(path, batch_size=1)
+        CareerModel.objects.filter(username="user3").delete()
+        CareerImportModel.objects.filter(
+            path=str(Path(path).resolve())
+        ).update(position=2)
+
+        # When
+        output = self.import_careers(path)
+
+        # Then
+        assert "Resuming after 2 rows" in output
+        assert list(
+            CareerModel.objects.order_by("username").values_list(
+                "username", flat=True
+            )
+        ) == ["user1", "user2", "user3"]
+
+    def test_should_not_commit_a_batch_that_failed(self):
+        # Given
+        path = self.write(
+            "careers.csv", "username,title,content\nuser1,title1,content1\n"
+        )
+
+        # When
+        with patch.object(CareerRepository, "copy_careers", return_value=None):
+            with self.assertRaisesMessage(CommandError, "resume"):
+                self.import_careers(path)
+
+        # Then
+        assert not CareerModel.objects.exists()
+        assert not CareerImportModel.objects.exists()
+
+    def test_should_import_from_the_first_row_on_restart(self):
+        # Given
+        path = self.write(
+            "careers.csv", "username,title,content\nuser1,title1,content1\n"
+        )
+        self.import_careers(path)
+
+        # When
+        output = self.import_careers(path, restart=True)
+
+        # Then
+        assert "Resuming" not in output
+        assert CareerModel.objects.filter(username="user1").count() == 2
+
+
+class ExportCareersCommandTest(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.careers = [
+            CareerModel.objects.create(
+                username=f"user{day}", title=f"title{day}", content="a,\nb"
+            )
+            for day in (1, 2, 3)
+        ]
+        for day, career in enumerate(self.careers, 1):
+            career.created_datetime = datetime(
+                2024, 1, day, 12, tzinfo=dt_timezone.utc
+            )
+            career.save()
+
+    def export(self, name: str, **options) -> Path:
+        path = Path(self.directory.name) / name
+        call_command("export_careers", str(path), stdout=StringIO(), **options)
+        return path
+
+    def test_should_export_careers_in_the_range_to_csv(self):
+        # When
+        path = self.export(
+            "careers.csv",
+            since="2024-01-02",
+            until="2024-01-03T00:00:00Z",
+            chunk_size=1,
+            row_group_size=1,
+        )
+
+        # Then
+        with open(path, newline="") as csv_file:
+            rows = list(csv.reader(csv_file))
+
+        assert rows == [
+            ["id", "username", "created_datetime", "title", "content"],
+            [
+                str(self.careers[1].id),
+                "user2",
+                "2024-01-02T12:00:00Z",
+                "title2",
+                "a,\nb",
+            ],
+        ]
+        assert not path.with_name("careers.csv.tmp").exists()
+
+    def test_should_export_ndjson_like_the_api(self):
+        # When
+        path = self.export("careers.jsonl", row_group_size=2)
+
+        # Then
+        exported = [json.loads(line) for line in path.read_text().splitlines()]
+        expected = ListCareerSerializer(
+            [CareerModel.objects.get(id=item["id"]) for item in exported],
+            many=True,
+        ).data
+
+        assert len(exported) == 3
+        assert exported == expected
+
+    def test_should_reject_invalid_datetimes(self):
+        # When / Then
+        with self.assertRaisesMessage(CommandError, "--since"):
+            self.export("careers.csv", since="yesterday")
+
+    @skipUnless(pyarrow, "pyarrow is not installed")
+    def test_should_write_a_row_group_per_batch_to_parquet(self):
+        # When
+        path = self.export("careers.parquet", row_group_size=2)
+
+        # Then
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        table = parquet_file.read()
+
+        assert parquet_file.num_row_groups == 2
+        assert sorted(table.column("username").to_pylist()) == [
+            "user1",
+            "user2",
+            "user3",
+        ]
+
+
+class GroupCommitTest(TestCase):
+
+    def save_concurrently(self, committer, usernames) -> dict:
+        saved = {}
+
+        def save(username):
+            saved[username] = committer.save_career(
+                Career(username=username, title="title", content="content")
+            )
+
+        threads = [
+            threading.Thread(target=save, args=(username,))
+            for username in usernames
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return saved
+
+    @staticmethod
+    def save_careers(careers, batch_size):
+        if any(career.username == "bad" for career in careers):
+            return None
+
+        return [
+            Career(
+                id=index,
+                created_datetime=datetime.now(dt_timezone.utc),
+                username=career.username,
+                title=career.title,
+                content=career.content,
+            )
+            for index, career in enumerate(careers, 1)
+        ]
+
+    def test_should_insert_a_full_batch_at_once(self):
+        # Given
+        committer = GroupCommitter(CareerRepository(), 3, max_delay=60)
+
+        # When
+        with patch.object(
+            CareerRepository, "save_careers", side_effect=self.save_careers
+        ) as save_careers:
+            saved = self.save_concurrently(committer, ["a", "b", "c"])
+
+        # Then
+        save_careers.assert_called_once()
+        assert {career.username for career in saved.values()} == {
+            "a",
+            "b",
+            "c",
+        }
+        assert all(
+            career.username == username and career.id is not None
+            for username, career in saved.items()
+        )
+
+    def test_should_insert_a_partial_batch_after_the_delay(self):
+        # Given
+        committer = GroupCommitter(CareerRepository(), 100, max_delay=0.01)
+
+        # When
+        with patch.object(
+            CareerRepository, "save_careers", side_effect=self.save_careers
+        ) as save_careers:
+            saved = self.save_concurrently(committer, ["a"])
+
+        # Then
+        save_careers.assert_called_once()
+        assert saved["a"].id == 1
+
+    def test_should_fail_only_the_bad_career_of_a_batch(self):
+        # Given
+        committer = GroupCommitter(CareerRepository(), 3, max_delay=60)
+
+        # When
+        with patch.object(
+            CareerRepository, "save_careers", side_effect=self.save_careers
+        ) as save_careers:
+            saved = self.save_concurrently(committer, ["a", "bad", "c"])
+
+        # Then
+        assert save_careers.call_count == 4
+        assert saved["bad"] is None
+        assert saved["a"].username == "a"
+        assert saved["c"].username == "c"
+
+    @override_settings(CAREERS_GROUP_COMMIT=True)
+    def test_should_create_careers_with_group_commit(self):
+        # When
+        response = APIClient().post(
+            "/careers/",
+            {"username": "username", "title": "title", "content": "content"},
+            format="json",
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_201_CREATED
+        assert CareerModel.objects.filter(username="username").exists()
+
+    @override_settings(
+        CAREERS_GROUP_COMMIT=True,
+        CAREERS_GROUP_COMMIT_MAX_BATCH_SIZE=7,
+        CAREERS_GROUP_COMMIT_MAX_DELAY_MS=500,
+    )
+    def test_should_group_commit_with_the_current_settings(self):
+        # When
+        with patch.object(
+            GroupCommitter, "save_career", autospec=True, return_value=None
+        ) as save_career:
+            APIClient().post(
+                "/careers/",
+                {"username": "username", "title": "title", "content": "c"},
+                format="json",
+            )
+
+        # Then
+        committer = save_career.call_args.args[0]
+        assert (committer.max_batch_size, committer.max_delay) == (7, 0.5)
+
+
+class CareerEncodingTest(TestCase):
+
+    def test_encoder_should_match_list_serializer_output(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title \u2028", content="content"
+        )
+        career = Career(
+            id=career_model.id,
+            created_datetime=career_model.created_datetime,
+            username=career_model.username,
+            title=career_model.title,
+            content=career_model.content,
+        )
+
+        # When
+        encoded = CareerEncoder(ListCareerSerializer.Meta.fields)(career)
+
+        # Then
+        expected = ListCareerSerializer(career).data
+
+        assert encoded == expected
+        assert CareerJSONRenderer().render([encoded]) == JSONRenderer().render(
+            [expected]
+        )
+
+    def test_career_from_row_should_have_every_slot(self):
+        # Given
+        created_datetime = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+        # When
+        career = Career.from_row(
+            (1, "username", created_datetime, "title", "content")
+        )
+
+        # Then
+        assert not hasattr(career, "__dict__")
+        assert career.id == 1
+        assert career.username == "username"
+        assert career.created_datetime == created_datetime
+        assert (career.title, career.content) == ("title", "content")
+
+
+class LoggingTest(TestCase):
+
+    def record(self, level, msg, *args, **extra):
+        record = logging.LogRecord(
+            "app.views", level, __file__, 0, msg, args, None
+        )
+        record.__dict__.update(extra)
+        return record
+
+    def test_background_handler_should_write_json_lines(self):
+        # Given
+        stream = StringIO()
+        handler = BackgroundHandler(stream=stream)
+        arguments = {"title": "title"}
+
+        # When
+        handler.handle(
+            self.record(logging.INFO, "Career created. %s", arguments, id=1)
+        )
+        arguments["title"] = "changed"
+        handler.close()
+
+        # Then
+        line = json.loads(stream.getvalue())
+
+        assert line["level"] == "INFO"
+        assert line["logger"] == "app.views"
+        assert line["message"] == "Career created. {'title': 'title'}"
+        assert line["id"] == 1
+
+    def test_background_handler_should_drop_records_when_queue_is_full(self):
+        # Given
+        handler = BackgroundHandler(queue_size=1, stream=StringIO())
+        handler.close()
+
+        # When
+        for _ in range(3):
+            handler.handle(self.record(logging.ERROR, "Error"))
+
+        # Then
+        assert handler.dropped == 2
+
+    @override_settings(CAREERS_LOG_INFO_SAMPLE_RATE=0)
+    def test_sampled_logger_should_not_create_left_out_records(self):
+        # Given
+        logging.disable(logging.NOTSET)
+        self.addCleanup(logging.disable, logging.CRITICAL)
+        logger = SampledLogger(logging.getLogger("app.views"))
+
+        # When
+        with patch.object(logging.Logger, "makeRecord") as make_record:
+            with patch("app.log.random.random", return_value=0.5):
+                logger.info("Info")
+                kept_warning = logger.isEnabledFor(logging.WARNING)
+                with self.settings(CAREERS_LOG_INFO_SAMPLE_RATE=0.6):
+                    kept_half = logger.isEnabledFor(logging.INFO)
+
+        # Then
+        make_record.assert_not_called()
+        assert kept_warning
+        assert kept_half
+
+
+class CompressionTest(TestCase):
+
+    def setUp(self):
+        for index in range(5):
+            CareerModel.objects.create(
+                username="username",
+                title=f"title {index}",
+                content="Lorem ipsum dolor sit amet. " * 20,
+            )
+
+    def test_should_compress_large_responses_with_accepted_encoding(self):
+        # When
+        plain_response = self.client.get("/careers/")
+        response = self.client.get(
+            "/careers/", HTTP_ACCEPT_ENCODING="br;q=0.5, gzip, identity"
+        )
+
+        # Then
+        assert "Content-Encoding" not in plain_response
+        assert response["Content-Encoding"] == "gzip"
+        assert response["Vary"].endswith("Accept-Encoding")
+        assert response["ETag"] == plain_response["ETag"][:-1] + '-gzip"'
+        assert int(response["Content-Length"]) == len(response.content)
+        assert len(response.content) < len(plain_response.content)
+        assert gzip.decompress(response.content) == plain_response.content
+
+    def test_should_not_compress_responses_below_the_size_limit(self):
+        # When
+        response = self.client.get(
+            "/careers/?fields=id", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        # Then
+        assert "Content-Encoding" not in response
+        assert response.json()["results"][0] == {"id": 1}
+
+    def test_should_compress_streamed_exports_chunk_by_chunk(self):
+        # When
+        plain_response = self.client.get("/careers/export/")
+        response = self.client.get(
+            "/careers/export/", HTTP_ACCEPT_ENCODING="gzip"
+        )
+
+        # Then
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(
+            b"".join(response.streaming_content)
+        ) == b"".join(plain_response.streaming_content)
+
+    def test_should_not_modify_compressed_list_with_its_etag(self):
+        # Given
+        etag = self.client.get("/careers/", HTTP_ACCEPT_ENCODING="gzip")[
+            "ETag"
+        ]
+
+        # When
+        response = self.client.get(
+            "/careers/", HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=etag
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response["ETag"] == etag
+
+    def test_should_negotiate_encoding_by_quality_and_preference(self):
+        # Given
+        encodings = ["zstd", "br", "gzip"]
+
+        # When
+        negotiated = [
+            negotiate(accept_encoding, encodings)
+            for accept_encoding in (
+                "gzip;q=0.8, unknown",
+                "*",
+                "gzip;q=0",
+                "",
+            )
+        ]
+
+        # Then
+        assert negotiated == [
+            "gzip",
+            next(encoding for encoding in encodings if encoding in CODECS),
+            None,
+            None,
+        ]
+
+
+class BinaryFormatsTest(TestCase):
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_should_list_careers_as_msgpack_with_native_datetimes(self):
+        # Given
+        career_model = CareerModel.objects.create(
+            username="username", title="title", content="content"
+        )
+
+        # When
+        response = self.client.get(
+            "/careers/", HTTP_ACCEPT="application/msgpack"
+        )
+
+        # Then
+        data = msgpack.unpackb(response.content, timestamp=3)
+
+        assert response["Content-Type"] == "application/msgpack"
+        assert data["results"] == [
+            {
+                "id": career_model.id,
+                "username": "username",
+                "created_datetime": career_model.created_datetime,
+                "title": "title",
+                "content": "content",
+            }
+        ]
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_should_create_and_update_career_from_msgpack(self):
+        # When
+        create_response = self.client.post(
+            "/careers/",
+            msgpack.packb(
+                {"username": "username", "title": "title", "content": "c"}
+            ),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+        update_response = self.client.patch(
+            "/careers/1/",
+            msgpack.packb({"title": "new title", "content": "new"}),
+            content_type="application/msgpack",
+            HTTP_ACCEPT="application/msgpack",
+        )
+
+        # Then
+        updated = msgpack.unpackb(update_response.content, timestamp=3)
+
+        assert create_response.status_code == status.HTTP_201_CREATED
+        assert update_response.status_code == status.HTTP_200_OK
+        assert updated["title"] == "new title"
+        assert isinstance(updated["created_datetime"], datetime)
+
+    @skipUnless(msgpack, "msgpack is not installed")
+    def test_should_not_create_career_from_malformed_msgpack(self):
+        # When
+        response = self.client.post(
+            "/careers/", b"\xc1", content_type="application/msgpack"
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @skipUnless(cbor2, "cbor2 is not installed")
+    def test_should_bulk_create_careers_from_cbor(self):
+        # Given
+        items = [
+            {"username": "username", "title": f"title {index}", "content": "c"}
+            for index in range(3)
+        ]
+
+        # When
+        response = self.client.post(
+            "/careers/bulk/",
+            cbor2.dumps(items),
+            content_type="application/cbor",
+            HTTP_ACCEPT="application/cbor",
+        )
+
+        # Then
+        assert response.status_code == status.HTTP_201_CREATED
+        assert cbor2.loads(response.content)["created"] == 3
+        assert CareerModel.objects.count() == 3
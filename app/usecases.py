@@ -1,13 +1,35 @@
+from functools import lru_cache
+from itertools import groupby
+from typing import Iterable, Optional, Union
+
+from django.conf import settings
+from django.db import transaction
+
+from app.group_commit import GroupCommitter
 from app.repositories import CareerRepository
-from app.domain import Career
+from app.domain import Career, CareerOutcome, CareerQuery, Precondition
 from app.results import (
+    BatchCareersResult,
+    BulkCreateCareersResult,
+    CareerItemResult,
     CreateCareerResult,
     ListCareersResult,
+    RetrieveCareerResult,
     UpdateCareerResult,
     DeleteCareerResult,
+    ExportCareersResult,
 )
 
 
+@lru_cache
+def group_committer(max_batch_size: int, max_delay: float) -> GroupCommitter:
+    """
+    The GroupCommitter of the process for these settings, built on first
+    use instead of from the settings at import time.
+    """
+    return GroupCommitter(CareerRepository(), max_batch_size, max_delay)
+
+
 class CreateCareerUseCase:
     repository = CareerRepository()
 
@@ -15,40 +37,201 @@ class CreateCareerUseCase:
         self.__career = career
 
     def run(self):
-        career = self.repository.save_career(self.__career)
+        if settings.CAREERS_GROUP_COMMIT:
+            committer = group_committer(
+                settings.CAREERS_GROUP_COMMIT_MAX_BATCH_SIZE,
+                settings.CAREERS_GROUP_COMMIT_MAX_DELAY_MS / 1000,
+            )
+            return self.__result(committer.save_career(self.__career))
+
+        return self.__result(self.repository.save_career(self.__career))
 
+    async def arun(self) -> CreateCareerResult:
+        return self.__result(await self.repository.asave_career(self.__career))
+
+    @staticmethod
+    def __result(career: Optional[Career]) -> CreateCareerResult:
         if career:
             return CreateCareerResult("success", career)
 
         return CreateCareerResult("failure")
 
 
+class BulkCreateCareersUseCase:
+    repository = CareerRepository()
+
+    def __init__(
+        self,
+        batches: Iterable[list[tuple[int, Optional[Career], Optional[dict]]]],
+        batch_size: int,
+    ):
+        self.__batches = batches
+        self.__batch_size = batch_size
+
+    def run(self) -> BulkCreateCareersResult:
+        items = []
+
+        for batch in self.__batches:
+            valid = [(index, career) for index, career, _ in batch if career]
+            # Saving nothing would still invalidate the cache.
+            saved = (
+                self.repository.save_careers(
+                    [career for _, career in valid], self.__batch_size
+                )
+                if valid
+                else []
+            )
+
+            if saved is None:
+                items.extend(
+                    CareerItemResult(index, "failure") for index, _ in valid
+                )
+            else:
+                items.extend(
+                    CareerItemResult(index, "success", career)
+                    for (index, _), career in zip(valid, saved)
+                )
+
+            items.extend(
+                CareerItemResult(index, "invalid", errors=errors)
+                for index, career, errors in batch
+                if career is None
+            )
+
+        items.sort(key=lambda item: item.index)
+        return BulkCreateCareersResult("success", items)
+
+
 class ListCareerUseCase:
     repository = CareerRepository()
 
+    def __init__(self, query: Optional[CareerQuery] = None):
+        self.__query = query or CareerQuery()
+
     def run(self) -> ListCareersResult:
-        career_list = self.repository.list_careers()
+        if self.__query.q:
+            career_page = self.repository.search_careers(self.__query)
+        else:
+            career_page = self.repository.list_careers(self.__query)
+
+        return self.__result(career_page)
+
+    async def arun(self) -> ListCareersResult:
+        if self.__query.q:
+            career_page = await self.repository.asearch_careers(self.__query)
+        else:
+            career_page = await self.repository.alist_careers(self.__query)
 
-        if career_list is not None:
-            return ListCareersResult("success", career_list)
+        return self.__result(career_page)
+
+    @staticmethod
+    def __result(career_page) -> ListCareersResult:
+        if career_page is not None:
+            return ListCareersResult("success", career_page)
 
         return ListCareersResult("failure")
 
 
+class ExportCareersUseCase:
+    repository = CareerRepository()
+
+    def __init__(self, chunk_size: int):
+        self.__chunk_size = chunk_size
+
+    def run(self) -> ExportCareersResult:
+        careers = self.repository.iter_careers(self.__chunk_size)
+
+        if careers is not None:
+            return ExportCareersResult("success", careers)
+
+        return ExportCareersResult("failure")
+
+
+class RetrieveCareerUseCase:
+    repository = CareerRepository()
+
+    def run(
+        self,
+        id: Optional[int],
+        career: Union[Career, CareerOutcome, None] = None,
+    ) -> RetrieveCareerResult:
+        """
+        career is the outcome already loaded for the request's ETag, if
+        any, so the row is not read twice.
+        """
+        if id is None:
+            return RetrieveCareerResult("not_found")
+
+        if career is None:
+            career = self.repository.get_career_by_id(id)
+        return self.__result(career)
+
+    async def arun(
+        self,
+        id: Optional[int],
+        career: Union[Career, CareerOutcome, None] = None,
+    ) -> RetrieveCareerResult:
+        if id is None:
+            return RetrieveCareerResult("not_found")
+
+        if career is None:
+            career = await self.repository.aget_career_by_id(id)
+        return self.__result(career)
+
+    @staticmethod
+    def __result(career) -> RetrieveCareerResult:
+        if career is None:
+            return RetrieveCareerResult("failure")
+
+        if career is CareerOutcome.NOT_FOUND:
+            return RetrieveCareerResult("not_found")
+
+        return RetrieveCareerResult("success", career)
+
+
 class UpdataCareerUseCase:
     repository = CareerRepository()
 
-    def __init__(self, career: Career):
+    def __init__(
+        self, career: Career, precondition: Optional[Precondition] = None
+    ):
         self.__career = career
+        self.__precondition = precondition
 
     def run(self) -> UpdateCareerResult:
-        career = self.repository.update_career(self.__career)
+        if self.__career.id is None:
+            return self.__missing_result()
+
+        return self.__result(
+            self.repository.update_career(self.__career, self.__precondition)
+        )
+
+    async def arun(self) -> UpdateCareerResult:
+        if self.__career.id is None:
+            return self.__missing_result()
 
-        if not career:
+        return self.__result(
+            await self.repository.aupdate_career(
+                self.__career, self.__precondition
+            )
+        )
+
+    def __missing_result(self) -> UpdateCareerResult:
+        if self.__precondition is not None and not self.__precondition(None):
+            return UpdateCareerResult("precondition_failed")
+
+        return UpdateCareerResult("not_found")
+
+    @staticmethod
+    def __result(career) -> UpdateCareerResult:
+        if career is None:
             return UpdateCareerResult("failure")
 
-        if not hasattr(career, "id"):
-            return UpdateCareerResult("failure", career)
+        if career is CareerOutcome.PRECONDITION_FAILED:
+            return UpdateCareerResult("precondition_failed")
+
+        if career is CareerOutcome.NOT_FOUND:
+            return UpdateCareerResult("not_found")
 
         return UpdateCareerResult("success", career)
 
@@ -56,18 +239,126 @@ class UpdataCareerUseCase:
 class DeleteCareerUseCase:
     repository = CareerRepository()
 
-    def run(self, id: int) -> DeleteCareerResult:
-        career = self.repository.get_career_by_id(id)
+    def run(
+        self, id: Optional[int], precondition: Optional[Precondition] = None
+    ) -> DeleteCareerResult:
+        if id is None:
+            return self.__missing_result(precondition)
 
-        if career is None:
-            return DeleteCareerResult("failure")
+        return self.__result(self.repository.delete_career(id, precondition))
 
-        if not hasattr(career, "id"):
-            return DeleteCareerResult("failure", career)
+    async def arun(
+        self, id: Optional[int], precondition: Optional[Precondition] = None
+    ) -> DeleteCareerResult:
+        if id is None:
+            return self.__missing_result(precondition)
 
-        id = self.repository.delete_career(career)
+        return self.__result(
+            await self.repository.adelete_career(id, precondition)
+        )
 
-        if id is None:
+    @staticmethod
+    def __missing_result(
+        precondition: Optional[Precondition],
+    ) -> DeleteCareerResult:
+        if precondition is not None and not precondition(None):
+            return DeleteCareerResult("precondition_failed")
+
+        return DeleteCareerResult("not_found")
+
+    @staticmethod
+    def __result(deleted) -> DeleteCareerResult:
+        if deleted is None:
             return DeleteCareerResult("failure")
 
+        if deleted is CareerOutcome.PRECONDITION_FAILED:
+            return DeleteCareerResult("precondition_failed")
+
+        if deleted is CareerOutcome.NOT_FOUND:
+            return DeleteCareerResult("not_found")
+
         return DeleteCareerResult("success")
+
+
+class BatchCareersUseCase:
+    """
+    Runs create, update and delete operations in one transaction. Each run
+    of consecutive operations of the same kind becomes set-based SQL.
+    """
+
+    repository = CareerRepository()
+
+    def __init__(
+        self, operations: list[tuple[str, Optional[int], Optional[Career]]]
+    ):
+        self.__operations = operations
+
+    def run(self) -> BatchCareersResult:
+        handlers = {
+            "create": self.__create,
+            "update": self.__update,
+            "delete": self.__delete,
+        }
+        items = []
+
+        with transaction.atomic():
+            for op, run in groupby(
+                enumerate(self.__operations), key=lambda item: item[1][0]
+            ):
+                run_items = handlers[op](
+                    [(index, id, career) for index, (_, id, career) in run]
+                )
+
+                if run_items is None:
+                    transaction.set_rollback(True)
+                    return BatchCareersResult("failure")
+
+                items.extend(run_items)
+
+        return BatchCareersResult("success", items)
+
+    def __create(self, run) -> Optional[list[CareerItemResult]]:
+        careers = self.repository.save_careers(
+            [career for _, _, career in run], settings.CAREERS_BULK_BATCH_SIZE
+        )
+
+        if careers is None:
+            return None
+
+        return [
+            CareerItemResult(index, "created", career)
+            for (index, _, _), career in zip(run, careers)
+        ]
+
+    def __update(self, run) -> Optional[list[CareerItemResult]]:
+        # The last update of a Career wins, as it would with separate calls.
+        latest = {id: career for _, id, career in run}
+        found_ids = self.repository.update_careers(list(latest.values()))
+
+        if found_ids is None:
+            return None
+
+        return [
+            CareerItemResult(
+                index, "updated" if id in found_ids else "not_found"
+            )
+            for index, id, _ in run
+        ]
+
+    def __delete(self, run) -> Optional[list[CareerItemResult]]:
+        found_ids = self.repository.delete_careers(
+            list(dict.fromkeys(id for _, id, _ in run))
+        )
+
+        if found_ids is None:
+            return None
+
+        items = []
+        for index, id, _ in run:
+            if id in found_ids:
+                found_ids.discard(id)
+                items.append(CareerItemResult(index, "deleted"))
+            else:
+                items.append(CareerItemResult(index, "not_found"))
+
+        return items
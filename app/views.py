@@ -1,25 +1,86 @@
 import logging
-
+from typing import Optional
+
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from app.conditional import (
+    ASYNC_FORMAT,
+    acareer_condition,
+    acareers_condition,
+    accepted_format,
+    astored_career,
+    career_condition,
+    career_etag,
+    careers_condition,
+    stored_career,
+    write_precondition,
+)
+from app.log import SampledLogger
+from app.metrics import registry, timed
+from app.parsers import BINARY_PARSER_CLASSES
+from app.renderers import BINARY_RENDERER_CLASSES, dumps
+from app.stats import service_stats
 from app.usecases import (
+    BatchCareersUseCase,
+    BulkCreateCareersUseCase,
     ListCareerUseCase,
     CreateCareerUseCase,
+    ExportCareersUseCase,
+    RetrieveCareerUseCase,
     UpdataCareerUseCase,
     DeleteCareerUseCase,
 )
-from app.app_requests import CreateCareerRequest, UpdateCareerRequest
+from app.app_requests import (
+    BatchCareersRequest,
+    BulkCreateCareersRequest,
+    CreateCareerRequest,
+    DeleteCareerRequest,
+    ExportCareersRequest,
+    ListCareersRequest,
+    RetrieveCareerRequest,
+    UpdateCareerRequest,
+)
 from app.responses import (
+    BatchCareersResponse,
+    BulkCreateCareersResponse,
     ListCareersResponse,
     CreateCareerResponse,
+    ExportCareersResponse,
+    RetrieveCareerResponse,
     UpdateCareerResponse,
     DeleteCareerResponse,
 )
 
 
-logger = logging.getLogger(__name__)
+logger = SampledLogger(logging.getLogger(__name__))
+
+# JSON stays the default, MessagePack and CBOR are negotiated when installed.
+CAREER_RENDERER_CLASSES = [
+    *api_settings.DEFAULT_RENDERER_CLASSES,
+    *BINARY_RENDERER_CLASSES,
+]
+CAREER_PARSER_CLASSES = [
+    *api_settings.DEFAULT_PARSER_CLASSES,
+    *BINARY_PARSER_CLASSES,
+]
+
+
+def native_datetimes(req: Request) -> bool:
+    """
+    Whether the accepted renderer encodes datetimes as its own type.
+    """
+    renderer = getattr(req, "accepted_renderer", None)
+    return getattr(renderer, "native_datetimes", False)
 
 
 class ListCreateCareerView(APIView):
@@ -27,15 +88,34 @@ class ListCreateCareerView(APIView):
     View to list and create Carrers
     """
 
+    renderer_classes = CAREER_RENDERER_CLASSES
+    parser_classes = CAREER_PARSER_CLASSES
+
+    @careers_condition
     def get(self, req: Request):
         """
-        Method to list all Careers
+        Method to list Careers, one cursor page at a time
         """
-        usecase = ListCareerUseCase()
+        request = ListCareersRequest(req)
+
+        if not request.is_data_valid():
+            errors = request.validation_error_messages
+
+            logger.error("Query parameters validation error %s", errors)
+
+            return Response(errors, request.status)
+
+        query = request.query
+        usecase = ListCareerUseCase(query)
 
         result = usecase.run()
 
-        response = ListCareersResponse(result)
+        response = ListCareersResponse(
+            result,
+            req.build_absolute_uri(),
+            query.fields,
+            native_datetimes(req),
+        )
 
         if response.is_success:
 
@@ -44,7 +124,7 @@ class ListCreateCareerView(APIView):
             return Response(response.data, response.status)
 
         logger.error(
-            f"Error when trying to list all Careers. {str(req)}. {str(response.data)}"
+            "Error when trying to list all Careers. %s. %s", req, response.data
         )
 
         return Response(response.data, response.status)
@@ -58,7 +138,7 @@ class ListCreateCareerView(APIView):
         if not request.is_data_valid():
             errors = request.validation_error_messages
 
-            logger.error(f"Data validation error {str(errors)}")
+            logger.error("Data validation error %s", errors)
 
             return Response(errors, request.status)
 
@@ -69,69 +149,466 @@ class ListCreateCareerView(APIView):
         response = CreateCareerResponse(result)
 
         if response.is_success:
-            logger.info("Career created successfully.", str(response.data))
+            logger.info("Career created successfully.")
+
+            return Response(response.data, response.status)
+
+        logger.error(
+            "Error while trying to create a new Career: %s", response.data
+        )
+
+        return Response(response.data, response.status)
+
+
+class BulkCreateCareersView(APIView):
+    """
+    View to create many Careers from a JSON array or an NDJSON stream
+    """
+
+    renderer_classes = CAREER_RENDERER_CLASSES
+    parser_classes = CAREER_PARSER_CLASSES
+
+    def post(self, req: Request):
+        request = BulkCreateCareersRequest(req)
+
+        if not request.is_data_valid():
+            errors = request.validation_error_messages
+
+            logger.error("Bulk create validation error %s", errors)
+
+            return Response(errors, request.status)
+
+        usecase = BulkCreateCareersUseCase(
+            request.batches(), request.batch_size
+        )
+
+        result = usecase.run()
+
+        response = BulkCreateCareersResponse(result)
+
+        if response.status == status.HTTP_201_CREATED:
+            logger.info("Careers created in bulk: %s", response.created_count)
 
             return Response(response.data, response.status)
 
         logger.error(
-            f"Error while trying to create a new Career: {str(response.data)}"
+            "Bulk create finished with failures. Created: %s",
+            response.created_count,
         )
 
         return Response(response.data, response.status)
 
 
+class BatchCareersView(APIView):
+    """
+    View to run a list of create, update and delete operations atomically
+    """
+
+    renderer_classes = CAREER_RENDERER_CLASSES
+    parser_classes = CAREER_PARSER_CLASSES
+
+    def post(self, req: Request):
+        request = BatchCareersRequest(req)
+
+        if not request.is_data_valid():
+            errors = request.validation_error_messages
+
+            logger.error("Batch validation error %s", errors)
+
+            return Response(errors, request.status)
+
+        usecase = BatchCareersUseCase(request.operations)
+
+        result = usecase.run()
+
+        response = BatchCareersResponse(result)
+
+        if response.is_success:
+            logger.info("Career batch committed successfully.")
+
+            return Response(response.data, response.status)
+
+        logger.error("Error while trying to run a Career batch.")
+
+        return Response(response.data, response.status)
+
+
+class ExportCareersView(APIView):
+    """
+    View to stream every Career as NDJSON or as a JSON array
+    """
+
+    def perform_content_negotiation(self, request, force=False):
+        # The stream is not rendered by DRF, so any Accept header is fine.
+        return super().perform_content_negotiation(request, force=True)
+
+    def get(self, req: Request):
+        request = ExportCareersRequest(req)
+
+        if not request.is_data_valid():
+            errors = request.validation_error_messages
+
+            logger.error("Query parameters validation error %s", errors)
+
+            return Response(errors, request.status)
+
+        usecase = ExportCareersUseCase(request.chunk_size)
+
+        result = usecase.run()
+
+        response = ExportCareersResponse(result, request.output)
+
+        if response.is_success:
+            logger.info("Career export started.")
+
+            return StreamingHttpResponse(
+                (
+                    response.astream
+                    if isinstance(req._request, ASGIRequest)
+                    else response.stream
+                ),
+                status=response.status,
+                content_type=response.content_type,
+            )
+
+        logger.error("Error when trying to export all Careers.")
+
+        return Response(response.data, response.status)
+
+
 class UpdateDeleteCareerView(APIView):
     """
-    View to update or delete a Career
+    View to retrieve, update or delete a Career
     """
 
+    renderer_classes = CAREER_RENDERER_CLASSES
+    parser_classes = CAREER_PARSER_CLASSES
+
+    @career_condition
+    def get(self, req: Request, pk: str) -> Response:
+        request = RetrieveCareerRequest(req, pk)
+
+        usecase = RetrieveCareerUseCase()
+
+        result = usecase.run(request.id, stored_career(req, pk))
+
+        response = RetrieveCareerResponse(result, native_datetimes(req))
+
+        if response.is_success:
+            logger.info("Career retrieved successfully. Id: %s", pk)
+
+            return Response(response.data, response.status)
+
+        if response.is_not_found:
+            logger.info("Could not find career with id: %s", pk)
+
+            return Response(response.data, response.status)
+
+        logger.error("Error while trying to retrieve career with id: %s", pk)
+
+        return Response(response.data, response.status)
+
     def patch(self, req: Request, pk: str) -> Response:
         request = UpdateCareerRequest(req, pk)
 
         if not request.is_data_valid():
             logger.error(
-                f"Data validation error: {str(request.validation_error_messages)}"
+                "Data validation error: %s", request.validation_error_messages
             )
 
             return Response(request.validation_error_messages, request.status)
 
-        usecase = UpdataCareerUseCase(request.career_to_be_updated)
+        usecase = UpdataCareerUseCase(
+            request.career_to_be_updated,
+            write_precondition(req, accepted_format(req)),
+        )
 
         result = usecase.run()
 
-        response = UpdateCareerResponse(result)
+        response = UpdateCareerResponse(result, native_datetimes(req))
 
         if response.is_success:
-            logger.info(f"Career updated successfully. Id: {pk}")
+            logger.info("Career updated successfully. Id: %s", pk)
+
+            return Response(
+                response.data,
+                response.status,
+                headers={
+                    "ETag": career_etag(response.career, accepted_format(req))
+                },
+            )
+
+        if response.is_not_found:
+            logger.info("Could not find career to be update with id: %s", pk)
 
             return Response(response.data, response.status)
 
-        if response.is_not_found:
-            logger.info(f"Could not find career to be update with id: {pk}")
+        if response.is_precondition_failed:
+            logger.info("Career to be updated changed. Id: %s", pk)
 
             return Response(response.data, response.status)
 
-        logger.error(f"Error while trying to update career with id: {pk}")
+        logger.error("Error while trying to update career with id: %s", pk)
 
         return Response(response.data, response.status)
 
     def delete(self, req: Request, pk: str) -> Response:
+        request = DeleteCareerRequest(req, pk)
+
         usecase = DeleteCareerUseCase()
 
-        result = usecase.run(pk)
+        result = usecase.run(
+            request.id, write_precondition(req, accepted_format(req))
+        )
 
         response = DeleteCareerResponse(result)
 
         if response.is_success:
-            logger.info(f"Career deleted successfully. Id: {pk}")
+            logger.info("Career deleted successfully. Id: %s", pk)
 
             return Response(response.data, response.status)
 
         if response.is_not_found:
-            logger.info(f"Could not find career to be deleted with id: {pk}")
+            logger.info("Could not find career to be deleted with id: %s", pk)
+
+            return Response(response.data, response.status)
+
+        if response.is_precondition_failed:
+            logger.info("Career to be deleted changed. Id: %s", pk)
 
             return Response(response.data, response.status)
 
-        logger.error(f"Error while trying to delete career with id: {pk}")
+        logger.error("Error while trying to delete career with id: %s", pk)
 
         return Response(response.data, response.status)
+
+
+class StatsView(APIView):
+    """
+    View with this worker process' database pool and cache statistics, to
+    size the pool and the cache
+    """
+
+    def get(self, req: Request) -> Response:
+        return Response(service_stats(), status.HTTP_200_OK)
+
+
+class MetricsView(View):
+    """
+    View with the request metrics of this worker process in the Prometheus
+    text format
+    """
+
+    def get(self, req: HttpRequest) -> HttpResponse:
+        return HttpResponse(
+            registry.render(),
+            content_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+
+def api_request(req: HttpRequest) -> Request:
+    """
+    DRF Request around the request of an async view, so the app_requests
+    wrappers parse and validate it as they do for APIViews.
+    """
+    return Request(
+        req,
+        parsers=[parser() for parser in api_settings.DEFAULT_PARSER_CLASSES],
+    )
+
+
+def json_response(
+    data, status_code: int, headers: Optional[dict] = None
+) -> HttpResponse:
+    if status_code == status.HTTP_204_NO_CONTENT:
+        return HttpResponse(status=status_code, headers=headers)
+
+    with timed("serialization"):
+        content = dumps(data)
+
+    return HttpResponse(
+        content,
+        status=status_code,
+        content_type="application/json",
+        headers=headers,
+    )
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncListCreateCareerView(View):
+    """
+    Async view to list and create Careers, rendering JSON only
+    """
+
+    @acareers_condition
+    async def get(self, req: HttpRequest) -> HttpResponse:
+        request = ListCareersRequest(api_request(req))
+
+        if not request.is_data_valid():
+            errors = request.validation_error_messages
+
+            logger.error("Query parameters validation error %s", errors)
+
+            return json_response(errors, request.status)
+
+        query = request.query
+        usecase = ListCareerUseCase(query)
+
+        result = await usecase.arun()
+
+        response = ListCareersResponse(
+            result, req.build_absolute_uri(), query.fields
+        )
+
+        if response.is_success:
+            logger.info("Career list retreived successfully.")
+
+            return json_response(response.data, response.status)
+
+        logger.error(
+            "Error when trying to list all Careers. %s. %s", req, response.data
+        )
+
+        return json_response(response.data, response.status)
+
+    async def post(self, req: HttpRequest) -> HttpResponse:
+        request = CreateCareerRequest(api_request(req))
+
+        try:
+            is_data_valid = request.is_data_valid()
+        except APIException as e:
+            return json_response({"detail": e.detail}, e.status_code)
+
+        if not is_data_valid:
+            errors = request.validation_error_messages
+
+            logger.error("Data validation error %s", errors)
+
+            return json_response(errors, request.status)
+
+        usecase = CreateCareerUseCase(request.career_to_be_created)
+
+        result = await usecase.arun()
+
+        response = CreateCareerResponse(result)
+
+        if response.is_success:
+            logger.info("Career created successfully.")
+
+            return json_response(response.data, response.status)
+
+        logger.error(
+            "Error while trying to create a new Career: %s", response.data
+        )
+
+        return json_response(response.data, response.status)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncUpdateDeleteCareerView(View):
+    """
+    Async view to retrieve, update or delete a Career, rendering JSON only
+    """
+
+    @acareer_condition
+    async def get(self, req: HttpRequest, pk: str) -> HttpResponse:
+        request = RetrieveCareerRequest(req, pk)
+
+        usecase = RetrieveCareerUseCase()
+
+        result = await usecase.arun(request.id, await astored_career(req, pk))
+
+        response = RetrieveCareerResponse(result)
+
+        if response.is_success:
+            logger.info("Career retrieved successfully. Id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        if response.is_not_found:
+            logger.info("Could not find career with id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        logger.error("Error while trying to retrieve career with id: %s", pk)
+
+        return json_response(response.data, response.status)
+
+    async def patch(self, req: HttpRequest, pk: str) -> HttpResponse:
+        request = UpdateCareerRequest(api_request(req), pk)
+
+        try:
+            is_data_valid = request.is_data_valid()
+        except APIException as e:
+            return json_response({"detail": e.detail}, e.status_code)
+
+        if not is_data_valid:
+            logger.error(
+                "Data validation error: %s", request.validation_error_messages
+            )
+
+            return json_response(
+                request.validation_error_messages, request.status
+            )
+
+        usecase = UpdataCareerUseCase(
+            request.career_to_be_updated,
+            write_precondition(req, ASYNC_FORMAT),
+        )
+
+        result = await usecase.arun()
+
+        response = UpdateCareerResponse(result)
+
+        if response.is_success:
+            logger.info("Career updated successfully. Id: %s", pk)
+
+            return json_response(
+                response.data,
+                response.status,
+                headers={"ETag": career_etag(response.career, ASYNC_FORMAT)},
+            )
+
+        if response.is_not_found:
+            logger.info("Could not find career to be update with id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        if response.is_precondition_failed:
+            logger.info("Career to be updated changed. Id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        logger.error("Error while trying to update career with id: %s", pk)
+
+        return json_response(response.data, response.status)
+
+    async def delete(self, req: HttpRequest, pk: str) -> HttpResponse:
+        request = DeleteCareerRequest(req, pk)
+
+        usecase = DeleteCareerUseCase()
+
+        result = await usecase.arun(
+            request.id, write_precondition(req, ASYNC_FORMAT)
+        )
+
+        response = DeleteCareerResponse(result)
+
+        if response.is_success:
+            logger.info("Career deleted successfully. Id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        if response.is_not_found:
+            logger.info("Could not find career to be deleted with id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        if response.is_precondition_failed:
+            logger.info("Career to be deleted changed. Id: %s", pk)
+
+            return json_response(response.data, response.status)
+
+        logger.error("Error while trying to delete career with id: %s", pk)
+
+        return json_response(response.data, response.status)
@@ -0,0 +1,108 @@
+"""
+Compares the memory and build time of Careers made from row tuples, with
+the former Career, whose attributes lived in a per-instance __dict__, and
+with the slotted one:
+
+    python benchmarks/career_memory.py --rows 100000
+
+Rows are generated, so it needs no database.
+"""
+
+import argparse
+from datetime import datetime, timedelta, timezone
+import gc
+from pathlib import Path
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.domain import Career  # noqa: E402
+
+
+class DictCareer:
+    """
+    Career as it was before it had slots.
+    """
+
+    def __init__(
+        self, title, content, username=None, id=None, created_datetime=None
+    ):
+        self.title = title
+        self.content = content
+
+        if username:
+            self.username = username
+        if id:
+            self.id = id
+        if created_datetime:
+            self.created_datetime = created_datetime
+
+
+def dict_careers(rows: list[tuple]) -> list:
+    return [
+        DictCareer(
+            id=id,
+            created_datetime=created_datetime,
+            username=username,
+            title=title,
+            content=content,
+        )
+        for id, username, created_datetime, title, content in rows
+    ]
+
+
+def slotted_careers(rows: list[tuple]) -> list:
+    return list(map(Career.from_row, rows))
+
+
+def measure(build, rows: list[tuple]) -> tuple[int, int, float, float]:
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    careers = build(rows)
+    elapsed = time.perf_counter() - started
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    started = time.perf_counter()
+    for career in careers:
+        career.id, career.title, career.created_datetime
+    elapsed_reads = time.perf_counter() - started
+
+    del careers
+    return current, peak, elapsed, elapsed_reads
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    created = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        (
+            id,
+            f"user{id % 100}",
+            created + timedelta(seconds=id),
+            f"title {id}",
+            f"content {id}",
+        )
+        for id in range(1, args.rows + 1)
+    ]
+
+    print(f"rows={args.rows}")
+    for name, build in (("dict", dict_careers), ("slots", slotted_careers)):
+        current, peak, elapsed, elapsed_reads = measure(build, rows)
+        print(
+            f"{name:<6} {current / 2**20:8.2f} MiB retained"
+            f"  {peak / 2**20:8.2f} MiB peak"
+            f"  {current / args.rows:6.0f} B/row"
+            f"  build {elapsed * 1000:7.1f} ms"
+            f"  reads {elapsed_reads * 1000:6.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Bytes on the wire and compression time of each available codec and level
+for a rendered careers list page:
+
+    python benchmarks/compression.py --rows 1000 --content-bytes 2000
+
+brotli and zstd are only measured when their packages are installed.
+"""
+
+import argparse
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from app.compression import CODECS  # noqa: E402
+from app.domain import Career  # noqa: E402
+from app.encoders import CareerEncoder  # noqa: E402
+from app.renderers import dumps  # noqa: E402
+from app.serializers import ListCareerSerializer  # noqa: E402
+
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 11), "zstd": (1, 3, 9, 19)}
+WORDS = (
+    "engineer data python django team remote senior product design "
+    "customer platform growth cloud security mobile lead support"
+).split()
+
+
+def make_payload(rows: int, content_bytes: int) -> bytes:
+    """
+    A list page of careers whose content is free text of random words.
+    """
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    careers = []
+    for index in range(rows):
+        content = ""
+        while len(content) < content_bytes:
+            content += rng.choice(WORDS) + " "
+        careers.append(
+            Career(
+                id=index + 1,
+                created_datetime=now,
+                username=f"user{index}",
+                title=f"Career title {index}",
+                content=content,
+            )
+        )
+
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+    return dumps(
+        {"next": None, "previous": None, "results": encoder.many(careers)}
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--content-bytes", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_payload(args.rows, args.content_bytes)
+    print(
+        f"payload {len(payload) / 1024:.1f} KiB, "
+        f"codecs: {', '.join(CODECS)}"
+    )
+
+    for encoding, codec_class in CODECS.items():
+        for level in LEVELS[encoding]:
+            codec = codec_class(level)
+            compressed = codec.compress(payload)
+            best = min(
+                timeit.repeat(
+                    lambda: codec.compress(payload),
+                    number=1,
+                    repeat=args.repeat,
+                )
+            )
+            print(
+                f"{encoding:<5} level {level:<3}"
+                f" {len(compressed) / 1024:9.1f} KiB"
+                f"  ratio {len(payload) / len(compressed):5.1f}"
+                f"  {best * 1000:8.2f} ms"
+                f"  {len(payload) / best / 2**20:8.1f} MiB/s"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Measures the throughput and latency of running servers under many
+concurrent keep-alive clients, e.g. the sync and the async views:
+
+    CAREERS_ASYNC_VIEWS=0 gunicorn --bind 0.0.0.0:8001 setup.asgi:application
+    CAREERS_ASYNC_VIEWS=1 gunicorn --bind 0.0.0.0:8002 setup.asgi:application
+
+    python benchmarks/concurrency.py --clients 500 --duration 30 \\
+        sync=http://localhost:8001/careers/ \\
+        async=http://localhost:8002/careers/
+
+It only needs the standard library, so it can run from any machine.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+
+
+async def client(host: str, port: int, path: str, deadline: float, stats):
+    reader = writer = None
+    request = (
+        f"GET {path} HTTP/1.1\r\nHost: {host}\r\n"
+        "Accept: application/json\r\n\r\n"
+    ).encode()
+
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+
+            writer.write(request)
+            await writer.drain()
+            status, close = await read_response(reader)
+
+        except (OSError, asyncio.IncompleteReadError, ValueError):
+            stats["errors"] += 1
+            writer = close_connection(writer)
+            continue
+
+        stats["latencies"].append(time.perf_counter() - started)
+        if status >= 400:
+            stats["errors"] += 1
+        if close:
+            writer = close_connection(writer)
+
+    close_connection(writer)
+
+
+async def read_response(reader: asyncio.StreamReader) -> tuple[int, bool]:
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split()[1])
+    headers = {
+        name.strip().lower(): value.strip()
+        for name, _, value in (line.partition(":") for line in lines[1:])
+        if name
+    }
+
+    if "content-length" in headers:
+        await reader.readexactly(int(headers["content-length"]))
+    elif headers.get("transfer-encoding") == "chunked":
+        while size := int((await reader.readline()).strip(), 16):
+            await reader.readexactly(size + 2)
+        await reader.readline()
+    else:
+        await reader.read()
+        return status, True
+
+    close = headers.get("connection", "").lower() == "close"
+    return status, close or lines[0].startswith("HTTP/1.0")
+
+
+def close_connection(writer):
+    if writer is not None:
+        writer.close()
+    return None
+
+
+async def run(url: str, clients: int, duration: float) -> dict:
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    stats = {"latencies": [], "errors": 0}
+    deadline = time.perf_counter() + duration
+
+    await asyncio.gather(
+        *(
+            client(parts.hostname, parts.port or 80, path, deadline, stats)
+            for _ in range(clients)
+        )
+    )
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("targets", nargs="+", metavar="NAME=URL")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30)
+    args = parser.parse_args()
+
+    print(f"clients={args.clients} duration={args.duration:g}s")
+    for target in args.targets:
+        name, _, url = target.partition("=")
+        if not url or "://" in name:
+            name, url = target, target
+        stats = asyncio.run(run(url, args.clients, args.duration))
+
+        latencies = sorted(stats["latencies"])
+        if not latencies:
+            print(f"{name:<10} no responses, {stats['errors']} errors")
+            continue
+
+        p50 = statistics.median(latencies)
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:<10} {len(latencies) / args.duration:9.1f} req/s"
+            f"  p50 {p50 * 1000:7.1f} ms  p99 {p99 * 1000:7.1f} ms"
+            f"  errors {stats['errors']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
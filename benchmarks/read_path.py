@@ -0,0 +1,179 @@
+"""
+Compares the rows per second of the former read path, which built a
+CareerModel per row and copied it into a Career, with the projection path
+that builds Careers from values_list or raw cursor rows:
+
+    python benchmarks/read_path.py --rows 10000 --lookups 2000
+
+It reads from the configured database, with DJANGO_DATABASE_ENGINE=sqlite3
+from a local file, and seeds "bench" careers when there are fewer than
+--rows, deleted afterwards unless --keep. Lookups go through
+CareerRepository.get_career_by_id with the cache disabled, so they run its
+fixed query, prepared with DJANGO_DATABASE_SERVER_SIDE_BINDING=true.
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from app.domain import Career  # noqa: E402
+from app.models import CareerModel  # noqa: E402
+from app.repositories import (  # noqa: E402
+    CAREER_COLUMNS,
+    CareerRepository,
+    career_from_db_row,
+)
+
+
+BENCH_USERNAME = "bench"
+
+
+def model_careers(rows: int) -> list[Career]:
+    return [
+        Career(
+            id=career_model.id,
+            created_datetime=career_model.created_datetime,
+            username=career_model.username,
+            title=career_model.title,
+            content=career_model.content,
+        )
+        for career_model in CareerModel.objects.order_by("id")[:rows]
+    ]
+
+
+def values_list_careers(rows: int) -> list[Career]:
+    return list(
+        map(
+            Career.from_row,
+            CareerModel.objects.order_by("id").values_list(*CAREER_COLUMNS)[
+                :rows
+            ],
+        )
+    )
+
+
+def raw_careers(rows: int) -> list[Career]:
+    quote = connection.ops.quote_name
+    sql = (
+        f"SELECT {', '.join(quote(column) for column in CAREER_COLUMNS)} "
+        f"FROM {quote(CareerModel._meta.db_table)} "
+        f"ORDER BY {quote('id')} LIMIT %s"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [rows])
+        return list(map(career_from_db_row, cursor.fetchall()))
+
+
+def model_lookup(id: int) -> Career:
+    career_model = CareerModel.objects.filter(id=id).first()
+    return Career(
+        id=career_model.id,
+        created_datetime=career_model.created_datetime,
+        username=career_model.username,
+        title=career_model.title,
+        content=career_model.content,
+    )
+
+
+def best_of(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def seed(rows: int) -> list[int]:
+    """
+    The ids of the careers inserted to have at least rows careers.
+    """
+    missing = rows - CareerModel.objects.count()
+    if missing <= 0:
+        return []
+
+    career_models = CareerModel.objects.bulk_create(
+        CareerModel(
+            username=BENCH_USERNAME,
+            title=f"Career title {index}",
+            content="Lorem ipsum dolor sit amet. " * 20,
+        )
+        for index in range(missing)
+    )
+    return [career_model.id for career_model in career_models]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--keep", action="store_true", help="Keep the seeded careers"
+    )
+    args = parser.parse_args()
+
+    settings.CAREERS_CACHE_TIMEOUT = 0
+    seeded = seed(args.rows)
+    ids = list(
+        CareerModel.objects.order_by("id").values_list("id", flat=True)[
+            : args.lookups
+        ]
+    )
+    repository = CareerRepository()
+
+    try:
+        options = connection.settings_dict.get("OPTIONS", {})
+        print(
+            f"vendor={connection.vendor} rows={args.rows} "
+            f"lookups={len(ids)} "
+            f"prepare_threshold={options.get('prepare_threshold')}"
+        )
+
+        baseline = None
+        for name, run in (
+            ("model instances", lambda: model_careers(args.rows)),
+            ("values_list rows", lambda: values_list_careers(args.rows)),
+            ("raw cursor rows", lambda: raw_careers(args.rows)),
+        ):
+            best = best_of(args.repeat, run)
+            baseline = baseline or best
+            print(
+                f"list   {name:<18} {args.rows / best:12.0f} rows/s"
+                f"  {baseline / best:5.1f}x"
+            )
+
+        baseline = None
+        for name, lookup in (
+            ("model instance", model_lookup),
+            ("fixed query", repository.get_career_by_id),
+        ):
+            best = best_of(args.repeat, lambda: [lookup(id) for id in ids])
+            baseline = baseline or best
+            print(
+                f"lookup {name:<18} {len(ids) / best:12.0f} rows/s"
+                f"  {baseline / best:5.1f}x"
+            )
+
+    finally:
+        if not args.keep:
+            while seeded:
+                batch, seeded = seeded[:1000], seeded[1000:]
+                CareerModel.objects.filter(id__in=batch).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compares the DRF serializer + JSONRenderer path with the precompiled
+CareerEncoder + CareerJSONRenderer path on an in-memory list of careers.
+
+    python benchmarks/serialization.py --rows 10000
+"""
+
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark")
+
+import django  # noqa: E402
+
+django.setup()
+
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from app.domain import Career  # noqa: E402
+from app.encoders import CareerEncoder  # noqa: E402
+from app.renderers import CareerJSONRenderer, orjson  # noqa: E402
+from app.serializers import ListCareerSerializer  # noqa: E402
+
+
+def make_careers(rows: int) -> list[Career]:
+    now = datetime.now(timezone.utc)
+    return [
+        Career(
+            id=index + 1,
+            created_datetime=now,
+            username=f"user{index}",
+            title=f"Career title {index}",
+            content="Lorem ipsum dolor sit amet. " * 20,
+        )
+        for index in range(rows)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    careers = make_careers(args.rows)
+    encoder = CareerEncoder(ListCareerSerializer.Meta.fields)
+    json_renderer = JSONRenderer()
+    fast_renderer = CareerJSONRenderer()
+
+    cases = {
+        "drf serializer + JSONRenderer": lambda: json_renderer.render(
+            ListCareerSerializer(careers, many=True).data
+        ),
+        "CareerEncoder + JSONRenderer": lambda: json_renderer.render(
+            encoder.many(careers)
+        ),
+        "CareerEncoder + CareerJSONRenderer": lambda: fast_renderer.render(
+            encoder.many(careers)
+        ),
+    }
+
+    print(f"rows={args.rows} orjson={'yes' if orjson else 'no'}")
+    baseline = None
+    for name, case in cases.items():
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name:<36} {best * 1000:9.1f} ms  {baseline / best:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Gunicorn settings for serving the project over ASGI with uvicorn workers.
+
+    gunicorn setup.asgi:application
+
+Every setting can be overridden with GUNICORN_CMD_ARGS or the variables
+below.
+"""
+
+import multiprocessing
+import os
+
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(
+    os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+)
+worker_class = "uvicorn_worker.UvicornWorker"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("GUNICORN_GRACEFUL_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+# Restarting workers now and then bounds the memory a worker can leak.
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 10000))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 1000))
+accesslog = "-"
+
+
+def on_starting(server):
+    """
+    Refuses to start several workers that would each cache careers in their
+    own memory, where writes handled by one worker are not seen by others.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "setup.settings")
+    from django.conf import settings
+
+    if (
+        server.cfg.workers > 1
+        and settings.CAREERS_CACHE_TIMEOUT > 0
+        and not settings.CAREERS_CACHE_SHARED
+    ):
+        raise RuntimeError(
+            f"CAREERS_CACHE_TIMEOUT={settings.CAREERS_CACHE_TIMEOUT} with "
+            f"{server.cfg.workers} workers needs a shared DJANGO_CACHE_BACKEND "
+            "(e.g. django.core.cache.backends.redis.RedisCache)"
+        )
@@ -1,3 +1,4 @@
+from copy import deepcopy
 from pathlib import Path
 import os
 import sys
@@ -7,6 +8,11 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+
+def env_flag(name: str, default: str = "") -> bool:
+    return os.environ.get(name, default).lower() in ("1", "true", "yes")
+
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -38,9 +44,12 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "app.middleware.metrics_middleware",
+    "app.middleware.compression_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "app.middleware.read_your_writes_middleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
@@ -50,6 +59,74 @@ MIDDLEWARE = [
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
+    "DEFAULT_RENDERER_CLASSES": [
+        "app.renderers.CareerJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+}
+
+# Careers list keyset pagination
+CAREERS_PAGE_SIZE = int(
+    os.environ.get("CAREERS_PAGE_SIZE", REST_FRAMEWORK["PAGE_SIZE"])
+)
+CAREERS_MAX_PAGE_SIZE = int(os.environ.get("CAREERS_MAX_PAGE_SIZE", 100))
+
+# Careers streaming export (rows fetched per server-side cursor round trip)
+CAREERS_EXPORT_CHUNK_SIZE = int(
+    os.environ.get("CAREERS_EXPORT_CHUNK_SIZE", 2000)
+)
+CAREERS_EXPORT_MAX_CHUNK_SIZE = int(
+    os.environ.get("CAREERS_EXPORT_MAX_CHUNK_SIZE", 20000)
+)
+# Rows per Parquet row group (and per write) of manage.py export_careers
+CAREERS_EXPORT_ROW_GROUP_SIZE = int(
+    os.environ.get("CAREERS_EXPORT_ROW_GROUP_SIZE", 100000)
+)
+
+# Careers bulk create (items validated and inserted per batch)
+CAREERS_BULK_BATCH_SIZE = int(os.environ.get("CAREERS_BULK_BATCH_SIZE", 500))
+CAREERS_BULK_MAX_BATCH_SIZE = int(
+    os.environ.get("CAREERS_BULK_MAX_BATCH_SIZE", 5000)
+)
+
+# Careers mixed create/update/delete batches (run in one transaction)
+CAREERS_BATCH_MAX_OPERATIONS = int(
+    os.environ.get("CAREERS_BATCH_MAX_OPERATIONS", 1000)
+)
+
+# Careers created concurrently by a process inserted together in one
+# transaction, after at most MAX_DELAY_MS or once MAX_BATCH_SIZE are queued
+CAREERS_GROUP_COMMIT = env_flag("CAREERS_GROUP_COMMIT")
+CAREERS_GROUP_COMMIT_MAX_BATCH_SIZE = int(
+    os.environ.get("CAREERS_GROUP_COMMIT_MAX_BATCH_SIZE", 100)
+)
+CAREERS_GROUP_COMMIT_MAX_DELAY_MS = float(
+    os.environ.get("CAREERS_GROUP_COMMIT_MAX_DELAY_MS", 5)
+)
+
+# Careers list/create and item views served by async views, under ASGI
+CAREERS_ASYNC_VIEWS = env_flag("CAREERS_ASYNC_VIEWS")
+
+# Per-phase request timings in a Server-Timing response header
+CAREERS_SERVER_TIMING = env_flag("CAREERS_SERVER_TIMING", "true")
+
+# Response compression negotiated with Accept-Encoding, in order of
+# preference for equal q-values. brotli and zstd are used when their
+# packages are installed. An empty list disables compression.
+CAREERS_COMPRESSION_ENCODINGS = [
+    encoding.strip()
+    for encoding in os.environ.get(
+        "CAREERS_COMPRESSION_ENCODINGS", "zstd,br,gzip"
+    ).split(",")
+    if encoding.strip()
+]
+CAREERS_COMPRESSION_MIN_BYTES = int(
+    os.environ.get("CAREERS_COMPRESSION_MIN_BYTES", 1024)
+)
+CAREERS_COMPRESSION_LEVELS = {
+    "gzip": int(os.environ.get("CAREERS_COMPRESSION_GZIP_LEVEL", 6)),
+    "br": int(os.environ.get("CAREERS_COMPRESSION_BROTLI_QUALITY", 4)),
+    "zstd": int(os.environ.get("CAREERS_COMPRESSION_ZSTD_LEVEL", 3)),
 }
 
 ROOT_URLCONF = "setup.urls"
@@ -91,12 +168,181 @@ DATABASES = {
     }
 }
 
+# Connections come from a psycopg_pool pool per worker process, which checks
+# a connection before lending it: with a pool, Django passes
+# ConnectionPool.check_connection as the pool's check when CONN_HEALTH_CHECKS
+# is set, and does not accept a "check" pool option. Without the pool,
+# connections are kept open for DJANGO_DATABASE_CONN_MAX_AGE seconds and
+# checked when reused, unless DJANGO_DATABASE_HEALTH_CHECKS is false.
+# https://docs.djangoproject.com/en/5.1/ref/databases/#connection-pool
+if env_flag("DJANGO_DATABASE_POOL", "true"):
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("DJANGO_DATABASE_POOL_MIN_SIZE", 2)),
+            "max_size": int(os.getenv("DJANGO_DATABASE_POOL_MAX_SIZE", 10)),
+            # Seconds a request waits for a free connection before failing.
+            "timeout": float(os.getenv("DJANGO_DATABASE_POOL_TIMEOUT", 10)),
+            "max_lifetime": float(
+                os.getenv("DJANGO_DATABASE_POOL_MAX_LIFETIME", 3600)
+            ),
+            "max_idle": float(os.getenv("DJANGO_DATABASE_POOL_MAX_IDLE", 600)),
+            "name": "careers",
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(
+        os.getenv("DJANGO_DATABASE_CONN_MAX_AGE", 60)
+    )
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = env_flag(
+        "DJANGO_DATABASE_HEALTH_CHECKS", "true"
+    )
+
+# Opt-in server-side binding, with which psycopg prepares a statement on a
+# connection once it ran DJANGO_DATABASE_PREPARE_THRESHOLD times there. It
+# saves parsing and planning on hot queries, but some queries do not work
+# with it (e.g. parameters in SET or in some DDL), plans are generic for
+# every parameter, and it breaks behind a transaction pooler such as
+# PgBouncer, which does not keep statements.
+# https://docs.djangoproject.com/en/5.1/ref/databases/#server-side-parameters-binding
+# https://www.psycopg.org/psycopg3/docs/advanced/prepare.html
+if env_flag("DJANGO_DATABASE_SERVER_SIDE_BINDING"):
+    DATABASES["default"].setdefault("OPTIONS", {}).update(
+        server_side_binding=True,
+        prepare_threshold=int(
+            os.getenv("DJANGO_DATABASE_PREPARE_THRESHOLD", 5)
+        ),
+    )
+
+# Read replicas, as comma separated "host" or "host:port" entries, share the
+# primary's name, credentials and pool settings.
+for index, address in enumerate(
+    filter(None, os.getenv("DJANGO_DATABASE_REPLICA_HOSTS", "").split(","))
+):
+    host, _, port = address.strip().partition(":")
+    replica = deepcopy(DATABASES["default"])
+    replica.update(
+        HOST=host, PORT=port or replica["PORT"], TEST={"MIRROR": "default"}
+    )
+    if "pool" in replica.get("OPTIONS", {}):
+        replica["OPTIONS"]["pool"]["name"] = f"careers-replica-{index}"
+    DATABASES[f"replica_{index}"] = replica
+
+DATABASE_ROUTERS = ["app.routers.PrimaryReplicaRouter"]
+
+# Aliases Career reads are spread over. After a write, a client reads from
+# the primary for CAREERS_PRIMARY_STICKINESS_SECONDS, and so do cache fills
+# after any write, so replication lag is never cached.
+CAREERS_READ_REPLICAS = [
+    alias for alias in DATABASES if alias.startswith("replica_")
+]
+CAREERS_PRIMARY_STICKINESS_SECONDS = float(
+    os.environ.get("CAREERS_PRIMARY_STICKINESS_SECONDS", 5)
+)
+
+# A local SQLite database, e.g. to run benchmarks offline.
+if os.getenv("DJANGO_DATABASE_ENGINE") == "sqlite3":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.getenv("DJANGO_DATABASE_NAME")
+            or BASE_DIR / "db.sqlite3",
+            "OPTIONS": {"timeout": 20},
+        }
+    }
+    CAREERS_READ_REPLICAS = []
+
+if "test" in sys.argv:
+    # The replica is a separate database, used by tests that enable it.
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": "testdb",
+        },
+        "replica": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": "testdb_replica",
+        },
+    }
+    CAREERS_READ_REPLICAS = []
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# Each process has its own locmem cache, so deployments with more than one
+# worker need a shared backend (e.g. django.core.cache.backends.redis.RedisCache)
+# for writes in one worker to invalidate reads cached by the others.
+
+CACHES = {
+    "default": {
+        "BACKEND": os.environ.get(
+            "DJANGO_CACHE_BACKEND",
+            "django.core.cache.backends.locmem.LocMemCache",
+        ),
+        "LOCATION": os.environ.get("DJANGO_CACHE_LOCATION", "careers"),
+    }
+}
+
 if "test" in sys.argv:
-    DATABASES["default"] = {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": "testdb",
+    CACHES["default"] = {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "careers-test",
     }
 
+# Careers read-through cache, disabled with a timeout of 0. It is only on by
+# default with a backend shared by the workers (and in tests, which run in
+# one process): with a per-process cache, a write in one worker would leave
+# the others serving stale careers until their entries expire.
+PROCESS_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+CAREERS_CACHE_ALIAS = "default"
+CAREERS_CACHE_SHARED = (
+    CACHES[CAREERS_CACHE_ALIAS]["BACKEND"] not in PROCESS_CACHE_BACKENDS
+)
+CAREERS_CACHE_TIMEOUT = int(
+    os.environ.get(
+        "CAREERS_CACHE_TIMEOUT",
+        60 if CAREERS_CACHE_SHARED or "test" in sys.argv else 0,
+    )
+)
+CAREERS_CACHE_MAX_ENTRY_BYTES = int(
+    os.environ.get("CAREERS_CACHE_MAX_ENTRY_BYTES", 1024 * 1024)
+)
+
+
+# Logging
+# https://docs.djangoproject.com/en/5.1/topics/logging/
+# App records are written as JSON lines by a background thread. A rate
+# below 1 keeps that fraction of the INFO records, e.g. of successful
+# requests, and every warning and error.
+
+CAREERS_LOG_LEVEL = os.environ.get("CAREERS_LOG_LEVEL", "INFO")
+CAREERS_LOG_INFO_SAMPLE_RATE = float(
+    os.environ.get("CAREERS_LOG_INFO_SAMPLE_RATE", 1)
+)
+CAREERS_LOG_QUEUE_SIZE = int(os.environ.get("CAREERS_LOG_QUEUE_SIZE", 10000))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "background": {
+            "()": "app.log.BackgroundHandler",
+            "queue_size": CAREERS_LOG_QUEUE_SIZE,
+            "stream": "ext://sys.stderr",
+        },
+    },
+    "loggers": {
+        "app": {
+            "handlers": ["background"],
+            "level": CAREERS_LOG_LEVEL,
+            "propagate": False,
+        },
+    },
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -1,13 +1,38 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 
-from app.views import ListCreateCareerView, UpdateDeleteCareerView
+from app.views import (
+    AsyncListCreateCareerView,
+    AsyncUpdateDeleteCareerView,
+    BatchCareersView,
+    BulkCreateCareersView,
+    ExportCareersView,
+    ListCreateCareerView,
+    MetricsView,
+    StatsView,
+    UpdateDeleteCareerView,
+)
 
 
+if settings.CAREERS_ASYNC_VIEWS:
+    list_create_view = AsyncListCreateCareerView
+    update_delete_view = AsyncUpdateDeleteCareerView
+else:
+    list_create_view = ListCreateCareerView
+    update_delete_view = UpdateDeleteCareerView
+
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("careers/", ListCreateCareerView.as_view(), name="careers"),
+    path("careers/", list_create_view.as_view(), name="careers"),
+    path("careers/batch/", BatchCareersView.as_view(), name="careers-batch"),
+    path(
+        "careers/bulk/", BulkCreateCareersView.as_view(), name="careers-bulk"
+    ),
     path(
-        "careers/<str:pk>/", UpdateDeleteCareerView.as_view(), name="careers"
+        "careers/export/", ExportCareersView.as_view(), name="careers-export"
     ),
+    path("careers/<str:pk>/", update_delete_view.as_view(), name="careers"),
+    path("stats/", StatsView.as_view(), name="stats"),
+    path("metrics", MetricsView.as_view(), name="metrics"),
 ]